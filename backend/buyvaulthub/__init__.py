@@ -0,0 +1,7 @@
+# Celery is optional (see requirements.txt); without it background jobs run in-process
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ('celery_app',)
@@ -0,0 +1,14 @@
+"""
+Celery application for background jobs (availability checks)
+Start a worker with: celery -A buyvaulthub worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'buyvaulthub.settings')
+
+app = Celery('buyvaulthub')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -225,4 +225,34 @@ CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localho
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = TIME_ZONE
\ No newline at end of file
+CELERY_TIMEZONE = TIME_ZONE
+# Product detail views queue availability checks: Celery when installed and enabled,
+# else an in-process thread pool. Dedupe keys live in the default cache.
+AVAILABILITY_CHECK_USE_CELERY = config('AVAILABILITY_CHECK_USE_CELERY', default=True, cast=bool)
+AVAILABILITY_CHECK_THREADS = config('AVAILABILITY_CHECK_THREADS', default=4, cast=int)
+AVAILABILITY_CHECK_DEDUPE_SECONDS = config('AVAILABILITY_CHECK_DEDUPE_SECONDS', default=600, cast=int)
+# Bounds (hours) for the adaptive per-product re-check interval
+AVAILABILITY_MIN_INTERVAL_HOURS = config('AVAILABILITY_MIN_INTERVAL_HOURS', default=1, cast=float)
+AVAILABILITY_MAX_INTERVAL_HOURS = config('AVAILABILITY_MAX_INTERVAL_HOURS', default=336, cast=float)
+
+# AI Search Configuration
+# Seconds between updated_at watermark polls of the in-memory vector index
+VECTOR_INDEX_REFRESH_SECONDS = config('VECTOR_INDEX_REFRESH_SECONDS', default=5, cast=int)
+# Seconds between full id reconciliations (catches hard deletes from other processes)
+VECTOR_INDEX_RECONCILE_SECONDS = config('VECTOR_INDEX_RECONCILE_SECONDS', default=300, cast=int)
+# Share of active embedded products that must be in the pgvector table before ANN search is used
+PGVECTOR_MIN_COVERAGE = config('PGVECTOR_MIN_COVERAGE', default=1.0, cast=float)
+# Query embedding cache: per-process LRU size and entry lifetime (seconds)
+QUERY_EMBEDDING_CACHE_SIZE = config('QUERY_EMBEDDING_CACHE_SIZE', default=2048, cast=int)
+QUERY_EMBEDDING_CACHE_TTL = config('QUERY_EMBEDDING_CACHE_TTL', default=3600, cast=int)
+# Optional CACHES alias (e.g. a redis cache) shared by all workers; empty = local only
+QUERY_EMBEDDING_CACHE_ALIAS = config('QUERY_EMBEDDING_CACHE_ALIAS', default='')
+# Micro-batch concurrent query encodes into one forward pass (helps CPU-only boxes)
+AI_SEARCH_BATCH_ENCODING = config('AI_SEARCH_BATCH_ENCODING', default=True, cast=bool)
+AI_SEARCH_BATCH_MAX_SIZE = config('AI_SEARCH_BATCH_MAX_SIZE', default=32, cast=int)
+AI_SEARCH_BATCH_MAX_WAIT_MS = config('AI_SEARCH_BATCH_MAX_WAIT_MS', default=5, cast=int)
+# Load the model and build the search index in a background thread at worker boot
+# (GET /api/v1/ai-search/ready/ returns 503 until done). Do not combine with gunicorn --preload.
+AI_SEARCH_WARMUP = config('AI_SEARCH_WARMUP', default=False, cast=bool)
+# Typo-tolerant (pg_trgm similarity) matching in the search fallback when ?fuzzy is not given
+SEARCH_FUZZY_MATCHING = config('SEARCH_FUZZY_MATCHING', default=False, cast=bool)
@@ -5,9 +5,13 @@ Convert UTF-16 SQL file to UTF-8 and import using psql
 import os
 import sys
 import subprocess
+import tempfile
+from collections import deque
 from pathlib import Path
 from decouple import config
 
+from products.utils.csv_stream import transcode
+
 # Get database credentials from .env
 db_name = config('DATABASE_NAME', default='buyvaulthub_db')
 db_user = config('DATABASE_USER', default='postgres')
@@ -38,11 +42,7 @@ print("=" * 60)
 # Step 1: Convert UTF-16 to UTF-8
 print("\nStep 1: Converting UTF-16 to UTF-8...")
 try:
-    with open(backup_file, 'r', encoding='utf-16-le', errors='ignore') as f:
-        content = f.read()
-    
-    with open(output_file, 'w', encoding='utf-8', errors='ignore') as f:
-        f.write(content)
+    transcode(backup_file, output_file, 'utf-16-le', 'utf-8')
     
     print(f"[OK] Conversion complete!")
     print(f"     Original size: {os.path.getsize(backup_file) / (1024*1024):.2f} MB")
@@ -96,48 +96,53 @@ print(f"\nExecuting import (this may take several minutes for a {os.path.getsize
 print("Command: psql -h localhost -U postgres -d buyvaulthub_db -f <converted_file>\n")
 
 try:
-    # Run psql
-    result = subprocess.run(
-        cmd,
-        env=env,
-        capture_output=True,
-        text=True,
-        encoding='utf-8',
-        errors='ignore'
-    )
-    
-    # Filter output
-    if result.stdout:
-        lines = result.stdout.split('\n')
-        # Show last 100 lines of output
-        print("\n" + "=" * 60)
-        print("Import Output (last 100 lines):")
-        print("=" * 60)
-        for line in lines[-100:]:
-            if line.strip():
-                print(line)
-    
-    if result.stderr:
-        error_lines = result.stderr.split('\n')
+    # Run psql, keeping only the last 100 stdout lines; stderr goes to a temp file scanned line by line
+    with tempfile.TemporaryFile('w+', encoding='utf-8', errors='ignore') as stderr_file:
+        with subprocess.Popen(
+            cmd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True,
+            encoding='utf-8',
+            errors='ignore'
+        ) as proc:
+            tail = deque(proc.stdout, maxlen=100)
+        returncode = proc.returncode
+        
+        if tail:
+            # Show last 100 lines of output
+            print("\n" + "=" * 60)
+            print("Import Output (last 100 lines):")
+            print("=" * 60)
+            for line in tail:
+                if line.strip():
+                    print(line.rstrip('\n'))
+        
         # Filter out non-critical errors
-        critical_errors = [e for e in error_lines if 'ERROR' in e.upper() 
-                          and 'already exists' not in e.lower()
-                          and 'does not exist' not in e.lower()
-                          and 'relation' not in e.lower()]
+        stderr_file.seek(0)
+        critical_errors = []
+        error_count = 0
+        for error in stderr_file:
+            if 'ERROR' not in error.upper():
+                continue
+            error_count += 1
+            if ('already exists' not in error.lower()
+                    and 'does not exist' not in error.lower()
+                    and 'relation' not in error.lower()
+                    and len(critical_errors) < 20):
+                critical_errors.append(error.rstrip('\n'))
         
         if critical_errors:
             print("\n" + "=" * 60)
             print("Critical Errors:")
             print("=" * 60)
-            for error in critical_errors[:20]:  # Show first 20
+            for error in critical_errors:  # Show first 20
                 print(error)
-        elif error_lines:
-            # Count errors
-            error_count = len([e for e in error_lines if 'ERROR' in e.upper()])
-            if error_count > 0:
-                print(f"\n[INFO] Found {error_count} errors/warnings (mostly non-critical)")
+        elif error_count > 0:
+            print(f"\n[INFO] Found {error_count} errors/warnings (mostly non-critical)")
     
-    if result.returncode == 0:
+    if returncode == 0:
         print("\n" + "=" * 60)
         print("[OK] Import completed successfully!")
         print("=" * 60)
@@ -4,11 +4,12 @@ Import products using COPY FROM STDIN (most reliable method)
 """
 import os
 import sys
-import re
-import io
+from itertools import islice
 import psycopg2
 from decouple import config
 
+from products.utils.csv_stream import LineFile, open_copy_block
+
 db_params = {
     'host': config('DATABASE_HOST', default='localhost'),
     'port': config('DATABASE_PORT', default='5432'),
@@ -22,6 +23,15 @@ if not os.path.isabs(sql_file):
     sql_file = os.path.join(os.path.dirname(__file__), sql_file)
 sql_file = os.path.abspath(sql_file)
 
+
+def clean_lines(block):
+    """Data lines of the COPY block, right-stripped, skipping empty and lone-backslash lines"""
+    for line in block:
+        line = line.rstrip()
+        if line and line != '\\':
+            yield line
+
+
 print("=" * 60)
 print("Importing Products using COPY FROM STDIN")
 print("=" * 60)
@@ -34,60 +44,23 @@ try:
     
     print("[OK] Connected to database\n")
     
-    # Read SQL file
+    # Stream the products COPY block out of the dump instead of reading the whole file
     print("Reading SQL file...")
-    with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
-    print(f"[OK] Read file ({len(content):,} characters)\n")
-    
-    # Find COPY statement and extract data
-    copy_pattern = r'COPY\s+public\.products_coreproduct\s+\([^)]+\)\s+FROM\s+stdin;'
-    copy_match = re.search(copy_pattern, content, re.IGNORECASE)
+    block = open_copy_block(sql_file, 'products_coreproduct')
     
-    if not copy_match:
+    if block is None:
         print("[ERROR] Could not find COPY statement for products_coreproduct")
         sys.exit(1)
     
-    # Extract data section
-    data_start = copy_match.end()
-    data_section = content[data_start:]
-    end_match = re.search(r'^\.\s*$', data_section, re.MULTILINE)
-    
-    if not end_match:
-        print("[ERROR] Could not find end marker (\\.)")
-        sys.exit(1)
-    
-    copy_data = data_section[:end_match.start()].strip()
-    
-    # Remove any trailing backslashes on empty lines
-    lines = copy_data.split('\n')
-    clean_lines = []
-    for line in lines:
-        line = line.rstrip()
-        if line and line != '\\':
-            clean_lines.append(line)
-    
-    copy_data_clean = '\n'.join(clean_lines) + '\n'
-    
-    print(f"[OK] Extracted COPY data ({len(copy_data_clean):,} characters)")
-    print(f"     Lines: {len(clean_lines)}\n")
-    
-    # Get column names from COPY statement
-    columns_match = re.search(r'COPY\s+public\.products_coreproduct\s+\(([^)]+)\)', copy_match.group(0), re.IGNORECASE)
-    if not columns_match:
-        print("[ERROR] Could not parse column names")
-        sys.exit(1)
-    
-    columns = [col.strip() for col in columns_match.group(1).split(',')]
+    columns = block.columns
     print(f"[OK] Found {len(columns)} columns\n")
     
     # Use COPY FROM STDIN
     print("Importing using COPY FROM STDIN...")
     print("(This may take several minutes for large files)\n")
     
-    # Create a file-like object from the data
-    data_stream = io.StringIO(copy_data_clean)
+    # Feed the data lines to COPY as they are read, without empty or lone-backslash lines
+    data_stream = LineFile(line + '\n' for line in clean_lines(block))
     
     # Use COPY FROM
     copy_sql = f"COPY products_coreproduct ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
@@ -96,7 +69,7 @@ try:
         cursor.copy_expert(copy_sql, data_stream)
         conn.commit()
         
-        print("[OK] COPY completed successfully!")
+        print(f"[OK] COPY completed successfully! ({block.progress})")
         
         # Verify
         cursor.execute("SELECT COUNT(*) FROM products_coreproduct")
@@ -119,7 +92,9 @@ try:
         inserted = 0
         errors = 0
         
-        for i, line in enumerate(clean_lines[:1000]):  # Try first 1000
+        block.close()
+        block = open_copy_block(sql_file, 'products_coreproduct')
+        for i, line in enumerate(islice(clean_lines(block), 1000)):  # Try first 1000
             if (i + 1) % 100 == 0:
                 print(f"   Progress: {i+1} processed, {inserted} inserted...")
             
@@ -149,6 +124,7 @@ try:
         conn.commit()
         print(f"\n[OK] Inserted {inserted} products (errors: {errors})")
     
+    block.close()
     cursor.close()
     conn.close()
     
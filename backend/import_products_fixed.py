@@ -4,11 +4,12 @@ Import products from SQL backup, fixing foreign key mismatches
 """
 import os
 import sys
-import re
 import psycopg2
 from decouple import config
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
+from products.utils.csv_stream import open_copy_block, parse_copy_line
+
 db_params = {
     'host': config('DATABASE_HOST', default='localhost'),
     'port': config('DATABASE_PORT', default='5432'),
@@ -33,29 +34,13 @@ try:
     
     print("[OK] Connected to database\n")
     
-    # Read the SQL file to find COPY data
+    # Stream the products COPY block out of the dump instead of reading the whole file
     print("Reading SQL file...")
-    with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
-    # Find COPY statement for products
-    copy_match = re.search(r'COPY\s+public\.products_coreproduct\s+\([^)]+\)\s+FROM\s+stdin;', content, re.IGNORECASE | re.DOTALL)
-    if not copy_match:
+    block = open_copy_block(sql_file, 'products_coreproduct')
+    if block is None:
         print("[ERROR] Could not find products COPY statement")
         sys.exit(1)
-    
-    # Extract data section (from COPY start to \.)
-    data_start = copy_match.end()
-    data_section = content[data_start:]
-    end_match = re.search(r'^\.\s*$', data_section, re.MULTILINE)
-    if not end_match:
-        print("[ERROR] Could not find end of COPY data")
-        sys.exit(1)
-    
-    copy_data = data_section[:end_match.start()].strip()
-    lines = [line for line in copy_data.split('\n') if line.strip() and not line.strip() == '\\']
-    
-    print(f"Found {len(lines)} product records\n")
+    columns = block.columns
     
     # Get current FK mappings (old_id -> new_id)
     print("Building foreign key mappings...")
@@ -89,65 +74,18 @@ try:
     skipped = 0
     errors = []
     
-    # Get column names from COPY statement
-    columns_match = re.search(r'COPY\s+public\.products_coreproduct\s+\(([^)]+)\)', content, re.IGNORECASE)
-    if columns_match:
-        columns = [col.strip() for col in columns_match.group(1).split(',')]
-        category_idx = columns.index('category_id') if 'category_id' in columns else None
-        brand_idx = columns.index('brand_id') if 'brand_id' in columns else None
-        seller_idx = columns.index('seller_id') if 'seller_id' in columns else None
-    else:
-        print("[ERROR] Could not parse column names")
-        sys.exit(1)
+    category_idx = columns.index('category_id') if 'category_id' in columns else None
+    brand_idx = columns.index('brand_id') if 'brand_id' in columns else None
+    seller_idx = columns.index('seller_id') if 'seller_id' in columns else None
     
-    for i, line in enumerate(lines):
+    for i, line in enumerate(block):
         if (i + 1) % 500 == 0:
-            print(f"   Progress: {i+1}/{len(lines)} processed, {inserted} inserted...")
-        
-        # Parse tab-separated values (COPY format)
-        # Handle \N (NULL), \t (tab), \\ (backslash)
-        values = []
-        current = []
-        escape = False
-        
-        for char in line:
-            if escape:
-                if char == 't':
-                    current.append('\t')
-                elif char == 'n':
-                    current.append('\n')
-                elif char == '\\':
-                    current.append('\\')
-                elif char == 'N':
-                    # \N means NULL - we'll handle this specially
-                    if len(current) == 0:
-                        values.append(None)
-                        current = []
-                        escape = False
-                        continue
-                    else:
-                        current.append('N')
-                else:
-                    current.append(char)
-                escape = False
-            elif char == '\\':
-                escape = True
-            elif char == '\t' and not escape:
-                val = ''.join(current)
-                if val == r'\N':
-                    values.append(None)
-                else:
-                    values.append(val if val else None)
-                current = []
-            else:
-                current.append(char)
+            print(f"   Progress: {block.progress}, {inserted} inserted...")
+        if not line.strip():
+            continue
         
-        # Last field
-        val = ''.join(current)
-        if val == r'\N':
-            values.append(None)
-        else:
-            values.append(val if val else None)
+        # Tab-separated COPY text format; empty values are imported as NULL
+        values = [value or None for value in parse_copy_line(line)]
         
         if len(values) != len(columns):
             skipped += 1
@@ -193,6 +131,7 @@ try:
     final_count = cursor.fetchone()[0]
     print(f"\nFinal product count: {final_count}")
     
+    block.close()
     cursor.close()
     conn.close()
     
@@ -4,11 +4,12 @@ Import products from SQL backup, fixing foreign key references
 """
 import os
 import sys
-import re
 from decouple import config
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
+from products.utils.csv_stream import open_copy_block, parse_copy_line
+
 # Database credentials
 db_params = {
     'host': config('DATABASE_HOST', default='localhost'),
@@ -55,97 +56,30 @@ try:
             print("Import cancelled.")
             sys.exit(0)
     
-    # Read the SQL file
+    # Stream the products COPY block out of the dump instead of reading the whole file
     print("\nReading SQL file...")
-    with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
-    print(f"[OK] Read file ({len(content):,} characters)\n")
-    
-    # Find the COPY statement for products_coreproduct
-    copy_pattern = r'COPY\s+public\.products_coreproduct\s+\([^)]+\)\s+FROM\s+stdin;'
-    copy_match = re.search(copy_pattern, content, re.IGNORECASE)
-    
-    if not copy_match:
+    block = open_copy_block(sql_file, 'products_coreproduct')
+    if block is None:
         print("[ERROR] Could not find COPY statement for products_coreproduct")
         sys.exit(1)
     
-    copy_start = copy_match.start()
-    # Find where the COPY data ends (look for \. or next COPY/statement)
-    copy_data_section = content[copy_match.end():]
-    
-    # Find the end marker (\. on its own line)
-    end_match = re.search(r'^\.\s*$', copy_data_section, re.MULTILINE)
-    if not end_match:
-        print("[ERROR] Could not find end of COPY data")
-        sys.exit(1)
-    
-    copy_data = copy_data_section[:end_match.start()].strip()
-    
-    print(f"[OK] Found COPY data section ({len(copy_data):,} characters)\n")
-    
-    # Parse and insert data line by line
-    # COPY format: tab-separated values, one line per record
-    lines = [line for line in copy_data.split('\n') if line.strip()]
-    
-    print(f"Found {len(lines)} product records to import\n")
+    columns = block.columns
+    print(f"[OK] Found COPY data section ({len(columns)} fields)\n")
     print("Importing products (this may take several minutes)...\n")
     
-    # Get column order from COPY statement
-    columns_match = re.search(r'COPY\s+public\.products_coreproduct\s+\(([^)]+)\)', content, re.IGNORECASE)
-    if not columns_match:
-        print("[ERROR] Could not parse column names from COPY statement")
-        sys.exit(1)
-    
-    columns = [col.strip() for col in columns_match.group(1).split(',')]
-    print(f"Columns: {len(columns)} fields\n")
-    
     # Insert products one by one (more reliable for foreign keys)
     inserted = 0
     errors = 0
     error_samples = []
     
-    for i, line in enumerate(lines):
+    for i, line in enumerate(block):
         if i % 100 == 0 and i > 0:
-            print(f"   Progress: {i}/{len(lines)} processed, {inserted} inserted, {errors} errors...")
-        
-        # Split by tab (COPY format uses tabs)
-        # But handle escaped tabs and special values like \N (NULL)
-        values = []
-        current_value = []
-        in_escape = False
-        in_quote = False
-        
-        for char in line:
-            if in_escape:
-                if char == 't':
-                    current_value.append('\t')
-                elif char == 'n':
-                    current_value.append('\n')
-                elif char == '\\':
-                    current_value.append('\\')
-                else:
-                    current_value.append(char)
-                in_escape = False
-            elif char == '\\':
-                in_escape = True
-            elif char == '\t' and not in_quote:
-                # End of field
-                value_str = ''.join(current_value)
-                if value_str == r'\N':
-                    values.append(None)
-                else:
-                    values.append(value_str)
-                current_value = []
-            else:
-                current_value.append(char)
+            print(f"   Progress: {block.progress}, {inserted} inserted, {errors} errors...")
+        if not line.strip():
+            continue
         
-        # Last field
-        value_str = ''.join(current_value)
-        if value_str == r'\N':
-            values.append(None)
-        else:
-            values.append(value_str)
+        # Tab-separated COPY text format, \N is NULL
+        values = parse_copy_line(line)
         
         # Map values to columns
         if len(values) != len(columns):
@@ -205,6 +139,7 @@ try:
     final_count = cursor.fetchone()[0]
     print(f"[OK] Final product count: {final_count}")
     
+    block.close()
     cursor.close()
     conn.close()
     
@@ -3,6 +3,7 @@ from django.utils.html import format_html
 from django.urls import path
 from django.shortcuts import render
 from django.db.models import Count, Avg, Q
+from django.utils import timezone
 from .models import (
     Platform, Brand, Seller, ProductCategory, CoreProduct,
     InstagramProduct, EcommerceProduct, RawScrapedData,
@@ -60,12 +61,12 @@ class CoreProductAdmin(admin.ModelAdmin):
     actions = ['mark_as_active', 'mark_as_inactive', 'export_products']
     
     def mark_as_active(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
         self.message_user(request, f'{updated} products marked as active.')
     mark_as_active.short_description = "Mark selected products as active"
     
     def mark_as_inactive(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
         self.message_user(request, f'{updated} products marked as inactive.')
     mark_as_inactive.short_description = "Mark selected products as inactive"
     
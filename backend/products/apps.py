@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'products'
+
+    def ready(self):
+        # Opt-in (AI_SEARCH_WARMUP): load the AI model and search index in the background
+        from .utils.warmup import start_warmup
+        start_warmup()
@@ -2,7 +2,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from products.models import CoreProduct, ProductCategory
-from products.utils.categories_utils import suggest_category
+from products.utils.categories_utils import suggest_categories
 
 
 class Command(BaseCommand):
@@ -21,13 +21,14 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Auditing product categories...'))
 
         qs = CoreProduct.objects.filter(is_active=True).select_related('category')[:limit]
-        total = qs.count()
+        products = list(qs)
+        total = len(products)
         fixes = 0
         suggestions = 0
+        suggested_categories = suggest_categories([(p.name, p.description or '') for p in products])
 
         with transaction.atomic():
-            for product in qs:
-                suggested = suggest_category(product.name, product.description or '')
+            for product, suggested in zip(products, suggested_categories):
                 if not suggested:
                     continue
                 suggestions += 1
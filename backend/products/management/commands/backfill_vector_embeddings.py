@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Copy CoreProduct.search_embedding into the pgvector ProductEmbedding table
+Run: python manage.py backfill_vector_embeddings [--force]
+"""
+
+from django.core.management.base import BaseCommand
+from products.models import CoreProduct, ProductEmbedding, EMBEDDING_DIMENSIONS
+from products.utils.embedding_codec import decode_embeddings
+from products.utils.pgvector_search import (
+    upsert_vectors, vector_table_exists, pgvector_available, vector_coverage, MIN_COVERAGE,
+)
+import time
+
+
+class Command(BaseCommand):
+    help = 'Backfill the pgvector ProductEmbedding table from stored search embeddings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows upserted per statement (default 1000)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite vectors that are already backfilled'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        force = options['force']
+
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS('🧭 BACKFILLING PGVECTOR EMBEDDINGS'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+
+        if not vector_table_exists():
+            self.stdout.write(self.style.ERROR(
+                '❌ products_productembedding does not exist - install the pgvector '
+                'extension on the server and re-run: python manage.py migrate products'
+            ))
+            return
+
+        queryset = CoreProduct.objects.filter(is_active=True, search_embedding__isnull=False)
+        if not force:
+            queryset = queryset.filter(vector_embedding__isnull=True)
+
+        total = queryset.count()
+        if total == 0:
+            self.stdout.write(self.style.WARNING('✅ All embeddings already backfilled!'))
+            self.stdout.write(self.style.SUCCESS('   Use --force to rewrite them'))
+            return
+
+        self.stdout.write(f'📊 Products to backfill: {total}')
+        start_time = time.time()
+        written = skipped = 0
+        batch_ids, batch_blobs = [], []
+
+        rows = queryset.values_list('id', 'search_embedding').iterator(chunk_size=batch_size)
+        for product_id, blob in rows:
+            batch_ids.append(product_id)
+            batch_blobs.append(blob)
+            if len(batch_ids) >= batch_size:
+                w, s = self._write_batch(batch_ids, batch_blobs)
+                written, skipped = written + w, skipped + s
+                batch_ids, batch_blobs = [], []
+                self.stdout.write(f'   ... {written}/{total} written')
+        if batch_ids:
+            w, s = self._write_batch(batch_ids, batch_blobs)
+            written, skipped = written + w, skipped + s
+
+        # Drop vectors of products that were deactivated since the last run
+        stale = ProductEmbedding.objects.filter(product__is_active=False).delete()[0]
+
+        elapsed = time.time() - start_time
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS('✅ BACKFILL COMPLETE'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(f'Written: {written}')
+        self.stdout.write(f'Skipped (undecodable or wrong dimension): {skipped}')
+        self.stdout.write(f'Removed (inactive products): {stale}')
+        self.stdout.write(f'Time taken: {elapsed:.2f} seconds')
+
+        covered, total = vector_coverage()
+        self.stdout.write(f'Coverage: {covered}/{total} active products')
+        if pgvector_available(force=True):
+            self.stdout.write(self.style.SUCCESS('🧭 pgvector ANN search enabled'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ pgvector ANN search stays off until coverage reaches {MIN_COVERAGE:.0%} (PGVECTOR_MIN_COVERAGE)'
+            ))
+
+    def _write_batch(self, batch_ids, batch_blobs):
+        matrix, ok = decode_embeddings(batch_blobs)
+        good_ids = [product_id for product_id, good in zip(batch_ids, ok) if good]
+        if not len(matrix) or matrix.shape[1] != EMBEDDING_DIMENSIONS:
+            return 0, len(batch_ids)
+        written = upsert_vectors(dict(zip(good_ids, matrix)))
+        return written, len(batch_ids) - written
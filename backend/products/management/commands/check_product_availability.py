@@ -7,10 +7,11 @@ Can be run manually or scheduled via cron
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from products.models import CoreProduct
-from products.utils.availability_checker import check_product_availability
+from products.utils.bulk_availability import AVAILABILITY_RATE_PER_HOUR, BulkAvailabilityChecker
+from products.utils.availability_schedule import due_products
 from datetime import timedelta
 from django.utils import timezone
-import time
+import threading
 
 
 class Command(BaseCommand):
@@ -31,7 +32,7 @@ class Command(BaseCommand):
         parser.add_argument(
             '--force',
             action='store_true',
-            help='Force check even if recently checked'
+            help='Check even if recently checked, downloading every page in full'
         )
         parser.add_argument(
             '--dry-run',
@@ -46,8 +47,36 @@ class Command(BaseCommand):
         parser.add_argument(
             '--older-than-days',
             type=int,
-            default=7,
-            help='Only check products last checked more than X days ago (default: 7)'
+            help='Only check products last checked more than X days ago '
+                 '(default: products due on the adaptive schedule)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=16,
+            help='Concurrent checks across all hosts (default: 16)'
+        )
+        parser.add_argument(
+            '--per-host',
+            type=int,
+            default=4,
+            help='Maximum concurrent requests to one host (default: 4)'
+        )
+        parser.add_argument(
+            '--requests-per-hour',
+            type=int,
+            default=AVAILABILITY_RATE_PER_HOUR,
+            help=f'Per-host request rate (default: {AVAILABILITY_RATE_PER_HOUR}; 0 = each Platform.rate_limit_per_hour)'
+        )
+        parser.add_argument(
+            '--no-head',
+            action='store_true',
+            help='Always download the page instead of trying HEAD first'
+        )
+        parser.add_argument(
+            '--no-conditional',
+            action='store_true',
+            help='Do not send stored ETag/Last-Modified validators'
         )
 
     def handle(self, *args, **options):
@@ -76,14 +105,17 @@ class Command(BaseCommand):
                 products = products.filter(seller__display_name__icontains=platform)
                 self.stdout.write(f"\n🔍 Platform filter: {platform}")
             
-            # Filter by last check date (unless force)
-            if not force:
+            # Filter by last check date or the adaptive due queue (unless force)
+            if not force and older_than_days is not None:
                 cutoff_date = timezone.now() - timedelta(days=older_than_days)
                 products = products.filter(
                     Q(last_availability_check__isnull=True) |
                     Q(last_availability_check__lt=cutoff_date)
                 )
                 self.stdout.write(f"📅 Only checking products last checked > {older_than_days} days ago")
+            elif not force:
+                products = due_products(products)
+                self.stdout.write("📅 Only checking products due on the adaptive schedule (most overdue first)")
             
             # Limit results
             products = products[:limit]
@@ -97,51 +129,46 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING("\n🔸 DRY RUN MODE - No changes will be saved\n"))
 
-        # Check each product
+        # Check products concurrently (per-host rate limits, keep-alive sessions)
         self.stdout.write("\n" + "-" * 80)
         self.stdout.write("CHECKING PRODUCTS...")
         self.stdout.write("-" * 80 + "\n")
 
-        results = {
-            'active': 0,
-            'unavailable': 0,
-            'error': 0,
-            'skipped': 0
-        }
+        products = products.select_related('seller', 'ecommerce_data__platform', 'instagram_data')
+        output_lock = threading.Lock()
+        progress = {'done': 0}
 
-        for i, product in enumerate(products, 1):
-            self.stdout.write(f"\n[{i}/{products.count()}] {product.name[:60]}...")
-            self.stdout.write(f"           ID: {product.id} | Platform: {product.seller.display_name if product.seller else 'N/A'}")
-            
-            try:
-                # Check availability
-                result = check_product_availability(
-                    product=product,
-                    force=force,
-                    update_db=not dry_run  # Only update if not dry run
-                )
-                
+        def report(product, result):
+            with output_lock:
+                progress['done'] += 1
                 status = result['status']
-                results[status] = results.get(status, 0) + 1
-                
+                prefix = f"[{progress['done']}] {product.id} {product.name[:50]}"
                 if status == 'active':
-                    self.stdout.write(self.style.SUCCESS(f"           ✅ ACTIVE - {result['reason']}"))
+                    self.stdout.write(self.style.SUCCESS(f"✅ {prefix} - ACTIVE - {result['reason']}"))
                 elif status == 'unavailable':
-                    self.stdout.write(self.style.ERROR(f"           ❌ UNAVAILABLE - {result['reason']}"))
+                    self.stdout.write(self.style.ERROR(f"❌ {prefix} - UNAVAILABLE - {result['reason']}"))
                     if not dry_run and product.consecutive_failures >= 3:
-                        self.stdout.write(self.style.WARNING(f"              ⚠️ Marked as INACTIVE (3+ failures)"))
-                elif status == 'error':
-                    self.stdout.write(self.style.WARNING(f"           ⚠️ ERROR - {result['reason']}"))
+                        self.stdout.write(self.style.WARNING(f"   ⚠️ Marked as INACTIVE (3+ failures)"))
                 else:
-                    self.stdout.write(f"           ⏭️ SKIPPED - {result['reason']}")
-                
-                # Be polite - small delay between checks
-                if i < products.count():
-                    time.sleep(0.5)
-                    
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"           ❌ EXCEPTION: {str(e)}"))
-                results['error'] += 1
+                    self.stdout.write(self.style.WARNING(f"⚠️ {prefix} - ERROR - {result['reason']}"))
+
+        checker = BulkAvailabilityChecker(
+            max_workers=options['workers'],
+            max_per_host=options['per_host'],
+            use_head=not options['no_head'],
+            conditional=not options['no_conditional'],
+            update_db=not dry_run,  # Only update if not dry run
+            rate_override=options['requests_per_hour'] or None,
+            on_result=report,
+            force=force,
+        )
+        stats = checker.run(products)
+
+        results = {
+            'active': stats.get('active', 0),
+            'unavailable': stats.get('unavailable', 0),
+            'error': stats.get('error', 0),
+        }
 
         # Summary
         self.stdout.write('\n' + '=' * 80)
@@ -150,8 +177,9 @@ class Command(BaseCommand):
         self.stdout.write(f"\n✅ Active/Available: {results['active']}")
         self.stdout.write(f"❌ Unavailable: {results['unavailable']}")
         self.stdout.write(f"⚠️ Errors: {results['error']}")
-        self.stdout.write(f"⏭️ Skipped: {results['skipped']}")
-        self.stdout.write(f"\n📊 Total checked: {sum(results.values())}")
+        self.stdout.write(f"⏭️ Skipped (recently checked): {stats['skipped']}")
+        self.stdout.write(f"♻️ Unchanged (HEAD/304): {stats.get('not_modified', 0)}")
+        self.stdout.write(f"\n📊 Total checked: {sum(results.values())} across {stats['hosts']} hosts in {stats['elapsed']}s")
 
         if dry_run:
             self.stdout.write(self.style.WARNING("\n🔸 DRY RUN - No changes were saved to database"))
@@ -10,7 +10,7 @@ from django.db.models import Q
 from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
 from products.utils.search_utils import expand_query_synonyms
 import numpy as np
-import pickle
+from products.utils.embedding_codec import decode_embedding
 from sentence_transformers import SentenceTransformer
 import time
 
@@ -114,7 +114,7 @@ class Command(BaseCommand):
             
             for product in product_list:
                 try:
-                    embedding = pickle.loads(product.search_embedding)
+                    embedding = decode_embedding(product.search_embedding)
                     embeddings_matrix.append(embedding)
                     valid_products.append(product)
                 except:
@@ -176,7 +176,7 @@ class Command(BaseCommand):
             
             for product in products_with_embeddings:
                 try:
-                    embedding = pickle.loads(product.search_embedding)
+                    embedding = decode_embedding(product.search_embedding)
                     embeddings_matrix.append(embedding)
                     valid_products.append(product)
                 except:
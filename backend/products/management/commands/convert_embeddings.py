@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Convert stored search embeddings from pickled numpy arrays to the compact
+binary format (see products/utils/embedding_codec.py)
+Run: python manage.py convert_embeddings [--float16] [--dry-run]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from products.models import CoreProduct
+from products.utils.embedding_codec import (
+    decode_embedding, encode_embedding, is_legacy_embedding, HEADER, DTYPE_CODES
+)
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rewrite pickled search embeddings in the compact float32/float16 binary format'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows rewritten per transaction (default 1000)'
+        )
+        parser.add_argument(
+            '--float16',
+            action='store_true',
+            help='Store vectors as float16 (also re-encodes existing float32 rows)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count rows that would be converted without writing'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dtype = 'float16' if options['float16'] else 'float32'
+        dry_run = options['dry_run']
+
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS(f'🔁 CONVERTING EMBEDDINGS TO BINARY FORMAT ({dtype})'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('🔸 DRY RUN MODE - No changes will be saved'))
+
+        rows = CoreProduct.objects.filter(
+            search_embedding__isnull=False
+        ).values_list('id', 'search_embedding').iterator(chunk_size=batch_size)
+
+        target_code = DTYPE_CODES[dtype]
+        start_time = time.time()
+        scanned = converted = failed = bytes_before = bytes_after = 0
+        pending = []
+
+        for product_id, blob in rows:
+            scanned += 1
+            blob = bytes(blob)
+            already_target = not is_legacy_embedding(blob) and len(blob) >= HEADER.size and blob[1] == target_code
+            if already_target:
+                continue
+            try:
+                new_blob = encode_embedding(decode_embedding(blob), dtype=dtype)
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'❌ Product {product_id}: {e}'))
+                continue
+
+            bytes_before += len(blob)
+            bytes_after += len(new_blob)
+            pending.append(CoreProduct(id=product_id, search_embedding=new_blob))
+
+            if len(pending) >= batch_size:
+                converted += self._flush(pending, dry_run)
+                pending = []
+                self.stdout.write(f'   ... {converted} converted ({scanned} scanned)')
+
+        if pending:
+            converted += self._flush(pending, dry_run)
+
+        elapsed = time.time() - start_time
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS('SUMMARY'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(f'Scanned: {scanned}')
+        self.stdout.write(f'Converted: {converted}')
+        self.stdout.write(f'Failed: {failed}')
+        if bytes_before:
+            self.stdout.write(
+                f'Storage: {bytes_before / 1024 / 1024:.1f} MB -> {bytes_after / 1024 / 1024:.1f} MB '
+                f'({100 * (1 - bytes_after / bytes_before):.0f}% smaller)'
+            )
+        self.stdout.write(f'Time taken: {elapsed:.2f} seconds')
+        if dry_run:
+            self.stdout.write(self.style.WARNING('🔸 DRY RUN - No changes were saved to database'))
+
+    def _flush(self, pending, dry_run):
+        """Write one batch of converted rows in a single transaction"""
+        if dry_run:
+            return len(pending)
+        # Same vectors, new encoding: updated_at is left alone on purpose so
+        # running search indexes do not re-read the whole catalog
+        with transaction.atomic():
+            CoreProduct.objects.bulk_update(pending, ['search_embedding'])
+        return len(pending)
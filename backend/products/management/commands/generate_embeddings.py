@@ -8,7 +8,8 @@ from django.core.management.base import BaseCommand
 from products.models import CoreProduct
 from django.db.models import Q
 import numpy as np
-import pickle
+from products.utils.embedding_codec import encode_embedding
+from products.utils.pgvector_search import upsert_vectors, vector_table_exists
 from sentence_transformers import SentenceTransformer
 import time
 from tqdm import tqdm
@@ -35,11 +36,17 @@ class Command(BaseCommand):
             default=None,
             help='Limit number of products to process (for testing)'
         )
+        parser.add_argument(
+            '--float16',
+            action='store_true',
+            help='Store vectors as float16 (half the size, tiny precision loss)'
+        )
 
     def handle(self, *args, **options):
         batch_size = options['batch_size']
         force = options['force']
         limit = options['limit']
+        dtype = 'float16' if options['float16'] else 'float32'
 
         self.stdout.write(self.style.SUCCESS('=' * 80))
         self.stdout.write(self.style.SUCCESS('🧠 GENERATING AI EMBEDDINGS FOR PRODUCTS'))
@@ -87,6 +94,11 @@ class Command(BaseCommand):
         
         products = list(queryset.select_related('brand', 'category'))
         
+        # Keep the pgvector table in sync when the extension is installed
+        write_vectors = vector_table_exists()
+        if write_vectors:
+            self.stdout.write(self.style.SUCCESS('🧭 pgvector table found - vectors will be mirrored there too'))
+        
         # Create progress bar
         with tqdm(total=len(products), desc="Generating embeddings", unit="product") as pbar:
             for i in range(0, len(products), batch_size):
@@ -109,9 +121,13 @@ class Command(BaseCommand):
                 
                 # Save to database
                 for product, embedding in zip(batch, embeddings):
-                    # Store as pickled numpy array
-                    product.search_embedding = pickle.dumps(embedding)
-                    product.save(update_fields=['search_embedding'])
+                    # Store in the compact binary format (see embedding_codec)
+                    product.search_embedding = encode_embedding(embedding, dtype=dtype)
+                    # Touch updated_at so running search indexes pick up the new vector
+                    product.save(update_fields=['search_embedding', 'updated_at'])
+                
+                if write_vectors:
+                    upsert_vectors({product.id: embedding for product, embedding in zip(batch, embeddings)})
                 
                 # Update progress bar
                 pbar.update(len(batch))
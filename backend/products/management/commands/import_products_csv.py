@@ -1,22 +1,24 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import csv
 import json
 import uuid
 import hashlib
+from collections import defaultdict
 from decimal import Decimal, InvalidOperation
 from typing import Optional
+from urllib.parse import urlparse
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction, IntegrityError
+from django.db import connection, transaction, IntegrityError, DatabaseError
 from django.utils.text import slugify as dj_slugify
 
 from products.models import (
     Platform, Brand, Seller, ProductCategory,
     CoreProduct, EcommerceProduct
 )
-from products.utils.categories_utils import suggest_category
+from products.utils.categories_utils import suggest_category, suggest_categories
+from products.utils.csv_stream import CSVStream, HeaderError
 
 
 def slugify(text: str) -> str:
@@ -85,6 +87,480 @@ def derive_platform_product_id(url: str) -> str:
     return hashlib.sha1(u.encode("utf-8")).hexdigest()[:40]
 
 
+def name_from_url(url: str) -> str:
+    """Readable product name from the last path segment of a product URL ('' if none)"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        path = urlparse(url).path
+        # take last non-empty segment
+        seg = next((s for s in reversed(path.split('/')) if s), '')
+        # replace hyphens/underscores with spaces and title-case
+        derived = seg.replace('-', ' ').replace('_', ' ').strip()
+        return derived.title()[:300] if derived else ""
+    except Exception:
+        return ""
+
+
+def prepare_row(row: dict):
+    """
+    Parse one CSV row into the values import_row would write, for the batched path.
+
+    Returns:
+        (skip_reason, None) for rows that are not imported, else (None, values)
+    """
+    # Skip category URLs - only import actual products
+    product_url = (row.get("product_url") or "").strip()
+    if not product_url or "product-category" in product_url:
+        return "skipped_category", None
+    # Skip if no price (likely not a real product)
+    if not (row.get("price") or "").strip():
+        return "skipped_no_price", None
+
+    platform_name = (row["platform_name"] or "").strip().lower() or "platform"
+    seller_username = (row["seller_username"] or platform_name).strip() or platform_name
+    product_name = (row["product_name"] or "").strip() or name_from_url(product_url)
+    name = (row["product_name"] or product_name or "").strip() or "Unnamed Product"
+    description = (row["description"] or "").strip()
+    average_rating = parse_decimal(row["average_rating"])
+
+    return None, {
+        "platform_name": platform_name,
+        "platform_display": (row["platform_display_name"] or platform_name).strip() or platform_name,
+        "platform_type": (row["platform_type"] or "ecommerce").strip().lower() or "ecommerce",
+        "base_url": (row["platform_base_url"] or "").strip(),
+        "seller_username": seller_username,
+        "seller_display": (row["seller_display_name"] or seller_username).strip(),
+        "seller_profile_url": (row["seller_profile_url"] or "").strip(),
+        "brand_name": (row["brand_name"] or "").strip(),
+        "category_text": (product_name, description),
+        "main_category": (row["main_category"] or "").strip() or "General",
+        "subcategory": (row["subcategory"] or "").strip(),
+        "uuid": (row["uuid"].strip() or str(uuid.uuid4())) if row["uuid"] else str(uuid.uuid4()),
+        "slug": row["product_slug"] or slugify(f"{name}-{seller_username}"),
+        "core": {
+            "name": name,
+            "description": description,
+            "short_description": (row["short_description"] or description[:200]).strip(),
+            "price": parse_decimal(row["price"]),
+            "original_price": parse_decimal(row["original_price"]),
+            "currency": (row["currency"] or "PKR").strip().upper()[:3],
+            "model_number": (row["model_number"] or "").strip(),
+            "sku": (row["sku"] or "").strip(),
+            "main_image_url": (row["image_url"] or "").strip(),
+            "platform_type": "ecommerce",
+        },
+        "ecomm": {
+            "platform_product_id": trim_len(derive_platform_product_id(product_url), 200),
+            "platform_url": trim_len(product_url, 1000),
+            "in_stock": parse_bool(row["in_stock"]),
+            "stock_quantity": parse_int(row["stock_quantity"]),
+            "stock_status": trim_len(row["stock_status"], 100),
+            "shipping_cost": parse_decimal(row["shipping_cost"]) or Decimal("0"),
+            "shipping_time": trim_len(row["shipping_time"], 100),
+            "free_shipping": parse_bool(row["free_shipping"]),
+            "warranty_period": trim_len(row["warranty_period"], 100),
+            "return_policy": (row["return_policy"] or "").strip(),
+            "specifications": load_json(row["specifications_json"], {}),
+            "features": load_json(row["features_json"], []),
+            "average_rating": float(average_rating) if average_rating else None,
+            "review_count": parse_int(row["review_count"]) or 0,
+            "original_category_path": trim_len(row["original_category_path"], 500),
+            "scraping_source": (row["scraper_type"] or "csv").strip(),
+        },
+    }
+
+
+# Columns every unified-scraper CSV must have
+REQUIRED_HEADERS = [
+    # Platform
+    "platform_name","platform_display_name","platform_type","platform_base_url",
+    # Seller
+    "seller_username","seller_display_name","seller_profile_url",
+    # Core product
+    "uuid","product_name","product_slug","description","short_description",
+    "price","original_price","currency","brand_name","main_category","subcategory",
+    "model_number","sku","image_url",
+    # Links
+    "listing_page_url","product_url",
+    # Stock & shipping
+    "in_stock","stock_quantity","stock_status","shipping_cost","shipping_time","free_shipping",
+    # Policies & extra
+    "warranty_period","return_policy","specifications_json","features_json",
+    "average_rating","review_count","original_category_path",
+    # Scraper meta
+    "scraper_type","scraped_at",
+]
+
+# Print a progress line every this many rows in row-by-row mode
+PROGRESS_EVERY = 5000
+
+
+# Columns rewritten when a batched upsert hits an existing row (created_at and counters are kept)
+CORE_UPDATE_FIELDS = [
+    "slug", "name", "description", "short_description", "price", "original_price", "currency",
+    "brand", "category", "seller", "model_number", "sku", "main_image_url", "platform_type", "updated_at",
+]
+ECOMM_UPDATE_FIELDS = [
+    "product", "platform_url", "in_stock", "stock_quantity", "stock_status", "shipping_cost",
+    "shipping_time", "free_shipping", "warranty_period", "return_policy", "specifications", "features",
+    "average_rating", "review_count", "original_category_path", "scraping_source", "last_scraped",
+]
+
+
+class BatchImporter:
+    """
+    Set-based import of one chunk of CSV rows at a time (--batch-size).
+
+    Platform / Seller / Brand / ProductCategory are resolved through caches that
+    live for the whole run: keys not seen yet cost one lookup and one bulk
+    insert per chunk. CoreProduct and EcommerceProduct are upserted with
+    bulk_create(update_conflicts=True), i.e. INSERT ... ON CONFLICT DO UPDATE
+    on uuid and on (platform, platform_product_id).
+
+    Each chunk runs in its own transaction. If it fails (e.g. a platform_url
+    already owned by another platform), it is rolled back and re-imported
+    row by row with import_row so only the offending rows are reported.
+    """
+
+    def __init__(self, command, counters, dry_run, import_row):
+        self.command = command
+        self.counters = counters
+        self.dry_run = dry_run
+        self.import_row = import_row
+        self.platforms = {}   # name -> Platform
+        self.sellers = {}     # (platform_id, username) -> Seller
+        self.brands = {}      # slug -> Brand
+        self.brand_slugs = {}  # brand name -> slug, computed once (random for names slugify() cannot handle)
+        self.categories = {}  # ("suggested", name) | ("csv", main, sub) -> ProductCategory
+
+    def import_chunk(self, chunk):
+        """Import [(row number, row), ...]"""
+        prepared = []
+        for idx, row in chunk:
+            reason, values = prepare_row(row)
+            if reason:
+                self.counters[reason] += 1
+                continue
+            try:
+                values["uuid"] = uuid.UUID(str(values["uuid"]))
+            except ValueError:
+                # Let import_row report it exactly as the row-by-row import does
+                self._import_rows([(idx, row)])
+                continue
+            prepared.append((idx, row, values))
+        if not prepared:
+            return
+
+        suggestions = suggest_categories([values["category_text"] for _, _, values in prepared])
+        caches = [dict(cache) for cache in (self.platforms, self.sellers, self.brand_slugs, self.brands, self.categories)]
+        counters = dict(self.counters)
+        try:
+            with transaction.atomic():
+                self._resolve_dimensions([values for _, _, values in prepared], suggestions)
+                self._upsert_products([values for _, _, values in prepared])
+        except (DatabaseError, ValueError) as e:
+            # Rows created inside the rolled-back transaction must not stay cached
+            self.platforms, self.sellers, self.brand_slugs, self.brands, self.categories = caches
+            self.counters.update(counters)
+            self.command.stderr.write(self.command.style.WARNING(
+                f"Batch of {len(prepared)} rows failed ({e}); retrying row by row"))
+            self._import_rows([(idx, row) for idx, row, _ in prepared])
+
+    def _import_rows(self, rows):
+        for idx, row in rows:
+            counters = dict(self.counters)
+            try:
+                with transaction.atomic():
+                    self.import_row(row)
+            except Exception as e:
+                # The row was rolled back, so are its counts
+                self.counters.update(counters)
+                self.counters["skipped"] += 1
+                self.command.stderr.write(self.command.style.ERROR(f"Row {idx} error: {e}"))
+
+    @staticmethod
+    def _fill(cache, keys, model, lookup, key_of, build):
+        """
+        Make sure cache[key] holds a row for every key, inserting missing rows in one statement.
+
+        Args:
+            cache: key -> model instance, updated in place
+            keys: keys wanted (any order, duplicates allowed)
+            model: model class
+            lookup: keys -> filter kwargs matching (a superset of) their rows
+            key_of: instance -> cache key (None for rows that were not asked for)
+            build: key -> unsaved instance carrying the get_or_create defaults
+
+        Returns:
+            Number of keys whose row was inserted by this call
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in cache]
+        if not missing:
+            return 0
+
+        def fetch(wanted):
+            for obj in model.objects.filter(**lookup(wanted)):
+                key = key_of(obj)
+                if key in wanted and key not in cache:
+                    cache[key] = obj
+
+        fetch(set(missing))
+        to_create = [key for key in missing if key not in cache]
+        if to_create:
+            model.objects.bulk_create([build(key) for key in to_create], ignore_conflicts=True)
+            fetch(set(to_create))
+        return sum(1 for key in to_create if key in cache)
+
+    def _resolve_dimensions(self, prepared, suggestions):
+        counters = self.counters
+
+        # Platforms: created from the first row that names them, then each field refreshed
+        # from the last row that fills it, as row by row does
+        first, latest = {}, defaultdict(dict)
+        for values in prepared:
+            first.setdefault(values["platform_name"], values)
+            for key in ("platform_display", "base_url"):
+                if values[key]:
+                    latest[values["platform_name"]][key] = values[key]
+        counters["platform"] += self._fill(
+            self.platforms, first, Platform,
+            lambda names: {"name__in": names},
+            lambda platform: platform.name,
+            lambda name: Platform(
+                name=name,
+                display_name=first[name]["platform_display"],
+                platform_type=first[name]["platform_type"],
+                base_url=first[name]["base_url"],
+                is_active=True,
+                scraping_enabled=True,
+            ),
+        )
+        for name, values in latest.items():
+            # keep display_name/base_url fresh if provided
+            platform = self.platforms[name]
+            changed = []
+            if values.get("platform_display") and platform.display_name != values["platform_display"]:
+                platform.display_name = values["platform_display"]
+                changed.append("display_name")
+            if values.get("base_url") and platform.base_url != values["base_url"]:
+                platform.base_url = values["base_url"]
+                changed.append("base_url")
+            if changed and not self.dry_run:
+                platform.save(update_fields=changed + ["updated_at"])
+
+        # Sellers
+        seller_rows = {}
+        for values in prepared:
+            values["platform"] = self.platforms[values["platform_name"]]
+            seller_rows.setdefault((values["platform"].id, values["seller_username"]), values)
+        counters["seller"] += self._fill(
+            self.sellers, seller_rows, Seller,
+            lambda keys: {"platform_id__in": {k[0] for k in keys}, "username__in": {k[1] for k in keys}},
+            lambda seller: (seller.platform_id, seller.username),
+            lambda key: Seller(
+                platform=seller_rows[key]["platform"],
+                username=key[1],
+                display_name=seller_rows[key]["seller_display"],
+                profile_url=seller_rows[key]["seller_profile_url"],
+            ),
+        )
+
+        # Brands, matched by slug; a name already taken under another slug reuses that brand
+        brand_names = {}
+        for values in prepared:
+            name = values["brand_name"]
+            if name and name not in self.brand_slugs:
+                self.brand_slugs[name] = slugify(name)
+            if name:
+                brand_names.setdefault(self.brand_slugs[name], name)
+        counters["brand"] += self._fill(
+            self.brands, brand_names, Brand,
+            lambda slugs: {"slug__in": slugs},
+            lambda brand: brand.slug,
+            lambda slug: Brand(name=brand_names[slug], display_name=brand_names[slug], slug=slug),
+        )
+        unresolved = {name: slug for slug, name in brand_names.items() if slug not in self.brands}
+        if unresolved:
+            for brand in Brand.objects.filter(name__in=unresolved):
+                self.brands[unresolved[brand.name]] = brand
+
+        # Categories: a suggested category is looked up by name first, then by slug
+        category_keys = []
+        for values, suggested in zip(prepared, suggestions):
+            if suggested:
+                key = ("suggested", suggested)
+            else:
+                key = ("csv", values["main_category"], values["subcategory"])
+            values["category_key"] = key
+            category_keys.append(key)
+        named = [key for key in dict.fromkeys(category_keys) if key[0] == "suggested" and key not in self.categories]
+        if named:
+            for category in ProductCategory.objects.filter(name__in=[key[1] for key in named]).order_by("id"):
+                self.categories.setdefault(("suggested", category.name), category)
+
+        category_slugs = {}
+        for key in dict.fromkeys(category_keys):
+            if key in self.categories:
+                continue
+            if key[0] == "suggested":
+                category_slugs[key] = slugify(key[1])
+            else:
+                main_category, subcategory = key[1], key[2]
+                category_slugs[key] = slugify(f"{main_category}-{subcategory}" if subcategory else main_category)
+        slug_keys = {}
+        for key, slug in category_slugs.items():
+            slug_keys.setdefault(slug, []).append(key)
+
+        def build_category(key):
+            if key[0] == "suggested":
+                return ProductCategory(slug=category_slugs[key], name=key[1], main_category="General",
+                                       subcategory=key[1], is_active=True)
+            main_category, subcategory = key[1], key[2]
+            return ProductCategory(slug=category_slugs[key], name=subcategory or main_category,
+                                   main_category=main_category, subcategory=subcategory, is_active=True)
+
+        # Several keys can share a slug (e.g. "Home & Kitchen" and "Home Kitchen"); the first one creates it
+        primary = {keys[0]: keys for keys in slug_keys.values()}
+        counters["category"] += self._fill(
+            self.categories, primary, ProductCategory,
+            lambda keys: {"slug__in": [category_slugs[key] for key in keys]},
+            lambda category: slug_keys[category.slug][0] if category.slug in slug_keys else None,
+            build_category,
+        )
+        for keys in primary.values():
+            for key in keys[1:]:
+                self.categories[key] = self.categories[keys[0]]
+
+        for values in prepared:
+            values["seller"] = self.sellers[(values["platform"].id, values["seller_username"])]
+            values["brand"] = self.brands.get(self.brand_slugs[values["brand_name"]]) if values["brand_name"] else None
+            values["category"] = self.categories[values["category_key"]]
+
+    def _unique_slugs(self, wanted):
+        """
+        Final slug per product uuid, using the same base-1, base-2, ... scheme as import_row.
+
+        Args:
+            wanted: [(uuid, base slug), ...] in row order
+        """
+        bases = {base for _, base in wanted}
+        owners = {}  # slug -> uuid of the product that has it (in the DB or earlier in this chunk)
+        owners.update(CoreProduct.objects.filter(slug__in=bases).values_list("slug", "uuid"))
+
+        claimants = {}
+        for product_uuid, base in wanted:
+            claimants.setdefault(base, set()).add(product_uuid)
+        crowded = [base for base in bases
+                   if len(claimants[base]) > 1 or owners.get(base, next(iter(claimants[base]))) not in claimants[base]]
+
+        # Look up base-1, base-2, ... in growing windows (one array parameter, probed on the unique
+        # index; a Django IN list this long costs more to build than to run) until every
+        # crowded base has a free suffix for each of its claimants
+        fetched = dict.fromkeys(crowded, 0)
+        window = 16
+        while crowded:
+            candidates = []
+            for base in crowded:
+                candidates += [f"{base}-{n}" for n in range(fetched[base] + 1, fetched[base] + window + 1)]
+                fetched[base] += window
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT slug, uuid FROM {CoreProduct._meta.db_table} WHERE slug = ANY(%s)", [candidates])
+                owners.update(cursor.fetchall())
+            crowded = [base for base in crowded
+                       if sum(f"{base}-{n}" not in owners and f"{base}-{n}" not in bases
+                              for n in range(1, fetched[base] + 1)) < len(claimants[base])]
+            window *= 2
+
+        held = {}  # uuid -> slugs it already has (each uuid occurs once in wanted)
+        for slug, owner in owners.items():
+            held.setdefault(owner, []).append(slug)
+
+        # base-1 .. base-(next_free[base] - 1) are all taken, so a scan for the same base resumes
+        # there instead of at 1 (the same answer: a product holding one of them still gets it back)
+        next_free = {}
+        slugs = {}
+        for product_uuid, base in wanted:
+            if owners.get(base, product_uuid) == product_uuid:
+                slug = base
+            else:
+                prefix = f"{base}-"
+                i = next_free.get(base, 1)
+                own = [int(s[len(prefix):]) for s in held.get(product_uuid, ())
+                       if s.startswith(prefix) and s[len(prefix):].isdigit()]
+                own = [n for n in own if n < i and f"{prefix}{n}" in held[product_uuid]]
+                if own:
+                    slug = f"{prefix}{min(own)}"
+                else:
+                    while owners.get(f"{prefix}{i}", product_uuid) != product_uuid:
+                        i += 1
+                    slug = f"{prefix}{i}"
+                    next_free[base] = i + 1
+            owners[slug] = product_uuid
+            slugs[product_uuid] = slug
+        return slugs
+
+    def _upsert_products(self, prepared):
+        counters = self.counters
+
+        # One CoreProduct per uuid, with its last row's values; slugs are handed out in
+        # first-occurrence order, as row by row (where the first row claims the slug)
+        rows_by_uuid = {}
+        for values in prepared:
+            rows_by_uuid[values["uuid"]] = values
+        slugs = self._unique_slugs([(product_uuid, values["slug"]) for product_uuid, values in rows_by_uuid.items()])
+
+        existing = set(CoreProduct.objects.filter(uuid__in=rows_by_uuid).values_list("uuid", flat=True))
+        for values in prepared:
+            counters["product_updated" if values["uuid"] in existing else "product_created"] += 1
+            existing.add(values["uuid"])
+
+        cores = {
+            product_uuid: CoreProduct(
+                uuid=product_uuid,
+                slug=slugs[product_uuid],
+                brand=values["brand"],
+                category=values["category"],
+                seller=values["seller"],
+                **values["core"],
+            )
+            for product_uuid, values in rows_by_uuid.items()
+        }
+        CoreProduct.objects.bulk_create(
+            list(cores.values()),
+            update_conflicts=True,
+            unique_fields=["uuid"],
+            update_fields=CORE_UPDATE_FIELDS,
+        )
+
+        # EcommerceProduct per (platform, platform_product_id), again last row wins
+        ecomm_rows = {}
+        for values in prepared:
+            ecomm_rows[(values["platform"].id, values["ecomm"]["platform_product_id"])] = values
+        existing = set(
+            EcommerceProduct.objects.filter(
+                platform_id__in={key[0] for key in ecomm_rows},
+                platform_product_id__in={key[1] for key in ecomm_rows},
+            ).values_list("platform_id", "platform_product_id")
+        )
+        for values in prepared:
+            key = (values["platform"].id, values["ecomm"]["platform_product_id"])
+            counters["ecomm_updated" if key in existing else "ecomm_created"] += 1
+            existing.add(key)
+
+        EcommerceProduct.objects.bulk_create(
+            [
+                EcommerceProduct(product=cores[values["uuid"]], platform=values["platform"], **values["ecomm"])
+                for values in ecomm_rows.values()
+            ],
+            update_conflicts=True,
+            unique_fields=["platform", "platform_product_id"],
+            update_fields=ECOMM_UPDATE_FIELDS,
+        )
+
+
 class Command(BaseCommand):
     help = "Import products from unified CSV into the database"
 
@@ -92,11 +568,16 @@ class Command(BaseCommand):
         parser.add_argument("--csv-path", required=True, help="Path to CSV file")
         parser.add_argument("--dry-run", action="store_true", help="Validate only; no writes")
         parser.add_argument("--limit", type=int, default=0, help="Limit rows for import (0 = all)")
+        parser.add_argument(
+            "--batch-size", type=int, default=0,
+            help="Stream the CSV and import this many rows per set-based batch, e.g. 2000 (0 = row by row)",
+        )
 
     def handle(self, *args, **options):
         csv_path = options["csv_path"]
         dry_run = options["dry_run"]
         limit = options["limit"]
+        batch_size = options["batch_size"]
 
         counters = {
             "platform": 0,
@@ -112,41 +593,9 @@ class Command(BaseCommand):
             "skipped_no_price": 0,
         }
 
-        required_headers = [
-            # Platform
-            "platform_name","platform_display_name","platform_type","platform_base_url",
-            # Seller
-            "seller_username","seller_display_name","seller_profile_url",
-            # Core product
-            "uuid","product_name","product_slug","description","short_description",
-            "price","original_price","currency","brand_name","main_category","subcategory",
-            "model_number","sku","image_url",
-            # Links
-            "listing_page_url","product_url",
-            # Stock & shipping
-            "in_stock","stock_quantity","stock_status","shipping_cost","shipping_time","free_shipping",
-            # Policies & extra
-            "warranty_period","return_policy","specifications_json","features_json",
-            "average_rating","review_count","original_category_path",
-            # Scraper meta
-            "scraper_type","scraped_at",
-        ]
-
-        try:
-            with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                missing = [h for h in required_headers if h not in reader.fieldnames]
-                if missing:
-                    raise CommandError(f"CSV missing required columns: {', '.join(missing)}")
-
-                rows = list(reader)
-        except FileNotFoundError:
-            raise CommandError(f"CSV not found: {csv_path}")
-
-        if limit and limit > 0:
-            rows = rows[:limit]
-
-        self.stdout.write(self.style.NOTICE(f"Importing {len(rows)} rows from {csv_path} (dry_run={dry_run})"))
+        stream = self.open_csv(csv_path, limit)
+        if not batch_size:
+            self.stdout.write(self.style.NOTICE(f"Importing rows from {csv_path} (dry_run={dry_run})"))
 
         def import_row(row):
             # Skip category URLs - only import actual products
@@ -209,10 +658,14 @@ class Command(BaseCommand):
             brand_name = (row["brand_name"] or "").strip()
             if brand_name:
                 brand_slug = slugify(brand_name)
-                brand, created = Brand.objects.get_or_create(
-                    slug=brand_slug,
-                    defaults={"name": brand_name, "display_name": brand_name},
-                )
+                try:
+                    brand, created = Brand.objects.get_or_create(
+                        slug=brand_slug,
+                        defaults={"name": brand_name, "display_name": brand_name},
+                    )
+                except IntegrityError:
+                    # The name is already taken under another slug: use that brand, as batches do
+                    brand, created = Brand.objects.get(name=brand_name), False
                 if created:
                     counters["brand"] += 1
 
@@ -221,20 +674,7 @@ class Command(BaseCommand):
             product_description = (row["description"] or "").strip()
             # Fallback: derive a readable name from product URL slug if missing
             if not product_name:
-                url_for_name = (row.get("product_url") or "").strip()
-                if url_for_name:
-                    try:
-                        from urllib.parse import urlparse
-                        path = urlparse(url_for_name).path
-                        # take last non-empty segment
-                        seg = next((s for s in reversed(path.split('/')) if s), '')
-                        if seg:
-                            # replace hyphens/underscores with spaces and title-case
-                            derived = seg.replace('-', ' ').replace('_', ' ').strip()
-                            if derived:
-                                product_name = derived.title()[:300]
-                    except Exception:
-                        pass
+                product_name = name_from_url(row.get("product_url")) or product_name
             
             # Try automatic category matching first
             suggested_category = suggest_category(product_name, product_description)
@@ -396,31 +836,81 @@ class Command(BaseCommand):
             else:
                 counters["ecomm_updated"] += 1
 
-        # Import rows (optionally in a single rollback-able transaction for dry_run)
+        if batch_size:
+            with stream:
+                self.import_batched(stream, counters, import_row, dry_run, batch_size)
+        else:
+            # Import rows (optionally in a single rollback-able transaction for dry_run)
+            with stream:
+                try:
+                    if dry_run:
+                        try:
+                            with transaction.atomic():
+                                for idx, row in stream:
+                                    import_row(row)
+                                    self.report_progress(stream, idx)
+                                # force rollback
+                                raise RuntimeError("DRY_RUN")
+                        except RuntimeError as e:
+                            if str(e) != "DRY_RUN":
+                                raise
+                    else:
+                        for idx, row in stream:
+                            try:
+                                import_row(row)
+                            except Exception as e:
+                                counters["skipped"] += 1
+                                self.stderr.write(self.style.ERROR(f"Row {idx} error: {e}"))
+                            self.report_progress(stream, idx)
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f"Fatal import error: {e}"))
+
+        # Summary
+        self.stdout.write(self.style.SUCCESS("\nImport completed"))
+        for k, v in counters.items():
+            self.stdout.write(f"{k}: {v}")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def open_csv(self, csv_path, limit):
+        """Open the CSV for streaming, checking it has every required column"""
+        try:
+            return CSVStream(csv_path, required=REQUIRED_HEADERS, limit=limit)
+        except FileNotFoundError:
+            raise CommandError(f"CSV not found: {csv_path}")
+        except HeaderError as e:
+            raise CommandError(str(e))
+
+    def report_progress(self, stream, idx):
+        if idx % PROGRESS_EVERY == 0:
+            self.stdout.write(f"   ... {stream.progress}")
+
+    def import_batched(self, stream, counters, import_row, dry_run, batch_size):
+        """Stream the CSV in chunks of batch_size rows through BatchImporter"""
+        self.stdout.write(self.style.NOTICE(
+            f"Importing rows from {stream.path} in batches of {batch_size} (dry_run={dry_run})"))
+        importer = BatchImporter(self, counters, dry_run, import_row)
+
+        def run():
+            for chunk in stream.batches(batch_size):
+                importer.import_chunk(chunk)
+                self.stdout.write(f"   ... {stream.progress}")
+
         try:
             if dry_run:
                 try:
                     with transaction.atomic():
-                        for idx, row in enumerate(rows, start=1):
-                            import_row(row)
+                        run()
                         # force rollback
                         raise RuntimeError("DRY_RUN")
                 except RuntimeError as e:
                     if str(e) != "DRY_RUN":
                         raise
             else:
-                for idx, row in enumerate(rows, start=1):
-                    try:
-                        import_row(row)
-                    except Exception as e:
-                        counters["skipped"] += 1
-                        self.stderr.write(self.style.ERROR(f"Row {idx} error: {e}"))
+                run()
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"Fatal import error: {e}"))
 
-        # Summary
-        self.stdout.write(self.style.SUCCESS("\nImport completed"))
-        for k, v in counters.items():
-            self.stdout.write(f"{k}: {v}")
-
-        self.stdout.write(self.style.SUCCESS("Done."))
+        progress = stream.progress
+        self.stdout.write(self.style.NOTICE(
+            f"Imported {progress.rows} rows in {progress.elapsed:.1f}s ({progress.rate:.0f} rows/s)"))
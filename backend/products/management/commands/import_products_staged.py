@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Load a unified-scraper CSV through an unlogged staging table
+The file is COPYed as text into products_csv_staging, then normalized,
+deduplicated, categorized and upserted into the product tables with set-based
+SQL, all in one transaction. Rows that cannot be imported are written to
+products_csv_import_reject (CSVImportReject) with a reason, instead of failing the load.
+
+Values are parsed as import_products_csv parses them (the pg_temp functions
+below mirror its parse_* helpers and django's slugify), and categories come
+from the same rule engine as suggest_category. Differences from the row-by-row
+importer:
+- a uuid or product URL that occurs on several rows is imported once, from its
+  last row; the earlier rows are rejected as duplicates
+- slugs are allocated against the table as it was before the load, and a
+  product that already has one of its base-N slugs keeps it
+- the CSV must be well-formed: COPY aborts on a row with the wrong number of
+  fields (PostgreSQL reports the line)
+
+Run: python manage.py import_products_staged --csv-path products.csv [--dry-run] [--limit N] [--keep-staging]
+"""
+
+import csv
+import io
+import time
+import uuid
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+
+from products.models import Platform, Seller, Brand, ProductCategory, CoreProduct, EcommerceProduct, CSVImportReject
+from products.utils.categories_utils import get_category_engine
+from products.utils.csv_stream import CSVStream, HeaderError, LineFile, csv_records
+from products.management.commands.import_products_csv import (
+    REQUIRED_HEADERS, CORE_UPDATE_FIELDS, ECOMM_UPDATE_FIELDS, derive_platform_product_id,
+)
+
+STAGING_TABLE = 'products_csv_staging'
+REJECT_TABLE = CSVImportReject._meta.db_table
+
+# Characters str.strip() removes, as a PostgreSQL literal
+WHITESPACE = "U&'" + ''.join(f'\\{c:04X}' for c in range(0x10000) if chr(c).isspace()) + "'"
+
+FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION pg_temp.py_strip(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE AS $$ SELECT btrim(coalesce(value, ''), {ws}) $$;
+
+-- parse_bool
+CREATE OR REPLACE FUNCTION pg_temp.py_bool(value text) RETURNS boolean
+    LANGUAGE sql IMMUTABLE AS $$ SELECT lower(pg_temp.py_strip(value)) IN ('1', 'true', 'yes', 'y') $$;
+
+-- parse_int; the range is checked against the target column
+CREATE OR REPLACE FUNCTION pg_temp.py_int(value text) RETURNS numeric
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE WHEN pg_temp.py_strip(value) ~ '^[+-]?[0-9]+$' THEN pg_temp.py_strip(value)::numeric END
+$$;
+
+-- parse_decimal: "11 PKR" is 11000 (Decimal() ignores underscores), otherwise everything but digits and dots is dropped
+-- (single expressions, so the planner inlines these instead of calling them per row)
+CREATE OR REPLACE FUNCTION pg_temp.py_decimal(value text) RETURNS numeric
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN pg_temp.py_strip(value) = '' THEN NULL
+        WHEN strpos(upper(value), 'PKR') > 0 AND btrim(replace(upper(value), 'PKR', ''), {ws}) <> '' THEN
+            CASE WHEN replace(btrim(replace(upper(value), 'PKR', ''), {ws}), '_', '') ~ '^[+-]?([0-9]+\\.?[0-9]*|\\.[0-9]+)([eE][+-]?[0-9]{{1,4}})?$'
+                 THEN replace(btrim(replace(upper(value), 'PKR', ''), {ws}), '_', '')::numeric * 1000 END
+        WHEN regexp_replace(value, '[^0-9.]', '', 'g') ~ '^([0-9]+\\.?[0-9]*|\\.[0-9]+)$'
+            THEN regexp_replace(value, '[^0-9.]', '', 'g')::numeric
+    END
+$$;
+
+-- load_json: the default for blank or invalid JSON
+CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text, fallback jsonb) RETURNS jsonb
+    LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    IF pg_temp.py_strip(value) = '' THEN
+        RETURN fallback;
+    END IF;
+    RETURN pg_temp.py_strip(value)::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN fallback;
+END
+$$;
+
+-- django.utils.text.slugify ('' where it returns '')
+CREATE OR REPLACE FUNCTION pg_temp.py_slugify(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT btrim(regexp_replace(regexp_replace(
+               lower(regexp_replace(normalize(coalesce(value, ''), NFKD), '[^\\x01-\\x7f]', '', 'g')),
+               '[^a-z0-9_\\s\\x1c-\\x1f-]', '', 'g'), '[-\\s\\x1c-\\x1f]+', '-', 'g'), '-_')
+$$;
+
+-- str.title(): initcap(), except that a letter after a digit also starts a word
+CREATE OR REPLACE FUNCTION pg_temp.py_title(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT replace(initcap(regexp_replace(value, '([0-9])', '\\1' || chr(1), 'g')), chr(1), '')
+$$;
+
+-- name_from_url: last non-empty path segment of the URL, title-cased (urlparse drops tabs and newlines)
+CREATE OR REPLACE FUNCTION pg_temp.name_from_url(url text) RETURNS text
+    LANGUAGE sql IMMUTABLE AS $$
+    SELECT left(pg_temp.py_title(pg_temp.py_strip(translate(coalesce(substring(
+               regexp_replace(regexp_replace(regexp_replace(translate(pg_temp.py_strip(url), E'\\t\\r\\n', ''),
+                   '^([A-Za-z][A-Za-z0-9+.-]*:)?(//[^/?#]*)?', ''), '[?#].*$', ''), ';[^/]*$', '')
+               FROM '([^/]+)/*$'), ''), '-_', '  '))), 300)
+$$;
+"""
+
+NORMALIZE_SQL = """
+CREATE TEMP TABLE staged ON COMMIT DROP AS
+SELECT st.row_no,
+       CASE WHEN a.product_url = '' OR strpos(a.product_url, 'product-category') > 0 THEN 'skipped_category'
+            WHEN pg_temp.py_strip(st.price) = '' THEN 'skipped_no_price' END AS skip,
+       NULL::text AS reject,
+       NULL::text AS detail,
+       a.platform_name,
+       coalesce(nullif(pg_temp.py_strip(coalesce(nullif(st.platform_display_name, ''), a.platform_name)), ''),
+                a.platform_name) AS platform_display,
+       coalesce(nullif(lower(pg_temp.py_strip(coalesce(nullif(st.platform_type, ''), 'ecommerce'))), ''),
+                'ecommerce') AS platform_type,
+       pg_temp.py_strip(st.platform_base_url) AS base_url,
+       b.seller_username,
+       pg_temp.py_strip(coalesce(nullif(st.seller_display_name, ''), b.seller_username)) AS seller_display,
+       pg_temp.py_strip(st.seller_profile_url) AS seller_profile_url,
+       pg_temp.py_strip(st.brand_name) AS brand_name,
+       NULL::text AS brand_slug,
+       lower(a.product_name || ' ' || a.description) AS category_text,
+       NULL::text AS suggested_category,
+       coalesce(nullif(pg_temp.py_strip(st.main_category), ''), 'General') AS main_category,
+       pg_temp.py_strip(st.subcategory) AS subcategory,
+       NULL::text AS category_slug,
+       CASE WHEN pg_temp.py_strip(st.uuid) = '' THEN gen_random_uuid()
+            WHEN a.uuid_hex ~ '^[0-9A-Fa-f]{{32}}$' THEN a.uuid_hex::uuid END AS product_uuid,
+       coalesce(nullif(st.product_slug, ''),
+                nullif(pg_temp.py_slugify(b.name || '-' || b.seller_username), ''),
+                gen_random_uuid()::text) AS slug,
+       b.name,
+       a.description,
+       pg_temp.py_strip(coalesce(nullif(st.short_description, ''), left(a.description, 200))) AS short_description,
+       pg_temp.py_decimal(st.price) AS price,
+       pg_temp.py_decimal(st.original_price) AS original_price,
+       left(upper(pg_temp.py_strip(coalesce(nullif(st.currency, ''), 'PKR'))), 3) AS currency,
+       pg_temp.py_strip(st.model_number) AS model_number,
+       pg_temp.py_strip(st.sku) AS sku,
+       pg_temp.py_strip(st.image_url) AS main_image_url,
+       a.product_url,
+       NULL::text AS platform_product_id,
+       left(a.product_url, 1000) AS platform_url,
+       pg_temp.py_bool(st.in_stock) AS in_stock,
+       pg_temp.py_int(st.stock_quantity) AS stock_quantity,
+       left(pg_temp.py_strip(st.stock_status), 100) AS stock_status,
+       coalesce(pg_temp.py_decimal(st.shipping_cost), 0) AS shipping_cost,
+       left(pg_temp.py_strip(st.shipping_time), 100) AS shipping_time,
+       pg_temp.py_bool(st.free_shipping) AS free_shipping,
+       left(pg_temp.py_strip(st.warranty_period), 100) AS warranty_period,
+       pg_temp.py_strip(st.return_policy) AS return_policy,
+       pg_temp.try_jsonb(st.specifications_json, '{{}}') AS specifications,
+       pg_temp.try_jsonb(st.features_json, '[]') AS features,
+       nullif(pg_temp.py_decimal(st.average_rating), 0) AS average_rating,
+       coalesce(pg_temp.py_int(st.review_count), 0) AS review_count,
+       left(pg_temp.py_strip(st.original_category_path), 500) AS original_category_path,
+       pg_temp.py_strip(coalesce(nullif(st.scraper_type, ''), 'csv')) AS scraping_source,
+       NULL::bigint AS platform_id,
+       NULL::bigint AS seller_id,
+       NULL::bigint AS brand_id,
+       NULL::bigint AS category_id
+  FROM {staging} st,
+       LATERAL (
+           SELECT pg_temp.py_strip(st.product_url) AS product_url,
+                  coalesce(nullif(lower(pg_temp.py_strip(st.platform_name)), ''), 'platform') AS platform_name,
+                  coalesce(nullif(pg_temp.py_strip(st.product_name), ''), pg_temp.name_from_url(st.product_url)) AS product_name,
+                  pg_temp.py_strip(st.description) AS description,
+                  replace(btrim(replace(replace(pg_temp.py_strip(st.uuid), 'urn:', ''), 'uuid:', ''), '{{}}'), '-', '') AS uuid_hex
+       ) a,
+       LATERAL (
+           SELECT coalesce(nullif(pg_temp.py_strip(coalesce(nullif(st.seller_username, ''), a.platform_name)), ''),
+                           a.platform_name) AS seller_username,
+                  coalesce(nullif(CASE WHEN coalesce(st.product_name, '') <> '' THEN pg_temp.py_strip(st.product_name)
+                                       ELSE a.product_name END, ''), 'Unnamed Product') AS name
+       ) b
+"""
+
+# staged column -> the model field it is written to; values the column cannot hold are rejected
+FIELD_CHECKS = [
+    ('platform_name', Platform, 'name'),
+    ('platform_display', Platform, 'display_name'),
+    ('platform_type', Platform, 'platform_type'),
+    ('base_url', Platform, 'base_url'),
+    ('seller_username', Seller, 'username'),
+    ('seller_display', Seller, 'display_name'),
+    ('seller_profile_url', Seller, 'profile_url'),
+    ('brand_name', Brand, 'name'),
+    ('brand_slug', Brand, 'slug'),
+    ('main_category', ProductCategory, 'main_category'),
+    ('subcategory', ProductCategory, 'subcategory'),
+    ('category_slug', ProductCategory, 'slug'),
+    ('slug', CoreProduct, 'slug'),
+    ('name', CoreProduct, 'name'),
+    ('short_description', CoreProduct, 'short_description'),
+    ('price', CoreProduct, 'price'),
+    ('original_price', CoreProduct, 'original_price'),
+    ('currency', CoreProduct, 'currency'),
+    ('model_number', CoreProduct, 'model_number'),
+    ('sku', CoreProduct, 'sku'),
+    ('main_image_url', CoreProduct, 'main_image_url'),
+    ('stock_quantity', EcommerceProduct, 'stock_quantity'),
+    ('shipping_cost', EcommerceProduct, 'shipping_cost'),
+    ('average_rating', EcommerceProduct, 'average_rating'),
+    ('review_count', EcommerceProduct, 'review_count'),
+    ('scraping_source', EcommerceProduct, 'scraping_source'),
+]
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table(model) -> str:
+    return quote(model._meta.db_table)
+
+
+def field_check(column: str, model, field_name: str):
+    """(SQL condition true when the value does not fit, message) for one FIELD_CHECKS entry"""
+    field = model._meta.get_field(field_name)
+    label = f'{model.__name__}.{field_name}'
+    if isinstance(field, models.DecimalField):
+        limit = 10 ** (field.max_digits - field.decimal_places)
+        return f'abs(round({column}, {field.decimal_places})) >= {limit}', f'{label} out of range'
+    if isinstance(field, models.IntegerField):
+        low, high = connection.ops.integer_field_range(field.get_internal_type())
+        return f'{column} NOT BETWEEN {low} AND {high}', f'{label} out of range'
+    if isinstance(field, models.FloatField):
+        return f'abs({column}) >= 1e308', f'{label} out of range'
+    return f'char_length({column}) > {field.max_length}', f'{label} longer than {field.max_length} characters'
+
+
+def insert_columns(model, values: dict):
+    """
+    Column list and SELECT expressions for INSERT INTO <model table> (...) SELECT ...
+
+    Args:
+        model: model class
+        values: {field name: SQL expression} for the fields the load supplies
+
+    Returns:
+        (columns, expressions, params): every other concrete field gets its model default
+        (now() for auto_now / auto_now_add, gen_random_uuid() for uuid4 defaults)
+    """
+    columns, expressions, params = [], [], []
+    for field in model._meta.concrete_fields:
+        if field.name in values:
+            expression = values[field.name]
+        elif isinstance(field, models.AutoField):
+            continue
+        elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            expression = 'now()'
+        elif field.default is uuid.uuid4:
+            expression = 'gen_random_uuid()'
+        elif field.null and not field.has_default():
+            continue
+        else:
+            expression = '%s'
+            params.append(field.get_db_prep_save(field.get_default(), connection))
+        columns.append(quote(field.column))
+        expressions.append(expression)
+    return ', '.join(columns), ', '.join(expressions), params
+
+
+def update_set(model, field_names) -> str:
+    """SET list for ON CONFLICT DO UPDATE, taking every field from the proposed row"""
+    columns = [model._meta.get_field(name).column for name in field_names]
+    return ', '.join(f'{quote(column)} = EXCLUDED.{quote(column)}' for column in columns)
+
+
+class Command(BaseCommand):
+    help = 'Import a unified-scraper CSV with COPY into a staging table and set-based SQL upserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv-path', required=True, help='Path to CSV file')
+        parser.add_argument('--dry-run', action='store_true', help='Run the whole load, then roll it back')
+        parser.add_argument('--limit', type=int, default=0, help='Only load the first N rows (0 = all)')
+        parser.add_argument('--keep-staging', action='store_true',
+                            help=f'Leave {STAGING_TABLE} in place after the load for inspection')
+
+    def handle(self, *args, **options):
+        csv_path = options['csv_path']
+        dry_run = options['dry_run']
+
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS('📥 STAGED CSV IMPORT'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+
+        header = self.read_header(csv_path)
+        self.run_id = uuid.uuid4()
+        self.counters = {
+            'platform': 0,
+            'brand': 0,
+            'seller': 0,
+            'category': 0,
+            'product_created': 0,
+            'product_updated': 0,
+            'ecomm_created': 0,
+            'ecomm_updated': 0,
+            'skipped_category': 0,
+            'skipped_no_price': 0,
+        }
+        self.rejects = {}
+
+        start = time.perf_counter()
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute('SELECT pg_try_advisory_xact_lock(hashtext(%s))', [STAGING_TABLE])
+                if not cursor.fetchone()[0]:
+                    raise CommandError('Another staged import is running')
+                self.cursor = cursor
+                self.load(csv_path, header, options['limit'])
+                self.normalize()
+                self.suggest_categories()
+                self.reject_rows(csv_path)
+                self.upsert_dimensions()
+                self.allocate_slugs()
+                self.upsert_products()
+                if not options['keep_staging']:
+                    cursor.execute(f'DROP TABLE {STAGING_TABLE}')
+                if dry_run:
+                    # force rollback
+                    raise RuntimeError('DRY_RUN')
+        except RuntimeError as e:
+            if str(e) != 'DRY_RUN':
+                raise
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(f"\n{'Dry run completed (rolled back)' if dry_run else 'Import completed'}"))
+        for key, value in self.counters.items():
+            self.stdout.write(f'{key}: {value}')
+        rejected = sum(self.rejects.values())
+        self.stdout.write(f'rejected: {rejected}')
+        for reason, count in sorted(self.rejects.items()):
+            self.stdout.write(f'   {reason}: {count}')
+        if rejected and not dry_run:
+            self.stdout.write(self.style.WARNING(f'⚠️ Rejected rows are in {REJECT_TABLE} (run_id {self.run_id})'))
+        self.stdout.write(self.style.NOTICE(
+            f'Imported {self.total} rows in {elapsed:.1f}s ({self.total / elapsed if elapsed else 0:.0f} rows/s)'))
+
+    def read_header(self, csv_path):
+        # every column becomes a staging column, so names must be unique and non-blank
+        try:
+            with CSVStream(csv_path, required=REQUIRED_HEADERS, strict=True) as stream:
+                return stream.fieldnames
+        except FileNotFoundError:
+            raise CommandError(f'CSV not found: {csv_path}')
+        except HeaderError as e:
+            raise CommandError(str(e))
+
+    def step(self, label, sql, params=None):
+        started = time.perf_counter()
+        self.cursor.execute(sql, params)
+        self.stdout.write(f'   ... {label} ({time.perf_counter() - started:.2f}s)')
+        return self.cursor
+
+    def copy(self, sql, f):
+        """COPY ... FROM STDIN, reading the file object f"""
+        if hasattr(self.cursor.cursor, 'copy_expert'):
+            self.cursor.copy_expert(sql, f)
+        else:  # psycopg 3
+            with self.cursor.copy(sql) as copy:
+                while data := f.read(1 << 20):
+                    copy.write(data)
+
+    def load(self, csv_path, header, limit):
+        """COPY the file, as text columns named after its header, into the staging table"""
+        cursor = self.cursor
+        columns = ', '.join(quote(h) for h in header)
+        cursor.execute(f'DROP TABLE IF EXISTS {STAGING_TABLE}')
+        cursor.execute(f"""
+            CREATE UNLOGGED TABLE {STAGING_TABLE} (
+                row_no bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                {', '.join(f'{quote(h)} text' for h in header)}
+            )
+        """)
+
+        started = time.perf_counter()
+        copy_sql = f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')"
+        with open(csv_path, 'rb') as f:
+            source = f
+            if limit and limit > 0:
+                # Only the header and the first N records reach COPY
+                records = csv_records(io.TextIOWrapper(f, encoding='utf-8', newline=''))
+                source = LineFile(islice(records, limit + 1))
+            self.copy(copy_sql, source)
+        cursor.execute(f'ANALYZE {STAGING_TABLE}')
+        cursor.execute(f'SELECT count(*) FROM {STAGING_TABLE}')
+        self.total = cursor.fetchone()[0]
+        self.stdout.write(f'   ... COPY {self.total} rows ({time.perf_counter() - started:.2f}s)')
+
+    def normalize(self):
+        """Parse every staged row into the values import_products_csv would write"""
+        self.cursor.execute(FUNCTIONS_SQL.format(ws=WHITESPACE))
+        self.step('normalize', NORMALIZE_SQL.format(staging=STAGING_TABLE))
+        self.cursor.execute('ANALYZE staged')
+
+        self.cursor.execute('SELECT skip, count(*) FROM staged WHERE skip IS NOT NULL GROUP BY skip')
+        for reason, count in self.cursor.fetchall():
+            self.counters[reason] += count
+        self.cursor.execute('DELETE FROM staged WHERE skip IS NOT NULL')
+
+        # platform_product_id is a SHA-1 of the URL, which core PostgreSQL cannot compute (pgcrypto can)
+        started = time.perf_counter()
+        self.cursor.execute('SELECT DISTINCT product_url FROM staged')
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for (url,) in self.cursor.fetchall():
+            writer.writerow([url, derive_platform_product_id(url)])
+        buffer.seek(0)
+        self.cursor.execute('CREATE TEMP TABLE product_id (product_url text, platform_product_id text) ON COMMIT DROP')
+        self.copy('COPY product_id FROM STDIN WITH (FORMAT csv)', buffer)
+        self.cursor.execute("""
+            UPDATE staged s SET platform_product_id = i.platform_product_id
+              FROM product_id i WHERE i.product_url = s.product_url
+        """)
+        self.stdout.write(f'   ... hash product URLs ({time.perf_counter() - started:.2f}s)')
+
+    def suggest_categories(self):
+        """
+        Category for every distinct name + description, with suggest_category's rules
+        run as PostgreSQL regular expressions, and the slugs the rows would use.
+        """
+        cursor = self.cursor
+        hard, categories = get_category_engine().postgres_rules()
+
+        # A CASE stops at the first rule that matches; hard rules only run behind one combined screen
+        whens, params = [], []
+        if hard:
+            whens.append('WHEN t.category_text ~* %s THEN CASE '
+                         + ' '.join('WHEN t.category_text ~* %s THEN %s' for _ in hard) + ' END')
+            params.append('|'.join(f'(?:{pattern})' for pattern, _ in hard))
+            params += [value for rule in hard for value in rule]
+        for category, positive, negative in categories:
+            if negative:
+                whens.append('WHEN t.category_text ~ %s AND t.category_text !~ %s THEN %s')
+                params += [positive, negative, category]
+            else:
+                whens.append('WHEN t.category_text ~ %s THEN %s')
+                params += [positive, category]
+        self.step('suggest categories', f"""
+            CREATE TEMP TABLE suggestion ON COMMIT DROP AS
+            SELECT t.category_text, {f"CASE {' '.join(whens)} END" if whens else 'NULL::text'} AS category
+              FROM (SELECT DISTINCT category_text FROM staged) t
+        """, params)
+        cursor.execute("""
+            UPDATE staged s
+               SET suggested_category = g.category, main_category = NULL, subcategory = NULL
+              FROM suggestion g
+             WHERE g.category_text = s.category_text AND g.category IS NOT NULL
+        """)
+
+        # One slug per brand name and per CSV category (random, as slugify(), when it would be empty)
+        cursor.execute("""
+            CREATE TEMP TABLE brand_key ON COMMIT DROP AS
+            SELECT brand_name, coalesce(nullif(pg_temp.py_slugify(brand_name), ''), gen_random_uuid()::text) AS slug
+              FROM (SELECT DISTINCT brand_name FROM staged WHERE brand_name <> '') b
+        """)
+        cursor.execute('UPDATE staged s SET brand_slug = k.slug FROM brand_key k WHERE k.brand_name = s.brand_name')
+        cursor.execute("""
+            CREATE TEMP TABLE category_key ON COMMIT DROP AS
+            SELECT suggested_category, main_category, subcategory,
+                   coalesce(nullif(pg_temp.py_slugify(CASE
+                                WHEN suggested_category IS NOT NULL THEN suggested_category
+                                WHEN subcategory <> '' THEN main_category || '-' || subcategory
+                                ELSE main_category END), ''),
+                            gen_random_uuid()::text) AS slug,
+                   NULL::bigint AS category_id
+              FROM (SELECT DISTINCT suggested_category, main_category, subcategory FROM staged) k
+        """)
+        cursor.execute("""
+            UPDATE staged s SET category_slug = k.slug
+              FROM category_key k
+             WHERE k.suggested_category IS NOT DISTINCT FROM s.suggested_category
+               AND k.main_category IS NOT DISTINCT FROM s.main_category
+               AND k.subcategory IS NOT DISTINCT FROM s.subcategory
+        """)
+
+    def reject_rows(self, csv_path):
+        """Move rows that cannot be imported from staged to the reject table"""
+        cursor = self.cursor
+        accepted = 'reject IS NULL'
+
+        cursor.execute(f"""
+            UPDATE staged s SET reject = 'invalid_uuid', detail = 'uuid ' || quote_literal(st.uuid) || ' is not a UUID'
+              FROM {STAGING_TABLE} st
+             WHERE st.row_no = s.row_no AND s.product_uuid IS NULL
+        """)
+
+        checks = [field_check(column, model, field_name) for column, model, field_name in FIELD_CHECKS]
+        cursor.execute(f"""
+            UPDATE staged SET reject = 'invalid_value',
+                   detail = CASE {' '.join(f'WHEN {condition} THEN %s' for condition, _ in checks)} END
+             WHERE {accepted} AND ({' OR '.join(f'coalesce({condition}, false)' for condition, _ in checks)})
+        """, [message for _, message in checks])
+
+        # One row per product and per listing URL: the last one wins
+        self.step('deduplicate', f"""
+            UPDATE staged s
+               SET reject = CASE WHEN d.last_for_uuid > s.row_no THEN 'duplicate_uuid' ELSE 'duplicate_url' END,
+                   detail = 'superseded by row ' || greatest(d.last_for_uuid, d.last_for_url)
+              FROM (SELECT row_no,
+                           max(row_no) OVER (PARTITION BY product_uuid) AS last_for_uuid,
+                           max(row_no) OVER (PARTITION BY platform_url) AS last_for_url
+                      FROM staged
+                     WHERE {accepted}) d
+             WHERE d.row_no = s.row_no AND greatest(d.last_for_uuid, d.last_for_url) > s.row_no
+        """)
+
+        # Rows the unique constraints of products_ecommerceproduct would refuse
+        ecomm, platform, core = table(EcommerceProduct), table(Platform), table(CoreProduct)
+        self.step('check listing conflicts', f"""
+            UPDATE staged s
+               SET reject = 'url_conflict',
+                   detail = 'product_url already belongs to ' || p.name || ' product ' || e.platform_product_id
+              FROM {ecomm} e JOIN {platform} p ON p.id = e.platform_id
+             WHERE s.{accepted} AND e.platform_url = s.platform_url
+               AND (p.name <> s.platform_name OR e.platform_product_id <> s.platform_product_id)
+        """)
+        cursor.execute(f"""
+            UPDATE staged s
+               SET reject = 'listing_conflict',
+                   detail = 'product already listed at ' || e.platform_url
+              FROM {core} c
+                   JOIN {ecomm} e ON e.product_id = c.id
+                   JOIN {platform} p ON p.id = e.platform_id
+             WHERE s.{accepted} AND c.uuid = s.product_uuid
+               AND (p.name <> s.platform_name OR e.platform_product_id <> s.platform_product_id)
+        """)
+
+        cursor.execute(f"""
+            INSERT INTO {REJECT_TABLE} (run_id, csv_path, row_no, reason, detail, row_data)
+            SELECT %s, %s, s.row_no, s.reject, s.detail, to_jsonb(st) - 'row_no'
+              FROM staged s JOIN {STAGING_TABLE} st ON st.row_no = s.row_no
+             WHERE s.reject IS NOT NULL
+        """, [self.run_id, csv_path])
+        cursor.execute('SELECT reject, count(*) FROM staged WHERE reject IS NOT NULL GROUP BY reject')
+        self.rejects = dict(cursor.fetchall())
+        cursor.execute('DELETE FROM staged WHERE reject IS NOT NULL')
+        cursor.execute('ANALYZE staged')
+
+    def upsert_dimensions(self):
+        """Platforms, sellers, brands and categories the rows need, created from the first row naming them"""
+        cursor = self.cursor
+        counters = self.counters
+        platform, seller, brand, category = table(Platform), table(Seller), table(Brand), table(ProductCategory)
+
+        columns, expressions, params = insert_columns(Platform, {
+            'name': 's.platform_name', 'display_name': 's.platform_display', 'platform_type': 's.platform_type',
+            'base_url': 's.base_url', 'is_active': 'true', 'scraping_enabled': 'true',
+        })
+        cursor.execute(f"""
+            INSERT INTO {platform} ({columns})
+            SELECT DISTINCT ON (s.platform_name) {expressions} FROM staged s ORDER BY s.platform_name, s.row_no
+            ON CONFLICT (name) DO NOTHING
+        """, params)
+        counters['platform'] += cursor.rowcount
+        # keep display_name/base_url fresh: the last row's display name and base URL, when given
+        cursor.execute(f"""
+            UPDATE {platform} p
+               SET display_name = l.display_name, base_url = coalesce(l.base_url, p.base_url), updated_at = now()
+              FROM (SELECT platform_name,
+                           (array_agg(platform_display ORDER BY row_no DESC))[1] AS display_name,
+                           (array_agg(base_url ORDER BY row_no DESC) FILTER (WHERE base_url <> ''))[1] AS base_url
+                      FROM staged GROUP BY platform_name) l
+             WHERE p.name = l.platform_name
+               AND (p.display_name <> l.display_name OR p.base_url <> coalesce(l.base_url, p.base_url))
+        """)
+
+        columns, expressions, params = insert_columns(Seller, {
+            'platform': 'p.id', 'username': 's.seller_username',
+            'display_name': 's.seller_display', 'profile_url': 's.seller_profile_url',
+        })
+        cursor.execute(f"""
+            INSERT INTO {seller} ({columns})
+            SELECT DISTINCT ON (p.id, s.seller_username) {expressions}
+              FROM staged s JOIN {platform} p ON p.name = s.platform_name
+             ORDER BY p.id, s.seller_username, s.row_no
+            ON CONFLICT (platform_id, username) DO NOTHING
+        """, params)
+        counters['seller'] += cursor.rowcount
+
+        # Brands are matched by slug; a name already taken under another slug reuses that brand
+        columns, expressions, params = insert_columns(Brand, {
+            'name': 's.brand_name', 'display_name': 's.brand_name', 'slug': 's.brand_slug',
+        })
+        cursor.execute(f"""
+            INSERT INTO {brand} ({columns})
+            SELECT DISTINCT ON (s.brand_slug) {expressions}
+              FROM staged s WHERE s.brand_slug IS NOT NULL ORDER BY s.brand_slug, s.row_no
+            ON CONFLICT DO NOTHING
+        """, params)
+        counters['brand'] += cursor.rowcount
+
+        # A suggested category is looked up by name first (lowest id), then by slug; when several
+        # keys share a slug, the one whose first row comes first creates it
+        cursor.execute(f"""
+            UPDATE category_key k
+               SET category_id = (SELECT min(c.id) FROM {category} c WHERE c.name = k.suggested_category)
+             WHERE k.suggested_category IS NOT NULL
+        """)
+        columns, expressions, params = insert_columns(ProductCategory, {
+            'slug': 'k.slug',
+            'name': "coalesce(k.suggested_category, nullif(k.subcategory, ''), k.main_category)",
+            'main_category': "coalesce(k.main_category, 'General')",
+            'subcategory': 'coalesce(k.suggested_category, k.subcategory)',
+            'is_active': 'true',
+        })
+        cursor.execute(f"""
+            INSERT INTO {category} ({columns})
+            SELECT DISTINCT ON (k.slug) {expressions}
+              FROM category_key k
+                   JOIN (SELECT suggested_category, main_category, subcategory, min(row_no) AS first_row
+                           FROM staged GROUP BY suggested_category, main_category, subcategory) f
+                     ON f.suggested_category IS NOT DISTINCT FROM k.suggested_category
+                    AND f.main_category IS NOT DISTINCT FROM k.main_category
+                    AND f.subcategory IS NOT DISTINCT FROM k.subcategory
+             WHERE k.category_id IS NULL
+             ORDER BY k.slug, f.first_row
+            ON CONFLICT (slug) DO NOTHING
+        """, params)
+        counters['category'] += cursor.rowcount
+        cursor.execute(f"""
+            UPDATE category_key k SET category_id = c.id
+              FROM {category} c WHERE c.slug = k.slug AND k.category_id IS NULL
+        """)
+
+        self.step('resolve dimensions', f"""
+            UPDATE staged s
+               SET platform_id = x.platform_id, seller_id = x.seller_id,
+                   brand_id = x.brand_id, category_id = x.category_id
+              FROM (SELECT t.row_no, p.id AS platform_id, v.id AS seller_id,
+                           coalesce(b.id, n.id) AS brand_id, k.category_id
+                      FROM staged t
+                           JOIN {platform} p ON p.name = t.platform_name
+                           JOIN {seller} v ON v.platform_id = p.id AND v.username = t.seller_username
+                           LEFT JOIN {brand} b ON b.slug = t.brand_slug
+                           LEFT JOIN {brand} n ON n.name = t.brand_name AND t.brand_slug IS NOT NULL
+                           JOIN category_key k
+                             ON k.suggested_category IS NOT DISTINCT FROM t.suggested_category
+                            AND k.main_category IS NOT DISTINCT FROM t.main_category
+                            AND k.subcategory IS NOT DISTINCT FROM t.subcategory) x
+             WHERE x.row_no = s.row_no
+        """)
+
+    def allocate_slugs(self):
+        """
+        Final slug per product, with import_row's base, base-1, base-2, ... scheme.
+
+        A base goes to the product that already has it, else to the first row asking
+        for it; a product holding one of its base-N slugs keeps it; everyone else gets
+        the lowest free suffixes of their base, in row order.
+        """
+        cursor = self.cursor
+        core = table(CoreProduct)
+        cursor.execute(f"""
+            CREATE TEMP TABLE product_slug ON COMMIT DROP AS
+            SELECT s.row_no, s.product_uuid, s.slug AS base, c.slug AS current_slug, NULL::text AS slug
+              FROM staged s LEFT JOIN {core} c ON c.uuid = s.product_uuid
+        """)
+        cursor.execute('CREATE INDEX ON product_slug (base)')
+        cursor.execute('ANALYZE product_slug')
+        cursor.execute(f"""
+            UPDATE product_slug p SET slug = p.base
+             WHERE EXISTS (SELECT 1 FROM {core} c WHERE c.slug = p.base AND c.uuid = p.product_uuid)
+                OR (NOT EXISTS (SELECT 1 FROM {core} c WHERE c.slug = p.base)
+                    AND NOT EXISTS (SELECT 1 FROM product_slug q WHERE q.base = p.base AND q.row_no < p.row_no))
+        """)
+        cursor.execute("""
+            UPDATE product_slug SET slug = current_slug
+             WHERE slug IS NULL AND left(current_slug, length(base) + 1) = base || '-'
+               AND substr(current_slug, length(base) + 2) ~ '^[0-9]+$'
+        """)
+
+        # Free base-N candidates, looked up in growing windows until every base has enough
+        cursor.execute("""
+            CREATE TEMP TABLE slug_need ON COMMIT DROP AS
+            SELECT base, count(*) AS need, 0 AS fetched, 0 AS found
+              FROM product_slug WHERE slug IS NULL GROUP BY base
+        """)
+        cursor.execute('CREATE TEMP TABLE slug_pool (base text, n int, slug text) ON COMMIT DROP')
+        window = 16
+        while True:
+            cursor.execute(f"""
+                INSERT INTO slug_pool
+                SELECT b.base, n, b.base || '-' || n
+                  FROM slug_need b, generate_series(b.fetched + 1, b.fetched + %s) n
+                 WHERE b.found < b.need
+                   AND NOT EXISTS (SELECT 1 FROM {core} c WHERE c.slug = b.base || '-' || n)
+                   AND NOT EXISTS (SELECT 1 FROM product_slug q WHERE q.base = b.base || '-' || n)
+            """, [window])
+            cursor.execute("""
+                UPDATE slug_need b SET found = f.found
+                  FROM (SELECT base, count(*) AS found FROM slug_pool GROUP BY base) f
+                 WHERE f.base = b.base AND b.found < b.need
+            """)
+            cursor.execute('UPDATE slug_need SET fetched = fetched + %s WHERE found < need', [window])
+            cursor.execute('SELECT count(*) FROM slug_need WHERE found < need')
+            if not cursor.fetchone()[0]:
+                break
+            window *= 2
+
+        cursor.execute("""
+            UPDATE product_slug p SET slug = f.slug
+              FROM (SELECT row_no, base, row_number() OVER (PARTITION BY base ORDER BY row_no) AS rank
+                      FROM product_slug WHERE slug IS NULL) w
+                   JOIN (SELECT base, slug, row_number() OVER (PARTITION BY base ORDER BY n) AS rank
+                           FROM slug_pool) f
+                     ON f.base = w.base AND f.rank = w.rank
+             WHERE p.row_no = w.row_no
+        """)
+
+    def upsert_products(self):
+        """INSERT ... ON CONFLICT DO UPDATE into products_coreproduct, then products_ecommerceproduct"""
+        counters = self.counters
+        core, ecomm = table(CoreProduct), table(EcommerceProduct)
+
+        columns, expressions, params = insert_columns(CoreProduct, {
+            'uuid': 's.product_uuid', 'slug': 'p.slug', 'name': 's.name', 'description': 's.description',
+            'short_description': 's.short_description', 'price': 's.price', 'original_price': 's.original_price',
+            'currency': 's.currency', 'brand': 's.brand_id', 'category': 's.category_id', 'seller': 's.seller_id',
+            'model_number': 's.model_number', 'sku': 's.sku', 'main_image_url': 's.main_image_url',
+            'platform_type': "'ecommerce'",
+        })
+        cursor = self.step('upsert products', f"""
+            WITH upserted AS (
+                INSERT INTO {core} ({columns})
+                SELECT {expressions} FROM staged s JOIN product_slug p ON p.row_no = s.row_no
+                ON CONFLICT (uuid) DO UPDATE SET {update_set(CoreProduct, CORE_UPDATE_FIELDS)}
+                RETURNING (xmax = 0) AS created
+            )
+            SELECT count(*) FILTER (WHERE created), count(*) FILTER (WHERE NOT created) FROM upserted
+        """, params)
+        created, updated = cursor.fetchone()
+        counters['product_created'] += created
+        counters['product_updated'] += updated
+
+        columns, expressions, params = insert_columns(EcommerceProduct, {
+            'product': 'c.id', 'platform': 's.platform_id', 'platform_product_id': 's.platform_product_id',
+            'platform_url': 's.platform_url', 'in_stock': 's.in_stock', 'stock_quantity': 's.stock_quantity::integer',
+            'stock_status': 's.stock_status', 'shipping_cost': 's.shipping_cost', 'shipping_time': 's.shipping_time',
+            'free_shipping': 's.free_shipping', 'warranty_period': 's.warranty_period',
+            'return_policy': 's.return_policy', 'specifications': 's.specifications', 'features': 's.features',
+            'average_rating': 's.average_rating::double precision', 'review_count': 's.review_count::integer',
+            'original_category_path': 's.original_category_path', 'scraping_source': 's.scraping_source',
+        })
+        cursor = self.step('upsert listings', f"""
+            WITH upserted AS (
+                INSERT INTO {ecomm} ({columns})
+                SELECT {expressions} FROM staged s JOIN {core} c ON c.uuid = s.product_uuid
+                ON CONFLICT (platform_id, platform_product_id) DO UPDATE SET {update_set(EcommerceProduct, ECOMM_UPDATE_FIELDS)}
+                RETURNING (xmax = 0) AS created
+            )
+            SELECT count(*) FILTER (WHERE created), count(*) FILTER (WHERE NOT created) FROM upserted
+        """, params)
+        created, updated = cursor.fetchone()
+        counters['ecomm_created'] += created
+        counters['ecomm_updated'] += updated
@@ -4,10 +4,10 @@ Django management command to import Toys & Games products from CSV
 """
 
 import os
-import csv
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from products.models import Platform, Brand, Seller, ProductCategory, CoreProduct, EcommerceProduct
+from products.utils.csv_stream import CSVStream, HeaderError
 from urllib.parse import urlparse
 import re
 
@@ -82,13 +82,18 @@ class Command(BaseCommand):
         imported_count = 0
         skipped_count = 0
         
-        with open(csv_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            for i, row in enumerate(reader):
-                if preview_mode and i >= 10:
-                    break
-                    
+        try:
+            stream = CSVStream(csv_file, required=['title', 'platform'], limit=10 if preview_mode else None,
+                               types={'price': self.parse_price})
+        except HeaderError as e:
+            self.stdout.write(self.style.ERROR(str(e)))
+            return
+
+        with stream:
+            for i, row in stream:
+                if i % 1000 == 0:
+                    self.stdout.write(f'   ... {stream.progress}')
+
                 try:
                     with transaction.atomic():
                         # Get or create platform
@@ -142,7 +147,7 @@ class Command(BaseCommand):
                             category=category,
                             brand=brand,
                             seller=seller,
-                            price=self.parse_price(row.get('price')),
+                            price=row['price'],
                             is_active=True
                         )
                         
@@ -157,11 +162,11 @@ class Command(BaseCommand):
                         imported_count += 1
                         
                         if preview_mode:
-                            self.stdout.write(f'{i+1}. {row["title"][:50]}... - Rs. {row.get("price", "N/A")}')
+                            self.stdout.write(f'{i}. {row["title"][:50]}... - Rs. {row["price"] or "N/A"}')
                         
                 except Exception as e:
                     skipped_count += 1
-                    self.stdout.write(self.style.WARNING(f'Error importing product {i+1}: {str(e)}'))
+                    self.stdout.write(self.style.WARNING(f'Error importing product {i}: {str(e)}'))
                     continue
 
         self.stdout.write(
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Backfill CoreProduct.search_vector with the weighted document maintained by
+the products_coreproduct_search_vector_update trigger (migration 0012);
+migration 0017 already fills rows written before the trigger existed
+Run: python manage.py update_search_vectors [--only-missing]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from products.models import CoreProduct
+import time
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored full-text search vector for every product'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Product ids updated per transaction (default 5000)'
+        )
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Only fill rows whose search_vector is NULL'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        only_missing = options['only_missing']
+
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS('🔎 UPDATING STORED SEARCH VECTORS'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+
+        bounds = CoreProduct.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write(self.style.WARNING('⚠️ No products found'))
+            return
+
+        sql = """
+            UPDATE products_coreproduct
+               SET search_vector = products_build_search_vector(name, description, brand_id, category_id)
+             WHERE id BETWEEN %s AND %s
+        """
+        if only_missing:
+            sql += ' AND search_vector IS NULL'
+
+        start_time = time.time()
+        updated = 0
+        low, high = bounds['low'], bounds['high']
+        for start in range(low, high + 1, batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [start, start + batch_size - 1])
+                updated += cursor.rowcount
+            self.stdout.write(f'   ... ids up to {min(start + batch_size - 1, high)}: {updated} rows updated')
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE products_coreproduct')
+
+        elapsed = time.time() - start_time
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated {updated} products in {elapsed:.2f} seconds'))
@@ -2,7 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db.models import Q
 
 from products.models import CoreProduct, ProductCategory
-from products.utils.categories_utils import suggest_category
+from products.utils.categories_utils import suggest_categories
 
 
 class Command(BaseCommand):
@@ -35,9 +35,10 @@ class Command(BaseCommand):
         mismatches = []
         missing_category = []
 
-        for p in qs[: min(total, 20000)]:
+        products = list(qs[: min(total, 20000)])
+        suggestions = suggest_categories([(p.name or '', p.description or '') for p in products])
+        for p, suggestion in zip(products, suggestions):
             current = p.category.name if p.category else None
-            suggestion = suggest_category(p.name or '', p.description or '')
             if not current:
                 if suggestion:
                     missing_category.append((p.id, suggestion, p.name[:120] if p.name else ''))
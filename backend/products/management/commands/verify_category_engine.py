@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Verify the compiled category rule engine against rule-by-rule evaluation
+Runs suggest_categories (compiled) and suggest_category_uncompiled over the
+whole catalog in batches and reports every product where they disagree.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.models import CoreProduct
+from products.utils.categories_utils import suggest_categories, suggest_category_uncompiled
+
+
+class Command(BaseCommand):
+    help = 'Check that the compiled category rules suggest exactly what the uncompiled rules do for every product'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Products per batch')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many products')
+        parser.add_argument('--active-only', action='store_true', help='Only check active products')
+        parser.add_argument('--show', type=int, default=20, help='Mismatches to print')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        limit = options['limit']
+        show = options['show']
+
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+        self.stdout.write(self.style.SUCCESS('🧪 CATEGORY RULE ENGINE VERIFICATION'))
+        self.stdout.write(self.style.SUCCESS('=' * 80))
+
+        qs = CoreProduct.objects.all()
+        if options['active_only']:
+            qs = qs.filter(is_active=True)
+        rows = qs.order_by('id').values_list('id', 'name', 'description')
+        if limit:
+            rows = rows[:limit]
+
+        self.stats = {'checked': 0, 'suggested': 0, 'compiled_seconds': 0.0, 'uncompiled_seconds': 0.0}
+        self.mismatches = []
+
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                self._check(batch)
+                batch = []
+                self.stdout.write(f"   ... {self.stats['checked']} products checked, {len(self.mismatches)} mismatches")
+        if batch:
+            self._check(batch)
+
+        stats = self.stats
+        self.stdout.write(f"\n📊 Products checked: {stats['checked']} ({stats['suggested']} with a suggestion)")
+        speedup = stats['uncompiled_seconds'] / stats['compiled_seconds'] if stats['compiled_seconds'] else 0.0
+        self.stdout.write(f"⏱️ Uncompiled: {stats['uncompiled_seconds']:.2f}s | Compiled: {stats['compiled_seconds']:.2f}s "
+                          f"| {speedup:.1f}x")
+
+        if self.mismatches:
+            self.stdout.write(self.style.WARNING(f"\n⚠️ {len(self.mismatches)} mismatches (id | uncompiled -> compiled | name):"))
+            for pid, expected, actual, name in self.mismatches[:show]:
+                self.stdout.write(f"   {pid} | {expected} -> {actual} | {name}")
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✅ Compiled engine matches the uncompiled rules for every product'))
+
+    def _check(self, batch):
+        pairs = [(name or '', description or '') for _, name, description in batch]
+
+        start = time.perf_counter()
+        compiled = suggest_categories(pairs)
+        self.stats['compiled_seconds'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [suggest_category_uncompiled(name, description) for name, description in pairs]
+        self.stats['uncompiled_seconds'] += time.perf_counter() - start
+
+        for (pid, name, _), want, got in zip(batch, expected, compiled):
+            if want != got:
+                self.mismatches.append((pid, want, got, (name or '')[:100]))
+        self.stats['checked'] += len(batch)
+        self.stats['suggested'] += sum(1 for category in compiled if category)
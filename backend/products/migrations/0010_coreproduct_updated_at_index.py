@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_coreproduct_availability_check_message_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coreproduct',
+            index=models.Index(fields=['updated_at'], name='products_co_updated_603a93_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:05
+
+import logging
+
+import django.db.models.deletion
+import pgvector.django
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def create_vector_table(apps, schema_editor):
+    """Create the pgvector table only where the extension can be enabled"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('SAVEPOINT enable_vector')
+            try:
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS vector')
+                cursor.execute('RELEASE SAVEPOINT enable_vector')
+            except Exception:
+                cursor.execute('ROLLBACK TO SAVEPOINT enable_vector')
+                raise
+    except Exception as e:
+        logger.warning(f'pgvector extension unavailable, skipping products_productembedding: {e}')
+        return
+    model = apps.get_model('products', 'ProductEmbedding')
+    schema_editor.create_model(model)
+    # The product FK is declared without a constraint so CoreProduct deletes never touch
+    # this table from Django; where the table exists the database cascades instead
+    quote = schema_editor.quote_name
+    core = apps.get_model('products', 'CoreProduct')
+    schema_editor.execute(
+        f'ALTER TABLE {quote(model._meta.db_table)} ADD CONSTRAINT {quote("products_productembedding_product_id_fk")} '
+        f'FOREIGN KEY ({quote("product_id")}) REFERENCES {quote(core._meta.db_table)} ({quote("id")}) ON DELETE CASCADE'
+    )
+
+
+def drop_vector_table(apps, schema_editor):
+    model = apps.get_model('products', 'ProductEmbedding')
+    if model._meta.db_table in schema_editor.connection.introspection.table_names():
+        schema_editor.delete_model(model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_coreproduct_updated_at_index'),
+    ]
+
+    operations = [
+        # State first, so the RunPython below sees ProductEmbedding in its apps registry
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='ProductEmbedding',
+                    fields=[
+                        ('product', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='vector_embedding', serialize=False, to='products.coreproduct')),
+                        ('embedding', pgvector.django.VectorField(dimensions=384)),
+                        ('updated_at', models.DateTimeField(auto_now=True)),
+                    ],
+                    options={
+                        'indexes': [pgvector.django.HnswIndex(ef_construction=64, fields=['embedding'], m=16, name='products_embedding_hnsw', opclasses=['vector_cosine_ops'])],
+                    },
+                ),
+            ],
+        ),
+        migrations.RunPython(create_vector_table, drop_vector_table),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:20
+
+from django.db import migrations
+
+# Weighted document: name (A), brand + category names (B), description (C).
+# Uses the database's default text search config, same as the SearchQuery calls in views.
+FORWARD_SQL = """
+CREATE OR REPLACE FUNCTION products_build_search_vector(
+    p_name text, p_description text, p_brand_id bigint, p_category_id bigint
+) RETURNS tsvector AS $$
+    SELECT
+        setweight(to_tsvector(coalesce(p_name, '')), 'A') ||
+        setweight(to_tsvector(coalesce((SELECT name FROM products_brand WHERE id = p_brand_id), '')), 'B') ||
+        setweight(to_tsvector(coalesce((SELECT name FROM products_productcategory WHERE id = p_category_id), '')), 'B') ||
+        setweight(to_tsvector(coalesce(p_description, '')), 'C');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION products_coreproduct_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := products_build_search_vector(NEW.name, NEW.description, NEW.brand_id, NEW.category_id);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS products_coreproduct_search_vector_update ON products_coreproduct;
+CREATE TRIGGER products_coreproduct_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, description, brand_id, category_id
+    ON products_coreproduct
+    FOR EACH ROW EXECUTE FUNCTION products_coreproduct_search_vector_trigger();
+
+-- Renaming a brand or category re-indexes the products that reference it
+CREATE OR REPLACE FUNCTION products_brand_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE products_coreproduct
+       SET search_vector = products_build_search_vector(name, description, brand_id, category_id)
+     WHERE brand_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS products_brand_search_vector_update ON products_brand;
+CREATE TRIGGER products_brand_search_vector_update
+    AFTER UPDATE OF name ON products_brand
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION products_brand_search_vector_trigger();
+
+CREATE OR REPLACE FUNCTION products_category_search_vector_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE products_coreproduct
+       SET search_vector = products_build_search_vector(name, description, brand_id, category_id)
+     WHERE category_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS products_category_search_vector_update ON products_productcategory;
+CREATE TRIGGER products_category_search_vector_update
+    AFTER UPDATE OF name ON products_productcategory
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION products_category_search_vector_trigger();
+"""
+
+REVERSE_SQL = """
+DROP TRIGGER IF EXISTS products_category_search_vector_update ON products_productcategory;
+DROP TRIGGER IF EXISTS products_brand_search_vector_update ON products_brand;
+DROP TRIGGER IF EXISTS products_coreproduct_search_vector_update ON products_coreproduct;
+DROP FUNCTION IF EXISTS products_category_search_vector_trigger();
+DROP FUNCTION IF EXISTS products_brand_search_vector_trigger();
+DROP FUNCTION IF EXISTS products_coreproduct_search_vector_trigger();
+DROP FUNCTION IF EXISTS products_build_search_vector(text, text, bigint, bigint);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_productembedding'),
+    ]
+
+    operations = [
+        # Existing rows are filled by 0017_backfill_coreproduct_search_vector
+        migrations.RunSQL(FORWARD_SQL, REVERSE_SQL),
+    ]
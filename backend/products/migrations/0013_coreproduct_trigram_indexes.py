@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:45
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_coreproduct_search_vector_trigger'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='brand',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='products_brand_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='coreproduct',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='products_core_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='coreproduct',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='products_core_desc_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='productcategory',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='products_category_name_trgm'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_coreproduct_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coreproduct',
+            name='availability_etag',
+            field=models.CharField(blank=True, help_text='ETag of the source page at the last check (for conditional re-checks)', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='coreproduct',
+            name='availability_last_modified',
+            field=models.CharField(blank=True, help_text='Last-Modified header of the source page at the last check', max_length=64),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_coreproduct_availability_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coreproduct',
+            name='availability_stable_checks',
+            field=models.IntegerField(default=0, help_text='Consecutive checks that repeated the previous status'),
+        ),
+        migrations.AddField(
+            model_name='coreproduct',
+            name='next_availability_check',
+            field=models.DateTimeField(blank=True, help_text='When the adaptive scheduler wants the next availability check', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='coreproduct',
+            index=models.Index(fields=['is_active', 'next_availability_check'], name='products_co_is_acti_37b18b_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:05
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_coreproduct_next_availability_check'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CSVImportReject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.UUIDField(db_index=True)),
+                ('csv_path', models.TextField()),
+                ('row_no', models.BigIntegerField()),
+                ('reason', models.CharField(max_length=50)),
+                ('detail', models.TextField()),
+                ('row_data', models.JSONField()),
+                ('created_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now())),
+            ],
+            options={
+                'db_table': 'products_csv_import_reject',
+                'ordering': ['run_id', 'row_no'],
+            },
+        ),
+    ]
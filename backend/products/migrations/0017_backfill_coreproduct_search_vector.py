@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:40
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 5000
+
+BACKFILL_SQL = """
+    UPDATE products_coreproduct
+       SET search_vector = products_build_search_vector(name, description, brand_id, category_id)
+     WHERE id BETWEEN %s AND %s
+       AND search_vector IS NULL
+"""
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Fill search_vector for rows written before the trigger (0012) existed"""
+    CoreProduct = apps.get_model('products', 'CoreProduct')
+    ids = CoreProduct.objects.filter(search_vector__isnull=True).values_list('id', flat=True)
+    low, high = ids.order_by('id').first(), ids.order_by('-id').first()
+    if low is None:
+        return
+    connection = schema_editor.connection
+    # One transaction per id range, so a large catalogue is not locked as a whole
+    for start in range(low, high + 1, BATCH_SIZE):
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(BACKFILL_SQL, [start, start + BATCH_SIZE - 1])
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('products', '0016_csvimportreject'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
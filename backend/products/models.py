@@ -8,8 +8,10 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.contrib.postgres.indexes import GinIndex
+from django.db.models.functions import Now, Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.postgres.search import SearchVectorField
+from pgvector.django import VectorField, HnswIndex
 import uuid
 import json
 
@@ -76,6 +78,8 @@ class Brand(models.Model):
             models.Index(fields=['name', 'is_verified']),
             models.Index(fields=['slug']),
             GinIndex(fields=['search_vector']),  # Full-text search
+            # Substring / fuzzy brand matching in product search (pg_trgm)
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='products_brand_name_trgm'),
         ]
         ordering = ['display_name']
     
@@ -174,6 +178,8 @@ class ProductCategory(models.Model):
             models.Index(fields=['main_category', 'subcategory']),
             models.Index(fields=['parent', 'is_active', 'sort_order']),
             models.Index(fields=['is_featured', 'product_count']),
+            # Substring / fuzzy category matching in product search (pg_trgm)
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='products_category_name_trgm'),
         ]
         verbose_name_plural = "Product Categories"
         ordering = ['main_category', 'sort_order', 'name']
@@ -291,6 +297,25 @@ class CoreProduct(models.Model):
         blank=True,
         help_text='Message to show users when product is unavailable'
     )
+    availability_etag = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='ETag of the source page at the last check (for conditional re-checks)'
+    )
+    availability_last_modified = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text='Last-Modified header of the source page at the last check'
+    )
+    next_availability_check = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When the adaptive scheduler wants the next availability check'
+    )
+    availability_stable_checks = models.IntegerField(
+        default=0,
+        help_text='Consecutive checks that repeated the previous status'
+    )
     
     # SEO and search
     search_vector = SearchVectorField(null=True, blank=True)
@@ -323,8 +348,18 @@ class CoreProduct(models.Model):
             models.Index(fields=['view_count']),
             models.Index(fields=['wishlist_count']),
             
+            # Change tracking (AI search index watermark)
+            models.Index(fields=['updated_at']),
+            
+            # Availability due queue
+            models.Index(fields=['is_active', 'next_availability_check']),
+            
             # Full-text search
             GinIndex(fields=['search_vector']),
+            
+            # Substring / fuzzy search fallback (pg_trgm on UPPER() to match icontains)
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='products_core_name_trgm'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='products_core_desc_trgm'),
         ]
         ordering = ['-created_at']
     
@@ -467,6 +502,43 @@ class EcommerceProduct(models.Model):
             return self.stock_status
         return "In Stock"
 
+# ============================================================================
+# AI SEARCH (pgvector)
+# ============================================================================
+
+# Output size of the all-MiniLM-L6-v2 sentence transformer
+EMBEDDING_DIMENSIONS = 384
+
+class ProductEmbedding(models.Model):
+    """
+    pgvector copy of CoreProduct.search_embedding for in-database ANN search.
+    Kept in its own table so CoreProduct queries keep working on servers
+    without the vector extension (the migration skips the table there).
+    For the same reason deleting a CoreProduct must not query this table:
+    the migration adds the FK constraint with ON DELETE CASCADE instead.
+    """
+    product = models.OneToOneField(
+        CoreProduct, on_delete=models.DO_NOTHING, db_constraint=False, primary_key=True,
+        related_name='vector_embedding',
+    )
+    embedding = VectorField(dimensions=EMBEDDING_DIMENSIONS)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # Approximate nearest neighbour search on cosine distance
+            HnswIndex(
+                name='products_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_cosine_ops'],
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Embedding for product {self.product_id}"
+
 # ============================================================================
 # DATA MANAGEMENT MODELS
 # ============================================================================
@@ -508,6 +580,24 @@ class RawScrapedData(models.Model):
     def __str__(self):
         return f"Raw data from {self.platform.display_name} - {self.scraped_at}"
 
+class CSVImportReject(models.Model):
+    """A CSV row import_products_staged could not import, and why"""
+    run_id = models.UUIDField(db_index=True)
+    csv_path = models.TextField()
+    row_no = models.BigIntegerField()  # data row number in the CSV, from 1
+    reason = models.CharField(max_length=50)  # invalid_uuid, duplicate_url, url_conflict, ...
+    detail = models.TextField()
+    row_data = models.JSONField()  # the row as read, column -> text
+    # Filled by the database: the command inserts rejects with INSERT ... SELECT
+    created_at = models.DateTimeField(db_default=Now())
+    
+    class Meta:
+        db_table = 'products_csv_import_reject'
+        ordering = ['run_id', 'row_no']
+    
+    def __str__(self):
+        return f"Row {self.row_no} of {self.csv_path}: {self.reason}"
+
 class PriceHistory(models.Model):
     """Track price changes over time"""
     product = models.ForeignKey(CoreProduct, on_delete=models.CASCADE, related_name='price_history')
@@ -810,4 +900,19 @@ def update_wishlist_count_on_remove(sender, instance, **kwargs):
     """Update product wishlist_count when wishlist item is removed"""
     product = instance.product
     wishlist_count = Wishlist.objects.filter(product=product).count()
-    CoreProduct.objects.filter(pk=product.pk).update(wishlist_count=wishlist_count)
\ No newline at end of file
+    CoreProduct.objects.filter(pk=product.pk).update(wishlist_count=wishlist_count)
+# ============================================================================
+# SIGNALS FOR AI SEARCH INDEX FRESHNESS
+# ============================================================================
+
+@receiver(post_save, sender=CoreProduct)
+def refresh_vector_index_on_save(sender, instance, **kwargs):
+    """Let this process's vector index pick up the change on its next search"""
+    from products.utils.vector_index import mark_vector_index_stale
+    mark_vector_index_stale()
+
+@receiver(post_delete, sender=CoreProduct)
+def refresh_vector_index_on_delete(sender, instance, **kwargs):
+    """Drop deleted products from this process's vector index"""
+    from products.utils.vector_index import mark_vector_index_stale
+    mark_vector_index_stale(removed_id=instance.pk)
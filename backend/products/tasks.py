@@ -0,0 +1,13 @@
+"""
+Celery tasks for the products app
+"""
+
+from celery import shared_task
+
+from .utils.availability_queue import run_availability_check
+
+
+@shared_task(ignore_result=True)
+def check_product_availability_task(product_id, force=False):
+    """Check one product against its source platform and store the result"""
+    run_availability_check(product_id, force=force)
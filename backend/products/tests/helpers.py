@@ -0,0 +1,67 @@
+"""
+Shared fixtures for the products test suite
+"""
+
+import csv
+import itertools
+import os
+import tempfile
+import uuid
+
+from products.models import Platform, Seller, CoreProduct
+
+_counter = itertools.count(1)
+
+
+def make_seller(platform_name='testshop'):
+    platform, _ = Platform.objects.get_or_create(
+        name=platform_name,
+        defaults={'display_name': platform_name.title(), 'platform_type': 'ecommerce', 'base_url': f'https://{platform_name}.pk'},
+    )
+    seller, _ = Seller.objects.get_or_create(platform=platform, username=platform_name, defaults={'display_name': platform_name})
+    return seller
+
+
+def make_product(seller=None, **fields):
+    """CoreProduct with a unique slug; fields override the defaults"""
+    n = next(_counter)
+    values = {
+        'name': f'Test product {n}',
+        'slug': f'test-product-{n}',
+        'price': 1000,
+        'platform_type': 'ecommerce',
+        'is_active': True,
+    }
+    values.update(fields)
+    return CoreProduct.objects.create(seller=seller or make_seller(), **values)
+
+
+def unified_row(n, **values):
+    """A valid unified CSV row for product n of the 'shop' platform; values override columns"""
+    row = {
+        'platform_name': 'shop', 'platform_display_name': 'Shop', 'platform_type': 'ecommerce',
+        'platform_base_url': 'https://shop.pk', 'seller_username': 'shop',
+        'uuid': str(uuid.UUID(int=n)), 'product_name': f'Widget {n}', 'price': f'{1000 + n}',
+        'main_category': 'Misc', 'subcategory': 'Widgets', 'in_stock': 'true',
+        'product_url': f'https://shop.pk/products/widget-{n}', 'scraper_type': 'test',
+    }
+    row.update(values)
+    return row
+
+
+def write_unified_csv(testcase, rows):
+    """
+    Write unified-scraper CSV rows to a temporary file removed after the test
+
+    Args:
+        rows: dicts of column values; missing columns are left blank
+    """
+    from products.management.commands.import_products_csv import REQUIRED_HEADERS
+
+    handle = tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8', delete=False)
+    with handle:
+        writer = csv.DictWriter(handle, fieldnames=REQUIRED_HEADERS)
+        writer.writeheader()
+        writer.writerows(rows)
+    testcase.addCleanup(os.remove, handle.name)
+    return handle.name
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from products.models import Seller
+from products.tests.helpers import make_product, make_seller
+from products.utils.availability_schedule import platform_failure_rates
+
+
+class PlatformFailureRateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def checked(self, seller, status):
+        return make_product(seller=seller, availability_status=status, last_availability_check=timezone.now())
+
+    def test_rate_is_pooled_over_a_platforms_sellers(self):
+        big = make_seller('shop')
+        small = Seller.objects.create(platform=big.platform, username='corner', display_name='Corner')
+        for status in ('active', 'active', 'unavailable'):
+            self.checked(big, status)
+        self.checked(small, 'error')
+        self.checked(make_seller('other'), 'active')
+
+        rates = platform_failure_rates()
+        self.assertEqual(rates, {big.platform_id: 0.5, make_seller('other').platform_id: 0.0})
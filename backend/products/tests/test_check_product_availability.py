@@ -0,0 +1,79 @@
+import io
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import requests
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from products.models import CoreProduct, EcommerceProduct
+from products.tests.helpers import make_product, make_seller
+from products.utils.availability_checker import ProductAvailabilityChecker
+from products.utils.bulk_availability import AVAILABILITY_RATE_PER_HOUR, BulkAvailabilityChecker, HostLimiter
+
+ACTIVE = {'available': True, 'status': 'active', 'reason': 'stub', 'not_modified': False}
+
+
+class CheckProductAvailabilityTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.product = make_product(
+            last_availability_check=now - timedelta(hours=1),
+            next_availability_check=now + timedelta(days=1),
+        )
+
+    def run_command(self, *args):
+        out = StringIO()
+        with mock.patch.object(ProductAvailabilityChecker, 'check_availability', return_value=dict(ACTIVE)) as check:
+            call_command('check_product_availability', '--product-id', str(self.product.id), '--dry-run', *args, stdout=out)
+        return check, out.getvalue()
+
+    def test_recently_checked_product_is_skipped(self):
+        check, out = self.run_command()
+        check.assert_not_called()
+        self.assertIn('Skipped (recently checked): 1', out)
+
+    def test_force_checks_it(self):
+        check, out = self.run_command('--force')
+        check.assert_called_once()
+        self.assertIn('Skipped (recently checked): 0', out)
+        self.assertIn('Active/Available: 1', out)
+
+    def test_force_downloads_pages_in_full(self):
+        checker = BulkAvailabilityChecker(force=True)
+        self.assertFalse(checker.use_head)
+        self.assertFalse(checker.conditional)
+
+
+def answer(session, request, **kwargs):
+    """Stub transport: HEAD is not allowed, GET returns a small page"""
+    response = requests.Response()
+    response.status_code = 405 if request.method == 'HEAD' else 200
+    response.url = request.url
+    response.request = request
+    response.raw = io.BytesIO(b'<html>Add to cart</html>')
+    return response
+
+
+class HostRateTests(TestCase):
+    def setUp(self):
+        seller = make_seller('shop')
+        self.product = make_product(seller=seller)
+        EcommerceProduct.objects.create(
+            product=self.product, platform=seller.platform, platform_url='https://shop.pk/products/kettle',
+        )
+        # Loaded up front: the checker's worker threads do not share the test transaction
+        self.product = CoreProduct.objects.select_related('seller', 'ecommerce_data__platform').get(id=self.product.id)
+
+    def test_head_and_get_each_take_a_turn(self):
+        with mock.patch.object(requests.Session, 'send', answer), \
+                mock.patch.object(HostLimiter, 'wait_turn', autospec=True) as wait_turn:
+            stats = BulkAvailabilityChecker(update_db=False).run([self.product])
+        self.assertEqual(stats['active'], 1)
+        self.assertEqual(wait_turn.call_count, 2)
+
+    def test_platform_scrape_rate_is_not_used_by_default(self):
+        self.assertEqual(BulkAvailabilityChecker()._rate_for([self.product]), AVAILABILITY_RATE_PER_HOUR)
+        self.assertEqual(BulkAvailabilityChecker(rate_override=None)._rate_for([self.product]), 100)
@@ -0,0 +1,25 @@
+import pickle
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from products.utils.embedding_codec import decode_embedding, decode_embeddings, encode_embedding
+
+
+class LegacyEmbeddingTests(SimpleTestCase):
+    def setUp(self):
+        self.vector = np.random.default_rng(0).random(384, dtype=np.float32)
+
+    def test_pickle_protocols_round_trip(self):
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                blob = pickle.dumps(self.vector, protocol=protocol)
+                np.testing.assert_array_equal(decode_embedding(blob), self.vector)
+                matrix, ok = decode_embeddings([blob, encode_embedding(self.vector)])
+                self.assertTrue(ok.all())
+                np.testing.assert_array_equal(matrix, np.vstack([self.vector, self.vector]))
+
+    def test_refuses_other_globals(self):
+        blob = pickle.dumps(print, protocol=2)
+        with self.assertRaises(pickle.UnpicklingError):
+            decode_embedding(blob)
@@ -0,0 +1,124 @@
+import re
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from products.models import Brand, CoreProduct, EcommerceProduct, Platform, ProductCategory, Seller
+from products.tests.helpers import make_product, make_seller, unified_row as row, write_unified_csv
+
+SEEDED = [uuid.UUID(int=n) for n in range(100, 103)]
+
+
+class ImportModesTests(TransactionTestCase):
+    """--batch-size against the row-by-row import on the same CSV and starting data"""
+
+    maxDiff = None
+
+    def seed(self):
+        # A brand whose name the CSV uses under another slug
+        Brand.objects.create(name='Zenith', display_name='Zenith', slug='zenith-official')
+        # Slugs already held by other products
+        seller = make_seller('legacy')
+        make_product(seller=seller, name='Kettle', slug='kettle-shop', uuid=SEEDED[0])
+        make_product(seller=seller, name='Kettle', slug='kettle-shop-2', uuid=SEEDED[1])
+
+    def import_csv(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_products_csv', '--csv-path', path, *args, stdout=out, stderr=err)
+        counters = dict((key, int(value)) for key, value in re.findall(r'^(\w+): (\d+)$', out.getvalue(), re.M))
+        return counters, err.getvalue()
+
+    def snapshot(self):
+        return {
+            'platforms': sorted(Platform.objects.values_list('name', 'display_name', 'base_url')),
+            'sellers': sorted(Seller.objects.values_list('platform__name', 'username', 'display_name')),
+            'brands': sorted(Brand.objects.values_list('name', 'slug')),
+            'categories': sorted(ProductCategory.objects.values_list('slug', 'name', 'main_category', 'subcategory')),
+            'products': sorted(
+                (str(p[0]),) + p[1:] for p in CoreProduct.objects.values_list(
+                    'uuid', 'slug', 'name', 'price', 'brand__slug', 'category__slug', 'seller__username')
+            ),
+            'listings': sorted(
+                (p[0], p[1], p[2], str(p[3])) + p[4:] for p in EcommerceProduct.objects.values_list(
+                    'platform__name', 'platform_product_id', 'platform_url', 'product__uuid', 'in_stock')
+            ),
+        }
+
+    def reset(self, extra_seed=None):
+        for model in (EcommerceProduct, CoreProduct, Seller, Platform, Brand, ProductCategory):
+            model.objects.all().delete()
+        self.seed()
+        if extra_seed:
+            extra_seed()
+
+    def compare(self, rows, batch_size='2', extra_seed=None):
+        path = write_unified_csv(self, rows)
+        self.reset(extra_seed)
+        row_counters, row_errors = self.import_csv(path)
+        by_row = self.snapshot()
+        self.reset(extra_seed)
+        batch_counters, batch_errors = self.import_csv(path, '--batch-size', batch_size)
+        return (by_row, row_counters, row_errors), (self.snapshot(), batch_counters, batch_errors)
+
+    def test_batches_match_row_by_row(self):
+        rows = [
+            row(1, brand_name='Acme'),
+            row(2, brand_name='ACME'),                    # same brand slug as "Acme"
+            row(3, brand_name='Zenith'),                  # name held by the zenith-official brand
+            row(11, uuid='not-a-uuid'),
+            row(4, product_slug='kettle-shop'),           # slug held by another product
+            row(5, product_slug='kettle-shop'),
+            row(6, product_slug='kettle-shop'),
+            row(7, price='1500'),
+            row(7, price='1400'),                         # repeated uuid: last row wins
+            row(8, product_url='https://shop.pk/product-category/widgets'),
+            row(9, price=''),
+            row(10, platform_display_name='Shop Online', product_name='Samsung Galaxy phone'),
+            row(12, platform_name='other', platform_base_url='https://other.pk',
+                product_url='https://other.pk/p/12', product_slug='kettle-shop'),
+            row(13),
+            row(14, platform_base_url='https://www.shop.pk'),
+            row(15, platform_base_url=''),                # a blank base URL keeps the one before it
+        ]
+        (by_row, row_counters, row_errors), (batched, batch_counters, batch_errors) = self.compare(rows)
+
+        self.assertEqual(batched, by_row)
+        self.assertEqual(batch_counters, row_counters)
+        self.assertIn('not-a-uuid', row_errors)
+        self.assertIn('not-a-uuid', batch_errors)
+
+        products = {slug: name for _, slug, name, *_ in batched['products']}
+        self.assertEqual([products[f'kettle-shop-{n}'] for n in (1, 3, 4)], ['Widget 4', 'Widget 5', 'Widget 6'])
+        self.assertIn(('Zenith', 'zenith-official'), batched['brands'])
+        self.assertIn(('shop', 'Shop', 'https://www.shop.pk'), batched['platforms'])
+        self.assertEqual(batch_counters['product_updated'], 1)
+        self.assertEqual(batch_counters['skipped_category'], 1)
+        self.assertEqual(batch_counters['skipped_no_price'], 1)
+
+    def test_failed_batch_falls_back_to_row_by_row(self):
+        rows = [row(n) for n in range(1, 5)]
+        # Listed by another platform already: platform_url is unique, so this row's batch fails
+        rows[2]['product_url'] = 'https://shop.pk/products/taken'
+
+        def list_taken_url():
+            owner = make_product(seller=make_seller('other'), name='Taken', slug='taken-owner', uuid=SEEDED[2])
+            EcommerceProduct.objects.create(
+                product=owner, platform=owner.seller.platform, platform_product_id='taken',
+                platform_url='https://shop.pk/products/taken',
+            )
+
+        (by_row, row_counters, _), (batched, batch_counters, batch_errors) = self.compare(
+            rows, batch_size='4', extra_seed=list_taken_url)
+
+        self.assertIn('retrying row by row', batch_errors)
+        self.assertEqual(batched['listings'], by_row['listings'])
+        self.assertEqual(len(batched['listings']), 4)  # the owner's and three imported rows
+        # Row by row keeps the failed row's CoreProduct (it runs outside a transaction);
+        # the fallback rolls the whole row back
+        orphan = (str(uuid.UUID(int=3)), 'widget-3-shop', 'Widget 3')
+        self.assertEqual([p for p in by_row['products'] if p not in batched['products']], [
+            p for p in by_row['products'] if p[:3] == orphan])
+        self.assertEqual(batch_counters['skipped'], row_counters['skipped'])
+        self.assertEqual(batch_counters['product_created'], row_counters['product_created'] - 1)
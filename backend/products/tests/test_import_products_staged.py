@@ -0,0 +1,124 @@
+import re
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from products.models import (
+    Brand, CoreProduct, CSVImportReject, EcommerceProduct, Platform, ProductCategory, Seller,
+)
+from products.tests.helpers import make_product, make_seller, unified_row as row, write_unified_csv
+
+LISTED = uuid.UUID(int=100)
+
+
+class StagedImportTests(TransactionTestCase):
+    """import_products_staged against import_products_csv on the same CSV and starting data"""
+
+    maxDiff = None
+
+    rows = [
+        row(1, brand_name='Acme'),
+        row(2, brand_name='ACME', product_slug='kettle-shop'),   # slug held by another product
+        row(3, product_slug='kettle-shop'),
+        row(4, price='1500'),
+        row(4, price='1400'),                                      # same product scraped twice
+        row(5, uuid='not-a-uuid'),
+        row(6, product_url='https://shop.pk/product-category/widgets'),
+        row(7, price=''),
+        row(8, stock_quantity='99999999999'),                      # does not fit the column
+        row(9, product_url='https://shop.pk/products/taken'),     # listed by another platform
+        row(10, uuid=str(LISTED)),                                 # product listed elsewhere
+        row(11, platform_display_name='Shop Online', product_name='Samsung Galaxy phone'),
+        row(12, product_url='https://shop.pk/products/widget-13'),
+        row(13),                                                   # same listing under another uuid
+    ]
+
+    def seed(self):
+        for model in (EcommerceProduct, CoreProduct, Seller, Platform, Brand, ProductCategory):
+            model.objects.all().delete()
+        seller = make_seller('other')
+        make_product(seller=seller, name='Kettle', slug='kettle-shop', uuid=uuid.UUID(int=101))
+        listed = make_product(seller=seller, name='Listed', slug='listed', uuid=LISTED)
+        EcommerceProduct.objects.create(
+            product=listed, platform=seller.platform, platform_product_id='taken',
+            platform_url='https://shop.pk/products/taken',
+        )
+
+    def import_csv(self, command, path, *args):
+        out = StringIO()
+        call_command(command, '--csv-path', path, *args, stdout=out, stderr=StringIO())
+        return dict((key, int(value)) for key, value in re.findall(r'^(\w+): (\d+)$', out.getvalue(), re.M))
+
+    def snapshot(self):
+        """
+        Dimensions and the imported listings with their products. Products without a
+        listing are left out: row by row keeps the CoreProduct of a row whose listing fails.
+        """
+        return {
+            'platforms': sorted(Platform.objects.values_list('name', 'display_name', 'base_url')),
+            'sellers': sorted(Seller.objects.values_list('platform__name', 'username', 'display_name')),
+            'brands': sorted(Brand.objects.values_list('name', 'slug')),
+            'categories': sorted(ProductCategory.objects.values_list('slug', 'name', 'main_category', 'subcategory')),
+            'listings': sorted(
+                tuple(str(value) for value in listing) for listing in EcommerceProduct.objects.filter(
+                    platform__name='shop',
+                ).values_list(
+                    'platform_product_id', 'platform_url', 'in_stock', 'stock_quantity', 'product__uuid',
+                    'product__slug', 'product__name', 'product__price', 'product__brand__slug',
+                    'product__category__slug', 'product__seller__username',
+                )
+            ),
+        }
+
+    def test_same_result_as_row_by_row(self):
+        path = write_unified_csv(self, self.rows)
+        self.seed()
+        row_counters = self.import_csv('import_products_csv', path)
+        by_row = self.snapshot()
+        self.seed()
+        staged_counters = self.import_csv('import_products_staged', path)
+
+        self.assertEqual(self.snapshot(), by_row)
+        self.assertEqual(len(by_row['listings']), 6)
+        self.assertIn('1400.00', [listing[7] for listing in by_row['listings']])  # the later row 4 won
+        for key in ('platform', 'brand', 'seller', 'category', 'ecomm_created', 'skipped_category', 'skipped_no_price'):
+            self.assertEqual(staged_counters[key], row_counters[key], key)
+
+    def test_rejected_rows_are_recorded_with_reasons(self):
+        path = write_unified_csv(self, self.rows)
+        self.seed()
+        counters = self.import_csv('import_products_staged', path)
+
+        rejects = list(CSVImportReject.objects.values_list('row_no', 'reason', 'csv_path'))
+        self.assertEqual(rejects, [
+            (4, 'duplicate_uuid', path),
+            (6, 'invalid_uuid', path),
+            (9, 'invalid_value', path),
+            (10, 'url_conflict', path),
+            (11, 'listing_conflict', path),
+            (13, 'duplicate_url', path),
+        ])
+        self.assertEqual(counters['rejected'], 6)
+        duplicate = CSVImportReject.objects.get(reason='duplicate_uuid')
+        self.assertEqual(duplicate.detail, 'superseded by row 5')
+        self.assertEqual(duplicate.row_data['price'], '1500')
+        self.assertIsNotNone(duplicate.created_at)
+        # The product listed elsewhere was left as it was
+        self.assertEqual(CoreProduct.objects.get(uuid=LISTED).name, 'Listed')
+
+    def test_limit_reads_only_the_first_rows(self):
+        path = write_unified_csv(self, [
+            row(1, description='Two lines,\nwith "quotes"'),
+            row(2),
+            row(3),
+        ])
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('"not closed,\n')  # COPY would fail on this line
+        self.seed()
+        self.import_csv('import_products_staged', path, '--limit', '2')
+
+        listed = EcommerceProduct.objects.filter(platform__name='shop').order_by('product__uuid')
+        self.assertEqual([listing.product.uuid for listing in listed], [uuid.UUID(int=1), uuid.UUID(int=2)])
+        self.assertEqual(listed[0].product.description, 'Two lines,\nwith "quotes"')
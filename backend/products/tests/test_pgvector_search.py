@@ -0,0 +1,70 @@
+from importlib import import_module
+
+import numpy as np
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from products.models import CoreProduct, ProductEmbedding, EMBEDDING_DIMENSIONS
+from products.utils.embedding_codec import encode_embedding
+from products.utils.pgvector_search import pgvector_available, upsert_vectors, vector_coverage, vector_table_exists
+from products.tests.helpers import make_product
+
+migration = import_module('products.migrations.0011_productembedding')
+
+
+class PgvectorCoverageTests(TestCase):
+    def setUp(self):
+        if not vector_table_exists():
+            self.skipTest('pgvector table not installed on this database')
+        rng = np.random.default_rng(0)
+        self.vectors = {}
+        for _ in range(3):
+            vector = rng.random(EMBEDDING_DIMENSIONS, dtype=np.float32)
+            product = make_product(search_embedding=encode_embedding(vector))
+            self.vectors[product.id] = vector
+
+    def tearDown(self):
+        pgvector_available(force=True)
+
+    def test_partial_backfill_keeps_ann_search_off(self):
+        first, *rest = self.vectors
+        upsert_vectors({first: self.vectors[first]})
+        self.assertEqual(vector_coverage(), (1, 3))
+        self.assertFalse(pgvector_available(force=True))
+
+        upsert_vectors({product_id: self.vectors[product_id] for product_id in rest})
+        self.assertEqual(vector_coverage(), (3, 3))
+        self.assertTrue(pgvector_available(force=True))
+
+    def test_inactive_products_do_not_count(self):
+        first, *rest = self.vectors
+        upsert_vectors({product_id: self.vectors[product_id] for product_id in rest})
+        CoreProduct.objects.filter(id=first).update(is_active=False)
+        self.assertTrue(pgvector_available(force=True))
+
+
+class ProductDeleteTests(TransactionTestCase):
+    """CoreProduct deletes with and without the pgvector table"""
+
+    def restore_vector_table(self):
+        with connection.schema_editor() as editor:
+            migration.create_vector_table(apps, editor)
+
+    def test_delete_without_vector_table(self):
+        # What the migration leaves on a server without the vector extension
+        if vector_table_exists():
+            with connection.schema_editor() as editor:
+                editor.delete_model(ProductEmbedding)
+            self.addCleanup(self.restore_vector_table)
+        product = make_product()
+        product.delete()
+        self.assertFalse(CoreProduct.objects.filter(id=product.id).exists())
+
+    def test_delete_removes_the_vector_row(self):
+        if not vector_table_exists():
+            self.skipTest('pgvector table not installed on this database')
+        product = make_product()
+        upsert_vectors({product.id: np.ones(EMBEDDING_DIMENSIONS, dtype=np.float32)})
+        product.delete()
+        self.assertFalse(ProductEmbedding.objects.exists())
@@ -0,0 +1,29 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.db import connection
+from django.test import TransactionTestCase
+
+from products.models import CoreProduct
+from products.tests.helpers import make_product
+from products.utils.search_utils import search_vector_match
+
+backfill = import_module('products.migrations.0017_backfill_coreproduct_search_vector')
+
+
+class SearchVectorBackfillTests(TransactionTestCase):
+    def matches(self, query):
+        match, rank = search_vector_match(query)
+        return list(CoreProduct.objects.filter(match).annotate(rank=rank).values_list('id', flat=True))
+
+    def test_rows_written_before_the_trigger_become_searchable(self):
+        product = make_product(name='Walnut bookshelf')
+        with connection.cursor() as cursor:
+            # As left behind by rows inserted before migration 0012
+            cursor.execute('UPDATE products_coreproduct SET search_vector = NULL WHERE id = %s', [product.id])
+        self.assertEqual(self.matches('bookshelf'), [])
+
+        with connection.schema_editor() as schema_editor:
+            backfill.backfill_search_vectors(apps, schema_editor)
+
+        self.assertEqual(self.matches('bookshelf'), [product.id])
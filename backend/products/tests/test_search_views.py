@@ -0,0 +1,26 @@
+from unittest import mock
+
+import numpy as np
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from products.tests.helpers import make_product
+
+
+class HybridSearchTests(APITestCase):
+    def setUp(self):
+        self.active = make_product(name='Blue kettle')
+        self.inactive = make_product(name='Red kettle', is_active=False)
+
+    def search(self, hits):
+        with mock.patch('products.views.get_ai_model', return_value=object()), \
+                mock.patch('products.views.get_query_encoder'), \
+                mock.patch('products.views.encode_query', return_value=np.ones(4, dtype=np.float32)), \
+                mock.patch('products.views.semantic_top_k', return_value=(hits, 'index', len(hits))):
+            return self.client.get(reverse('coreproduct-hybrid-search'), {'q': 'zzqx', 'limit': 5})
+
+    def test_deactivated_semantic_candidates_are_not_returned(self):
+        # The semantic index may still hold a product deactivated since its last poll
+        response = self.search([(self.inactive.id, 0.9), (self.active.id, 0.8)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['id'] for result in response.data['results']], [self.active.id])
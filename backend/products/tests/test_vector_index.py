@@ -0,0 +1,41 @@
+import numpy as np
+from django.test import TestCase
+
+from products.utils.embedding_codec import encode_embedding
+from products.utils.vector_index import ProductVectorIndex
+from products.tests.helpers import make_product
+
+
+def embedding(seed):
+    return encode_embedding(np.random.default_rng(seed).random(8, dtype=np.float32))
+
+
+class VectorIndexRefreshTests(TestCase):
+    def setUp(self):
+        self.first = make_product(search_embedding=embedding(1))
+        self.second = make_product(search_embedding=embedding(2))
+        self.index = ProductVectorIndex.build()
+
+    def test_overlap_rows_are_not_reapplied(self):
+        # Both rows sit inside WATERMARK_OVERLAP and were loaded by build()
+        self.assertEqual(self.index.refresh(), (0, 0))
+        self.assertEqual(self.index.refresh(), (0, 0))
+        self.assertEqual(self.index.version, 0)
+
+    def test_changes_bump_the_version_once(self):
+        self.first.search_embedding = embedding(3)
+        self.first.save()
+        self.assertEqual(self.index.refresh(), (1, 0))
+        self.assertEqual(self.index.version, 1)
+        self.assertEqual(self.index.refresh(), (0, 0))
+        self.assertEqual(self.index.version, 1)
+
+        self.second.is_active = False
+        self.second.save()
+        self.assertEqual(self.index.refresh(), (0, 1))
+        self.assertEqual(self.index.refresh(), (0, 0))
+        self.assertEqual(self.index.version, 2)
+        self.assertEqual(self.index.size, 1)
+
+    def test_removing_an_absent_product_keeps_the_version(self):
+        self.assertEqual(self.index.apply_delta(removals=[10 ** 9]), 0)
@@ -0,0 +1,32 @@
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from products.utils import warmup
+
+
+class ServerProcessTests(SimpleTestCase):
+    def is_server(self, argv, run_main=None):
+        env = {'RUN_MAIN': run_main} if run_main else {}
+        with mock.patch.object(sys, 'argv', argv), mock.patch.dict('os.environ', env):
+            return warmup._is_server_process()
+
+    def test_web_servers_warm_up(self):
+        self.assertTrue(self.is_server(['/venv/bin/gunicorn', 'buyvaulthub.wsgi']))
+        self.assertTrue(self.is_server(['/venv/lib/python3.11/site-packages/gunicorn/__main__.py', 'buyvaulthub.wsgi']))
+        self.assertTrue(self.is_server(['uwsgi', '--ini', 'uwsgi.ini']))
+        self.assertTrue(self.is_server(['manage.py', 'runserver'], run_main='true'))
+        self.assertTrue(self.is_server(['manage.py', 'runserver', '--noreload']))
+
+    def test_other_processes_do_not(self):
+        self.assertFalse(self.is_server(['/venv/bin/celery', '-A', 'buyvaulthub', 'worker']))
+        self.assertFalse(self.is_server(['/venv/bin/pytest']))
+        self.assertFalse(self.is_server(['/venv/lib/python3.11/site-packages/pytest/__main__.py']))
+        self.assertFalse(self.is_server(['manage.py', 'test']))
+        self.assertFalse(self.is_server(['manage.py', 'migrate']))
+        self.assertFalse(self.is_server(['scripts/reindex.py']))
+
+    def test_embedded_uwsgi_interpreter(self):
+        with mock.patch.object(sys, 'argv', ['']), mock.patch.dict(sys.modules, {'uwsgi': object()}):
+            self.assertTrue(warmup._is_server_process())
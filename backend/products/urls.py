@@ -13,6 +13,8 @@ urlpatterns = [
     # Scraping endpoints
     path('scraped-products/', views.get_scraped_products, name='get_scraped_products'),
     path('scraping-status/', views.scraping_status, name='scraping_status'),
+    # AI search readiness probe (load balancer health check)
+    path('ai-search/ready/', views.ai_search_ready, name='ai_search_ready'),
     path('scrape/instagram/', views.scrape_instagram, name='scrape_instagram'),
     path('scrape/website/', views.scrape_website, name='scrape_website'),
     path('scraping-jobs/', views.get_scraping_jobs, name='get_scraping_jobs'),
@@ -6,18 +6,81 @@ Checks if a product still exists on its source platform
 
 import requests
 import logging
+import re
+from functools import lru_cache
 from urllib.parse import urlparse
 from django.utils import timezone
 from datetime import timedelta
 
+from .availability_schedule import is_due, schedule_after_check
+
 logger = logging.getLogger(__name__)
 
 
+class KeywordScanner:
+    """
+    Streaming multi-keyword matcher over raw page bytes
+    
+    All keywords are compiled into one case-insensitive alternation (longest
+    first), so each chunk is scanned once by the C regex engine. The last
+    len(longest keyword) - 1 bytes of a chunk are carried over, so a keyword
+    split across two chunks is still found.
+    """
+    
+    def __init__(self, keywords):
+        """
+        Args:
+            keywords: phrases to look for (matched case-insensitively)
+        """
+        self.keywords = list(keywords)
+        ordered = sorted({k.lower() for k in self.keywords}, key=len, reverse=True)
+        encoded = [k.encode('utf-8') for k in ordered]
+        self.pattern = re.compile(b'|'.join(re.escape(k) for k in encoded), re.IGNORECASE) if encoded else None
+        self.overlap = max((len(k) for k in encoded), default=1) - 1
+    
+    def scan(self, chunks, byte_budget):
+        """
+        Look for the first keyword in a stream of byte chunks
+        
+        Args:
+            chunks: iterable of bytes (e.g. response.iter_content())
+            byte_budget: stop reading after this many bytes
+        
+        Returns:
+            tuple: (matched keyword or None, bytes read, budget exhausted)
+        """
+        if self.pattern is None:
+            return None, 0, False
+        
+        tail = b''
+        bytes_read = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            bytes_read += len(chunk)
+            window = tail + chunk
+            match = self.pattern.search(window)
+            if match:
+                return match.group(0).decode('utf-8', 'replace').lower(), bytes_read, False
+            if bytes_read >= byte_budget:
+                return None, bytes_read, True
+            tail = window[-self.overlap:] if self.overlap else b''
+        return None, bytes_read, False
+
+
+@lru_cache(maxsize=None)
+def get_keyword_scanner(keywords):
+    """Shared scanner per keyword tuple (one per platform pattern set)"""
+    return KeywordScanner(keywords)
+
+
 class ProductAvailabilityChecker:
     """Check if products are still available on their source platforms"""
     
     # Configuration
     REQUEST_TIMEOUT = 10  # seconds
+    CONTENT_CHUNK_SIZE = 16 * 1024
+    CONTENT_BYTE_BUDGET = 512 * 1024  # "not found" messages sit near the top of the page
     USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     
     # Platform-specific unavailability indicators
@@ -101,17 +164,84 @@ class ProductAvailabilityChecker:
             return self.UNAVAILABILITY_PATTERNS[self.domain]
         return self.UNAVAILABILITY_PATTERNS['default']
     
-    def check_availability(self):
+    def _request_headers(self, conditional=False):
+        """Request headers; conditional adds the stored validators of an active page"""
+        headers = {'User-Agent': self.USER_AGENT}
+        if conditional and self.product.availability_status == 'active':
+            if self.product.availability_etag:
+                headers['If-None-Match'] = self.product.availability_etag
+            if self.product.availability_last_modified:
+                headers['If-Modified-Since'] = self.product.availability_last_modified
+        return headers
+    
+    def _validators_match(self, response):
+        """True if a 200 response carries the same ETag/Last-Modified we stored last time"""
+        if self.product.availability_status != 'active':
+            return False
+        etag = response.headers.get('ETag', '')
+        last_modified = response.headers.get('Last-Modified', '')
+        if etag and etag == self.product.availability_etag:
+            return True
+        return bool(last_modified) and last_modified == self.product.availability_last_modified
+    
+    def _check_status_and_redirect(self, response, patterns, result):
+        """
+        Checks 1 and 2: error status codes and redirects to a listing page
+        
+        Returns:
+            bool: True if the result was marked unavailable
+        """
+        result['status_code'] = response.status_code
+        
+        # Check 1: HTTP status code
+        if response.status_code in patterns['status_codes']:
+            result['available'] = False
+            result['status'] = 'unavailable'
+            result['reason'] = f'Product page returns {response.status_code} error'
+            logger.warning(f"Product {self.product.id} unavailable: HTTP {response.status_code}")
+            return True
+        
+        # Check 2: URL redirect (redirected to homepage/listing page)
+        if response.url != self.platform_url:
+            final_path = urlparse(response.url).path.rstrip('/')
+            if any(final_path == redirect.rstrip('/') for redirect in patterns['url_redirects']):
+                result['available'] = False
+                result['status'] = 'unavailable'
+                result['reason'] = 'Product page redirects to homepage (product removed)'
+                logger.warning(f"Product {self.product.id} unavailable: Redirected to {response.url}")
+                return True
+        
+        return False
+    
+    def _mark_unchanged(self, result, how):
+        result['available'] = True
+        result['status'] = 'active'
+        result['not_modified'] = True
+        result['etag'] = self.product.availability_etag
+        result['last_modified'] = self.product.availability_last_modified
+        result['reason'] = f'Product page unchanged since last check ({how})'
+        logger.info(f"Product {self.product.id} unchanged on platform ({how})")
+    
+    def check_availability(self, session=None, use_head=False, conditional=False):
         """
         Check if product is still available on source platform
         
+        Args:
+            session: requests.Session to reuse (keep-alive); None uses a one-off connection
+            use_head: try a HEAD request first and skip the page download when it decides
+            conditional: send the stored ETag/Last-Modified so unchanged pages answer 304
+        
         Returns:
             dict: {
                 'available': bool,
                 'status': str ('active', 'unavailable', 'error'),
                 'status_code': int or None,
                 'reason': str,
-                'checked_at': datetime
+                'checked_at': datetime,
+                'not_modified': bool,
+                'etag': str,
+                'last_modified': str,
+                'bytes_read': int (page bytes downloaded)
             }
         """
         result = {
@@ -119,7 +249,11 @@ class ProductAvailabilityChecker:
             'status': 'error',
             'status_code': None,
             'reason': 'Unknown error',
-            'checked_at': timezone.now()
+            'checked_at': timezone.now(),
+            'not_modified': False,
+            'etag': '',
+            'last_modified': '',
+            'bytes_read': 0
         }
         
         # Validate we have a URL to check
@@ -130,47 +264,64 @@ class ProductAvailabilityChecker:
         
         logger.info(f"Checking availability for product {self.product.id}: {self.platform_url}")
         
+        http = session or requests
+        patterns = self._get_platform_patterns()
+        headers = self._request_headers(conditional=conditional)
+        
         try:
-            # Make request to product page
-            headers = {'User-Agent': self.USER_AGENT}
-            response = requests.get(
+            # Cheap pass: status, redirect and validators without downloading the page
+            if use_head:
+                response = http.head(
+                    self.platform_url,
+                    headers=headers,
+                    timeout=self.REQUEST_TIMEOUT,
+                    allow_redirects=True
+                )
+                if response.status_code == 304:
+                    self._mark_unchanged(result, 'HEAD 304')
+                    return result
+                if response.status_code not in (405, 501) and \
+                        self._check_status_and_redirect(response, patterns, result):
+                    return result
+                if response.status_code == 200 and self._validators_match(response):
+                    self._mark_unchanged(result, 'HEAD validators')
+                    return result
+            
+            # Make request to product page; the body is streamed and only read if needed
+            with http.get(
                 self.platform_url,
                 headers=headers,
                 timeout=self.REQUEST_TIMEOUT,
-                allow_redirects=True
-            )
-            
-            result['status_code'] = response.status_code
-            patterns = self._get_platform_patterns()
-            
-            # Check 1: HTTP status code
-            if response.status_code in patterns['status_codes']:
-                result['available'] = False
-                result['status'] = 'unavailable'
-                result['reason'] = f'Product page returns {response.status_code} error'
-                logger.warning(f"Product {self.product.id} unavailable: HTTP {response.status_code}")
-                return result
-            
-            # Check 2: URL redirect (redirected to homepage/listing page)
-            if response.url != self.platform_url:
-                final_path = urlparse(response.url).path.rstrip('/')
-                if any(final_path == redirect.rstrip('/') for redirect in patterns['url_redirects']):
-                    result['available'] = False
-                    result['status'] = 'unavailable'
-                    result['reason'] = 'Product page redirects to homepage (product removed)'
-                    logger.warning(f"Product {self.product.id} unavailable: Redirected to {response.url}")
+                allow_redirects=True,
+                stream=True
+            ) as response:
+                
+                if response.status_code == 304:
+                    self._mark_unchanged(result, '304 Not Modified')
                     return result
-            
-            # Check 3: Page content analysis
-            if response.status_code == 200:
-                content_lower = response.text.lower()
-                for keyword in patterns['content_keywords']:
-                    if keyword in content_lower:
+                
+                result['etag'] = response.headers.get('ETag', '')[:255]
+                result['last_modified'] = response.headers.get('Last-Modified', '')[:64]
+                
+                if self._check_status_and_redirect(response, patterns, result):
+                    return result
+                
+                # Check 3: Page content analysis (stops at the first keyword or the byte budget)
+                if response.status_code == 200:
+                    scanner = get_keyword_scanner(tuple(patterns['content_keywords']))
+                    keyword, bytes_read, truncated = scanner.scan(
+                        response.iter_content(chunk_size=self.CONTENT_CHUNK_SIZE),
+                        self.CONTENT_BYTE_BUDGET
+                    )
+                    result['bytes_read'] = bytes_read
+                    if keyword:
                         result['available'] = False
                         result['status'] = 'unavailable'
                         result['reason'] = f'Product page shows "{keyword}" message'
                         logger.warning(f"Product {self.product.id} unavailable: Found '{keyword}' in content")
                         return result
+                    if truncated:
+                        logger.debug(f"Product {self.product.id}: stopped reading after {bytes_read} bytes")
             
             # If we got here, product appears to be available
             result['available'] = True
@@ -210,6 +361,10 @@ class ProductAvailabilityChecker:
         if force:
             return True
         
+        # Adaptive schedule (see availability_schedule) once the product has one
+        if self.product.next_availability_check is not None:
+            return is_due(self.product)
+        
         # Always check if never checked before
         if not self.product.last_availability_check:
             return True
@@ -226,19 +381,37 @@ class ProductAvailabilityChecker:
         
         return False
     
-    def update_product_status(self, check_result):
+    # Fields written by apply_check_result (bulk_update uses the same list)
+    STATUS_FIELDS = [
+        'availability_status',
+        'last_availability_check',
+        'consecutive_failures',
+        'availability_check_message',
+        'availability_etag',
+        'availability_last_modified',
+        'next_availability_check',
+        'availability_stable_checks',
+        'is_active',
+        'updated_at',  # Lets the search index notice deactivations
+    ]
+    
+    def apply_check_result(self, check_result):
         """
-        Update product database fields based on availability check
+        Copy a check result onto the product instance without saving it
         
         Args:
             check_result: dict returned from check_availability()
         """
-        from products.models import CoreProduct
-        
         # Update availability status
+        previous_status = self.product.availability_status
         self.product.availability_status = check_result['status']
         self.product.last_availability_check = check_result['checked_at']
         
+        # Remember page validators for the next conditional check
+        if check_result.get('status') == 'active':
+            self.product.availability_etag = check_result.get('etag', '')
+            self.product.availability_last_modified = check_result.get('last_modified', '')
+        
         # Handle consecutive failures
         if check_result['status'] == 'unavailable':
             self.product.consecutive_failures += 1
@@ -265,18 +438,26 @@ class ProductAvailabilityChecker:
                 self.product.is_active = True
                 logger.info(f"Product {self.product.id} REACTIVATED - now available again")
         
+        # Pick the next check time from popularity, stability and platform failure rate
+        schedule_after_check(self.product, previous_status)
+        
+        # Set explicitly: bulk_update does not apply auto_now
+        self.product.updated_at = timezone.now()
+    
+    def update_product_status(self, check_result):
+        """
+        Update product database fields based on availability check
+        
+        Args:
+            check_result: dict returned from check_availability()
+        """
+        self.apply_check_result(check_result)
+        
         # Save changes
-        self.product.save(update_fields=[
-            'availability_status',
-            'last_availability_check',
-            'consecutive_failures',
-            'availability_check_message',
-            'is_active'
-        ])
+        self.product.save(update_fields=self.STATUS_FIELDS)
         
         logger.info(f"Updated product {self.product.id} availability: {check_result['status']}")
 
-
 def check_product_availability(product, force=False, update_db=True):
     """
     Convenience function to check product availability
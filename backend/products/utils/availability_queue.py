@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Background availability checks
+Product detail views enqueue a check instead of fetching the vendor page on
+the request thread. Jobs go to Celery when it is installed and enabled, and
+otherwise to a small in-process thread pool. A cache key per product keeps
+repeated page views from queueing the same check twice; use a shared cache
+(e.g. redis) in CACHES to deduplicate across workers.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from .availability_checker import ProductAvailabilityChecker, check_product_availability
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _dedupe_key(product_id):
+    return f'availability-check:{product_id}'
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'AVAILABILITY_CHECK_THREADS', 4),
+                    thread_name_prefix='availability-check',
+                )
+    return _executor
+
+
+def run_availability_check(product_id, force=False):
+    """
+    Run one queued check (Celery task body and thread-pool job)
+
+    Args:
+        product_id: CoreProduct id
+        force: check even if the product was checked recently
+
+    Returns:
+        dict or None: availability result, None if the product is gone
+    """
+    from products.models import CoreProduct
+
+    close_old_connections()
+    try:
+        product = CoreProduct.objects.select_related(
+            'seller', 'ecommerce_data', 'instagram_data'
+        ).filter(id=product_id).first()
+        if product is None:
+            return None
+        result = check_product_availability(product, force=force, update_db=True)
+        logger.info(f"Product {product_id} availability check: {result['status']}")
+        return result
+    except Exception as e:
+        logger.error(f"Error checking product {product_id} availability: {str(e)}")
+        return None
+    finally:
+        cache.delete(_dedupe_key(product_id))
+        close_old_connections()
+
+
+def _dispatch_celery(product_id, force):
+    """Publish to Celery; False if Celery is missing, disabled or the broker is down"""
+    if not getattr(settings, 'AVAILABILITY_CHECK_USE_CELERY', True):
+        return False
+    try:
+        from products.tasks import check_product_availability_task
+    except ImportError:
+        return False
+    try:
+        # retry=False: fail fast to the thread pool instead of blocking the request
+        check_product_availability_task.apply_async((product_id, force), retry=False)
+        return True
+    except Exception as e:
+        logger.warning(f'Celery unavailable, checking product {product_id} in-process: {str(e)}')
+        return False
+
+
+def enqueue_availability_check(product, force=False):
+    """
+    Queue a background availability check if one is due and not already queued
+
+    Args:
+        product: CoreProduct instance (its last known status is left untouched)
+        force: queue even if the product was checked recently
+
+    Returns:
+        bool: True if a new check was queued
+    """
+    if not ProductAvailabilityChecker(product).should_check_now(force=force):
+        return False
+
+    key = _dedupe_key(product.id)
+    if not cache.add(key, 1, getattr(settings, 'AVAILABILITY_CHECK_DEDUPE_SECONDS', 600)):
+        return False
+
+    try:
+        if not _dispatch_celery(product.id, force):
+            _get_executor().submit(run_availability_check, product.id, force)
+    except Exception as e:
+        cache.delete(key)
+        logger.error(f'Could not queue availability check for product {product.id}: {str(e)}')
+        return False
+    return True
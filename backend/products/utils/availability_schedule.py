@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Adaptive availability re-check scheduling
+Each product gets its own next_availability_check instead of fixed 24h / 6h
+windows. The interval starts from the old windows and is then scaled:
+
+    - popularity: more views / wishlists -> checked sooner
+    - stability: every check that repeats the previous status -> checked later
+    - platform failure rate: platforms whose products often disappear -> sooner
+
+The indexed next_availability_check column feeds the "due" queue consumed by
+the check_product_availability command and the product detail hook.
+"""
+
+import logging
+import math
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Starting intervals (hours) per last status, as in the old fixed windows
+BASE_INTERVAL_HOURS = {
+    'active': 24,
+    'unavailable': 6,
+    'error': 6,
+}
+DEFAULT_BASE_HOURS = 24
+
+STABILITY_STEP = 1.25      # interval growth per repeated identical result
+STABILITY_MAX_FACTOR = 8.0
+POPULARITY_WISHLIST_WEIGHT = 3  # same weighting as the trending score in search
+FAILURE_RATE_CACHE_KEY = 'availability-schedule:platform-failure-rates'
+FAILURE_RATE_CACHE_SECONDS = 900
+JITTER = 0.1  # +/-10% so products imported together do not come due together
+
+
+def platform_failure_rates():
+    """
+    Share of checked products per platform whose last check was not 'active'
+
+    Pooled over all of a platform's sellers, so a small seller's few products
+    do not swing the rate and one failing platform speeds up all its sellers.
+
+    Returns:
+        dict: {platform_id: failure rate 0..1}, cached for 15 minutes
+    """
+    rates = cache.get(FAILURE_RATE_CACHE_KEY)
+    if rates is not None:
+        return rates
+
+    from products.models import CoreProduct
+
+    rows = CoreProduct.objects.filter(last_availability_check__isnull=False)\
+        .values('seller__platform_id')\
+        .annotate(
+            checked=Count('id'),
+            failed=Count('id', filter=Q(availability_status__in=['unavailable', 'error'])),
+        )
+    rates = {row['seller__platform_id']: row['failed'] / row['checked'] for row in rows if row['checked']}
+    cache.set(FAILURE_RATE_CACHE_KEY, rates, FAILURE_RATE_CACHE_SECONDS)
+    return rates
+
+
+def popularity_factor(product):
+    """1.0 for unseen products, down to 0.25 for very popular ones"""
+    score = (product.view_count or 0) + (product.wishlist_count or 0) * POPULARITY_WISHLIST_WEIGHT
+    return max(0.25, 1.0 / (1.0 + math.log10(1 + score)))
+
+
+def stability_factor(product):
+    """Grows with every repeated identical result, capped at STABILITY_MAX_FACTOR"""
+    return min(STABILITY_MAX_FACTOR, STABILITY_STEP ** (product.availability_stable_checks or 0))
+
+
+def compute_next_check(product, failure_rate=None, now=None):
+    """
+    Next time a product's source page should be checked
+
+    Args:
+        product: CoreProduct with availability fields already updated
+        failure_rate: platform failure rate (looked up when None)
+        now: reference time (default timezone.now())
+
+    Returns:
+        datetime: when the product becomes due
+    """
+    now = now or timezone.now()
+    if failure_rate is None:
+        failure_rate = platform_failure_rates().get(product.seller.platform_id, 0.0)
+
+    hours = BASE_INTERVAL_HOURS.get(product.availability_status, DEFAULT_BASE_HOURS)
+    popularity = popularity_factor(product)
+    if product.availability_status == 'active':
+        # Popular products gain less from stability so they never drift far from daily
+        hours *= stability_factor(product) ** popularity
+    hours *= popularity
+    hours *= 1.0 - 0.5 * min(max(failure_rate, 0.0), 1.0)
+    hours *= random.uniform(1 - JITTER, 1 + JITTER)
+
+    min_hours = getattr(settings, 'AVAILABILITY_MIN_INTERVAL_HOURS', 1)
+    max_hours = getattr(settings, 'AVAILABILITY_MAX_INTERVAL_HOURS', 336)
+    hours = min(max(hours, min_hours), max_hours)
+    return now + timedelta(hours=hours)
+
+
+def schedule_after_check(product, previous_status, now=None):
+    """
+    Update the stability counter and next_availability_check after a check
+
+    Args:
+        product: CoreProduct whose availability_status holds the new result
+        previous_status: status before this check
+        now: reference time
+    """
+    if product.availability_status != 'error' and product.availability_status == previous_status:
+        product.availability_stable_checks = (product.availability_stable_checks or 0) + 1
+    else:
+        product.availability_stable_checks = 0
+    product.next_availability_check = compute_next_check(product, now=now)
+
+
+def is_due(product, now=None):
+    """True if the product has never been scheduled or its next check has passed"""
+    if product.next_availability_check is None:
+        return True
+    return product.next_availability_check <= (now or timezone.now())
+
+
+def due_products(queryset=None, now=None):
+    """
+    The due queue: active products whose next check has passed, most overdue first
+
+    Args:
+        queryset: CoreProduct queryset to narrow (default all products)
+        now: reference time
+
+    Returns:
+        QuerySet: never-scheduled products first, then by next_availability_check
+    """
+    from products.models import CoreProduct
+
+    if queryset is None:
+        queryset = CoreProduct.objects.all()
+    now = now or timezone.now()
+    return queryset.filter(is_active=True)\
+        .filter(Q(next_availability_check__isnull=True) | Q(next_availability_check__lte=now))\
+        .order_by(F('next_availability_check').asc(nulls_first=True))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Concurrent bulk availability checker
+Runs ProductAvailabilityChecker over many products at once:
+    - products are grouped by source domain, one keep-alive session per domain
+    - each host gets its own request rate (AVAILABILITY_RATE_PER_HOUR unless
+      overridden) and a small concurrency limit, while a global thread pool
+      bounds total work; every HTTP request counts against the rate
+    - HEAD and conditional (ETag / Last-Modified) requests skip page downloads
+      where the server allows it
+    - products checked recently (should_check_now) are skipped unless forced
+    - results are written back with bulk_update in batches
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.db import close_old_connections
+
+from .availability_checker import ProductAvailabilityChecker
+
+logger = logging.getLogger(__name__)
+
+# Used for hosts without a Platform row (e.g. Instagram post URLs)
+DEFAULT_RATE_PER_HOUR = 3600
+
+# Per-host rate for availability checks. Platform.rate_limit_per_hour paces
+# listing scrapes (default 100/h, one request every 36s); a check is one HEAD
+# or GET of a product page, so checks run at the pace of the old sequential
+# loop (one request every 0.5s) unless a rate is given
+AVAILABILITY_RATE_PER_HOUR = 7200
+
+
+class HostLimiter:
+    """Spaces request starts for one host and caps how many are in flight"""
+
+    def __init__(self, rate_per_hour, max_concurrency=4):
+        """
+        Args:
+            rate_per_hour: most requests started per hour
+            max_concurrency: upper bound on simultaneous requests
+        """
+        self.rate_per_hour = max(1, rate_per_hour)
+        self.interval = 3600.0 / self.rate_per_hour
+        # Enough parallel slots to sustain the rate with ~2s responses, never more than asked
+        self.concurrency = max(1, min(max_concurrency, math.ceil(self.rate_per_hour / 3600.0 * 2)))
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait_turn(self):
+        """Block until this host may start another request"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class ThrottledSession(requests.Session):
+    """Keep-alive session that waits for its host's turn before every request it sends, redirects included"""
+
+    def __init__(self, limiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        self.limiter.wait_turn()
+        return super().send(request, **kwargs)
+
+
+class BulkAvailabilityChecker:
+    """Check many products concurrently with per-host politeness"""
+
+    def __init__(self, max_workers=16, max_per_host=4, use_head=True, conditional=True,
+                 update_db=True, batch_size=200, rate_override=AVAILABILITY_RATE_PER_HOUR, on_result=None,
+                 force=False):
+        """
+        Args:
+            max_workers: global thread budget across all hosts
+            max_per_host: most simultaneous requests to one host
+            use_head: try HEAD before downloading the page
+            conditional: send stored ETag/Last-Modified validators
+            update_db: write results back (False for dry runs)
+            batch_size: products per bulk_update
+            rate_override: requests/hour for every host; None uses each platform's
+                Platform.rate_limit_per_hour
+            on_result: optional callback(product, result) for progress output
+            force: check every product, downloading each page in full (no recency
+                skip, HEAD or conditional requests)
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self.force = force
+        self.use_head = use_head and not force
+        self.conditional = conditional and not force
+        self.update_db = update_db
+        self.batch_size = batch_size
+        self.rate_override = rate_override
+        self.on_result = on_result
+
+        self._sessions = {}
+        self._limiters = {}
+        self._setup_lock = threading.Lock()
+        self._pending = []
+        self._write_lock = threading.Lock()
+        self.stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
+
+    def _session(self, domain):
+        """Throttled keep-alive session for a domain, with a connection pool sized to its limiter"""
+        with self._setup_lock:
+            session = self._sessions.get(domain)
+            if session is None:
+                session = ThrottledSession(self._limiters[domain])
+                session.headers['User-Agent'] = ProductAvailabilityChecker.USER_AGENT
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[domain] = session
+            return session
+
+    def _rate_for(self, products):
+        if self.rate_override:
+            return self.rate_override
+        for product in products:
+            try:
+                return product.ecommerce_data.platform.rate_limit_per_hour
+            except Exception:
+                continue
+        return DEFAULT_RATE_PER_HOUR
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _record(self, checker, result):
+        self._count(result['status'])
+        if result.get('not_modified'):
+            self._count('not_modified')
+        if self.update_db:
+            checker.apply_check_result(result)
+            with self._write_lock:
+                self._pending.append(checker.product)
+                if len(self._pending) >= self.batch_size:
+                    self._flush_locked()
+        if self.on_result:
+            self.on_result(checker.product, result)
+
+    def _flush_locked(self):
+        from products.models import CoreProduct
+
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        CoreProduct.objects.bulk_update(batch, ProductAvailabilityChecker.STATUS_FIELDS)
+        logger.info(f'💾 Saved availability for {len(batch)} products')
+
+    def flush(self):
+        """Write any buffered results"""
+        with self._write_lock:
+            self._flush_locked()
+
+    def _drain_host(self, domain, work):
+        """One worker for a host: pull products off its queue until empty"""
+        session = self._session(domain)
+        try:
+            while True:
+                try:
+                    checker = work.popleft()
+                except IndexError:
+                    return
+                result = checker.check_availability(
+                    session=session, use_head=self.use_head, conditional=self.conditional
+                )
+                self._count('checked')
+                try:
+                    self._record(checker, result)
+                except Exception as e:
+                    logger.error(f'❌ Could not record availability for product {checker.product.id}: {str(e)}')
+                    self._count('write_errors')
+        finally:
+            close_old_connections()
+
+    def run(self, products):
+        """
+        Check every product and write results back
+
+        Args:
+            products: iterable of CoreProduct (select_related seller, ecommerce_data__platform)
+
+        Returns:
+            dict: counts per status plus 'checked', 'skipped', 'not_modified', 'hosts', 'elapsed'
+        """
+        start_time = time.time()
+        by_domain = defaultdict(deque)
+        for product in products:
+            checker = ProductAvailabilityChecker(product)
+            if not checker.should_check_now(force=self.force):
+                self._count('skipped')
+                continue
+            if not checker.domain:
+                result = checker.check_availability()  # no URL: returns an error result, no request
+                self._count('checked')
+                self._record(checker, result)
+                continue
+            by_domain[checker.domain].append(checker)
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bulk-availability') as pool:
+            for domain, work in by_domain.items():
+                limiter = HostLimiter(
+                    self._rate_for(checker.product for checker in work),
+                    max_concurrency=self.max_per_host,
+                )
+                self._limiters[domain] = limiter
+                logger.info(
+                    f'🌐 {domain}: {len(work)} products, {limiter.rate_per_hour}/h, '
+                    f'{limiter.concurrency} concurrent'
+                )
+                for _ in range(min(limiter.concurrency, len(work))):
+                    futures.append(pool.submit(self._drain_host, domain, work))
+            wait(futures)
+
+        for future in futures:
+            if future.exception():
+                logger.error(f'❌ Availability worker failed: {future.exception()}')
+        self.flush()
+        for session in self._sessions.values():
+            session.close()
+
+        with self._stats_lock:
+            summary = dict(self.stats)
+        summary.setdefault('skipped', 0)
+        summary['hosts'] = len(by_domain)
+        summary['elapsed'] = round(time.time() - start_time, 2)
+        return summary
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import re
 
 
@@ -156,12 +157,13 @@ def _canonicalize_category(name: str) -> str:
     return CANONICAL_ALIASES.get(key, name)
 
 
-def suggest_category(name: str, description: str = '') -> Optional[str]:
-    """Suggest a category based on simple keyword rules.
+def _suggestion_text(name: str, description: str = '') -> str:
+    return f"{name} {description}".lower()
 
-    Returns the category name if a rule matches, otherwise None.
-    """
-    text = f"{name} {description}".lower()
+
+def suggest_category_uncompiled(name: str, description: str = '') -> Optional[str]:
+    """Rule-by-rule evaluation, kept as the reference the compiled engine is verified against."""
+    text = _suggestion_text(name, description)
 
     # 1) Apply hard rules first
     for pattern, target in HARD_RULES:
@@ -178,3 +180,152 @@ def suggest_category(name: str, description: str = '') -> Optional[str]:
     return None
 
 
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex for a set of literal terms, factored as a trie so each position is tried per character
+    rather than per term. Greedy optional tails make it match the longest term at a position."""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+def _postgres_literal(term: str) -> str:
+    """Escape a literal term for a PostgreSQL advanced regular expression"""
+    return re.sub(r'([\\^$.|?*+()\[\]{}])', r'\\\1', term)
+
+
+class CategoryRuleEngine:
+    """
+    HARD_RULES, CATEGORY_RULES and NEGATIVE_KEYWORDS compiled for one pass per text.
+
+    - hard rules: one alternation finds the leftmost hit; only rules listed
+      before the one that hit are then checked individually
+    - keywords: one lookahead regex over a trie of every positive and negative
+      term reports the longest term starting at each position; every term
+      contained in a reported term is precomputed, so the union is exactly the
+      set of terms in the text
+    - each category's positive and negative terms are precomputed sets
+    """
+
+    def __init__(self, category_rules: Dict[str, List[str]], negative_keywords: Dict[str, List[str]],
+                 hard_rules: List[tuple]):
+        self.hard_rules = [(pattern, _canonicalize_category(target)) for pattern, target in hard_rules]
+        self._hard_screen = None
+        if hard_rules:
+            patterns = [pattern.pattern for pattern, _ in hard_rules]
+            if all(p.startswith(r'\b') for p in patterns):
+                # A shared leading \b is hoisted so the alternation is tried only at word starts
+                screen = r'\b(?:' + '|'.join(f'(?P<hard{i}>{p[2:]})' for i, p in enumerate(patterns)) + ')'
+            else:
+                screen = '|'.join(f'(?P<hard{i}>{p})' for i, p in enumerate(patterns))
+            self._hard_screen = re.compile(screen, re.I)
+
+        self.categories: List[Tuple[str, frozenset, frozenset]] = [
+            (_canonicalize_category(category), frozenset(keywords), frozenset(negative_keywords.get(category, [])))
+            for category, keywords in category_rules.items()
+        ]
+        terms = set()
+        for _, positives, negatives in self.categories:
+            terms |= positives | negatives
+        # '' is contained in every text, exactly as `'' in text` is always true
+        self._always = frozenset(t for t in terms if t == '')
+        terms.discard('')
+
+        self._contained = {term: frozenset(t for t in terms if t in term) for term in terms}
+        self._term_scan = re.compile('(?=(' + _trie_pattern(terms) + '))') if terms else None
+
+    def _terms_in(self, text: str) -> frozenset:
+        if self._term_scan is None:
+            return self._always
+        found = set(self._always)
+        contained = self._contained
+        for longest in set(self._term_scan.findall(text)):
+            found |= contained[longest]
+        return found
+
+    def suggest_text(self, text: str) -> Optional[str]:
+        """Category for already-lowercased "name description" text."""
+        match = self._hard_screen.search(text) if self._hard_screen is not None else None
+        if match:
+            # The leftmost hit names one matching rule; only rules listed before it can take precedence
+            first_hit = int(match.lastgroup[4:])
+            for pattern, target in self.hard_rules[:first_hit]:
+                if pattern.search(text):
+                    return target
+            return self.hard_rules[first_hit][1]
+
+        found = self._terms_in(text)
+        if not found:
+            return None
+        for category, positives, negatives in self.categories:
+            if positives & found and not negatives & found:
+                return category
+        return None
+
+    def suggest(self, name: str, description: str = '') -> Optional[str]:
+        return self.suggest_text(_suggestion_text(name, description))
+
+    def postgres_rules(self) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str, Optional[str]]]]:
+        """
+        The same rules as PostgreSQL regular expressions, for set-based importers.
+
+        Returns:
+            (hard, categories): hard is [(pattern, category)] to test with ~* in order;
+            categories is [(category, positive, negative)] to test with ~ in order, where
+            negative is None when the category has no negative keywords. The text tested
+            is lower("name description"), as in suggest().
+        """
+        def terms_regex(terms):
+            if not terms:
+                return None
+            # Python `term in text` is a literal match; '' (always contained) becomes an empty branch
+            return '|'.join(_postgres_literal(term) for term in sorted(terms))
+
+        hard = [(pattern.pattern.replace(r'\b', r'\y'), target) for pattern, target in self.hard_rules]
+        categories = [(category, terms_regex(positives), terms_regex(negatives))
+                      for category, positives, negatives in self.categories if positives]
+        return hard, categories
+
+
+@lru_cache(maxsize=1)
+def get_category_engine() -> CategoryRuleEngine:
+    """The rule engine for the module-level rules, compiled on first use."""
+    return CategoryRuleEngine(CATEGORY_RULES, NEGATIVE_KEYWORDS, HARD_RULES)
+
+
+def suggest_category(name: str, description: str = '') -> Optional[str]:
+    """Suggest a category based on simple keyword rules.
+
+    Returns the category name if a rule matches, otherwise None.
+    """
+    return get_category_engine().suggest(name, description)
+
+
+def suggest_categories(items: Iterable[Union[str, Sequence[str]]]) -> List[Optional[str]]:
+    """Batch form of suggest_category for importers and audit commands.
+
+    Args:
+        items: product names, or (name, description) pairs
+
+    Returns:
+        Suggested category (or None) per item, in order.
+    """
+    engine = get_category_engine()
+    results = []
+    for item in items:
+        if isinstance(item, str):
+            results.append(engine.suggest(item))
+        else:
+            results.append(engine.suggest(item[0] or '', (item[1] if len(item) > 1 else '') or ''))
+    return results
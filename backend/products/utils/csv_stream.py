@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Streaming readers for the product importers
+
+CSV exports and the COPY blocks of pg_dump files are read from disk row by
+row, so an import holds one batch in memory however large the file is:
+    CSVStream       header-checked csv.DictReader yielding (row number, row)
+                    or batches of them, with optional per-column converters
+    open_copy_block the data rows of one table's COPY ... FROM stdin block
+    csv_records     the raw text of each CSV record, for COPYing part of a file
+    transcode       re-encode a file (e.g. UTF-16 backups) chunk by chunk
+
+Both readers keep a Progress (rows, share of the file read, rows/s) that
+importers print every few thousand rows.
+
+Nothing here imports Django, so the standalone scripts in backend/ use it too.
+"""
+
+import csv
+import io
+import os
+import re
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# pg_dump's "COPY public.table (col, ...) FROM stdin;" line and its end marker
+COPY_HEADER = re.compile(r'^COPY\s+(?:public\.)?"?(\w+)"?\s+\(([^)]+)\)\s+FROM\s+stdin;', re.IGNORECASE)
+COPY_END = '\\.'
+COPY_ESCAPE = re.compile(r'\\(?:([0-7]{1,3})|x([0-9a-fA-F]{1,2})|(.))')
+COPY_ESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
+
+class HeaderError(ValueError):
+    """A CSV header lacks required columns, or has blank or repeated ones"""
+
+
+def check_header(fieldnames: Optional[Sequence[str]], required: Iterable[str] = (), strict: bool = False) -> List[str]:
+    """
+    Validate a CSV header
+
+    Args:
+        fieldnames: Column names from the first line (None for an empty file)
+        required: Columns that must be present
+        strict: Also reject blank and repeated column names
+
+    Returns:
+        The column names as a list
+
+    Raises:
+        HeaderError: naming the offending columns
+    """
+    header = list(fieldnames or [])
+    missing = [h for h in required if h not in header]
+    if missing:
+        raise HeaderError(f"CSV missing required columns: {', '.join(missing)}")
+    if strict:
+        duplicated = sorted({h for h in header if header.count(h) > 1})
+        if duplicated or '' in header:
+            raise HeaderError(f"CSV has blank or repeated column names: {', '.join(duplicated) or '(blank)'}")
+    return header
+
+
+class Progress:
+    """Rows and bytes read so far from a file of total_bytes"""
+
+    def __init__(self, total_bytes: int):
+        self.total_bytes = total_bytes
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed else 0.0
+
+    def __str__(self) -> str:
+        share = ''
+        if self.total_bytes:
+            share = f", {100 * self.bytes / self.total_bytes:.0f}% of {self.total_bytes / 1048576:.1f} MB"
+        return f"{self.rows} rows{share} ({self.rate:.0f} rows/s)"
+
+
+class _ByteCountingFile:
+    """Binary file whose Progress.bytes follows what the text layer has consumed"""
+
+    def __init__(self, path: str):
+        self.raw = open(path, 'rb')
+        self.progress = Progress(os.fstat(self.raw.fileno()).st_size)
+
+    def text(self, encoding: str, errors: str = 'strict', newline: Optional[str] = None) -> io.TextIOWrapper:
+        return io.TextIOWrapper(self.raw, encoding=encoding, errors=errors, newline=newline)
+
+    def update(self, rows: int):
+        self.progress.rows = rows
+        self.progress.bytes = self.raw.tell()
+
+
+class CSVStream:
+    """
+    Row-by-row reader for a CSV file with a header line
+
+    The file is opened and its header checked on construction, so a missing
+    file (FileNotFoundError) or bad header (HeaderError) surfaces before any
+    row is imported. Iterating yields (row number, row dict), numbered from 1
+    for the first data row; batches(size) yields lists of those.
+
+    Args:
+        path: CSV file
+        required: Columns the header must have
+        strict: Also reject blank and repeated column names
+        limit: Stop after this many rows (None or 0 = all)
+        types: {column: converter} applied to each row, e.g. {'price': parse_price}
+        encoding: Text encoding; the default also drops a UTF-8 BOM
+    """
+
+    def __init__(self, path: str, required: Iterable[str] = (), strict: bool = False, limit: Optional[int] = None,
+                 types: Optional[Dict[str, Callable]] = None, encoding: str = 'utf-8-sig'):
+        self.path = path
+        self._file = _ByteCountingFile(path)
+        try:
+            self._reader = csv.DictReader(self._file.text(encoding, newline=''))
+            self.fieldnames = check_header(self._reader.fieldnames, required, strict)
+        except BaseException:
+            self.close()
+            raise
+        self.progress = self._file.progress
+        self.limit = limit if limit and limit > 0 else None
+        self.types = types or {}
+
+    def __iter__(self) -> Iterator[Tuple[int, dict]]:
+        reader = self._reader if self.limit is None else islice(self._reader, self.limit)
+        for row_no, row in enumerate(reader, start=1):
+            for column, convert in self.types.items():
+                row[column] = convert(row.get(column))
+            self._file.update(row_no)
+            yield row_no, row
+
+    def batches(self, size: int) -> Iterator[List[Tuple[int, dict]]]:
+        rows = iter(self)
+        while batch := list(islice(rows, size)):
+            yield batch
+
+    def close(self):
+        self._file.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _unescape(match: re.Match) -> str:
+    octal, hexa, char = match.groups()
+    if octal:
+        return chr(int(octal, 8))
+    if hexa:
+        return chr(int(hexa, 16))
+    return COPY_ESCAPES.get(char, char)
+
+
+def parse_copy_line(line: str) -> List[Optional[str]]:
+    """
+    Decode one line of COPY text format
+
+    Returns:
+        The field values, None for \\N; a data tab is always escaped, so
+        every raw tab separates two fields
+    """
+    return [
+        None if field == '\\N' else COPY_ESCAPE.sub(_unescape, field) if '\\' in field else field
+        for field in line.split('\t')
+    ]
+
+
+class CopyBlock:
+    """
+    The data of one COPY ... FROM stdin block, read lazily from a dump file
+
+    Iterating yields each data line (without its newline) up to the \\.
+    terminator; rows() yields them decoded with parse_copy_line.
+    """
+
+    def __init__(self, file: _ByteCountingFile, text: io.TextIOWrapper, table: str, columns: List[str]):
+        self._file = file
+        self._text = text
+        self.table = table
+        self.columns = columns
+        self.progress = file.progress
+
+    def __iter__(self) -> Iterator[str]:
+        rows = 0
+        for line in self._text:
+            line = line.rstrip('\r\n')
+            if line == COPY_END:
+                break
+            rows += 1
+            self._file.update(rows)
+            yield line
+
+    def rows(self) -> Iterator[List[Optional[str]]]:
+        for line in self:
+            yield parse_copy_line(line)
+
+    def close(self):
+        self._file.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_copy_block(path: str, table: str, encoding: str = 'utf-8', errors: str = 'ignore') -> Optional[CopyBlock]:
+    """
+    Find table's COPY block in a pg_dump file, scanning line by line
+
+    Returns:
+        A CopyBlock positioned at its first data line, or None when the
+        file has no COPY block for the table
+    """
+    file = _ByteCountingFile(path)
+    text = file.text(encoding, errors)
+    for line in text:
+        match = COPY_HEADER.match(line)
+        if match and match.group(1).lower() == table.lower():
+            columns = [column.strip().strip('"') for column in match.group(2).split(',')]
+            return CopyBlock(file, text, table, columns)
+    file.raw.close()
+    return None
+
+
+def csv_records(lines: Iterable[str], quotechar: str = '"') -> Iterator[str]:
+    """
+    Join physical lines into CSV records, as read by csv or COPY ... (FORMAT csv)
+
+    A quoted field may contain newlines, so a record ends only at a line
+    ending outside quotes, i.e. once it holds an even number of quote
+    characters (a doubled quote inside a field counts twice). Records keep
+    their text and line endings as in the file.
+    """
+    record, quotes = [], 0
+    for line in lines:
+        record.append(line)
+        quotes += line.count(quotechar)
+        if quotes % 2 == 0:
+            yield ''.join(record)
+            record, quotes = [], 0
+    if record:
+        yield ''.join(record)
+
+
+class LineFile:
+    """Read-only text file over an iterable of lines, for cursor.copy_expert"""
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self._buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = ''.join(chunks)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def transcode(src_path: str, dst_path: str, src_encoding: str, dst_encoding: str = 'utf-8',
+              errors: str = 'ignore', chunk_chars: int = 1 << 20) -> None:
+    """Re-encode src_path into dst_path, chunk_chars characters at a time"""
+    with open(src_path, 'r', encoding=src_encoding, errors=errors) as src, \
+            open(dst_path, 'w', encoding=dst_encoding, errors=errors) as dst:
+        while chunk := src.read(chunk_chars):
+            dst.write(chunk)
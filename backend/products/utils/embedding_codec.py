@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Binary storage format for CoreProduct.search_embedding
+
+Layout (little-endian, 4-byte header keeps the payload 4-byte aligned):
+    byte 0      format version (EMBEDDING_FORMAT_VERSION)
+    byte 1      dtype code (0 = float32, 1 = float16)
+    bytes 2-3   dimension (uint16)
+    bytes 4-    raw vector values
+
+Rows written before this format are pickled numpy arrays. They are still
+readable through a restricted unpickler until `convert_embeddings` has
+rewritten them.
+"""
+
+import io
+import pickle
+import struct
+
+import numpy as np
+
+EMBEDDING_FORMAT_VERSION = 1
+HEADER = struct.Struct('<BBH')
+
+DTYPE_CODES = {
+    'float32': 0,
+    'float16': 1,
+}
+CODE_DTYPES = {
+    0: np.dtype('<f4'),
+    1: np.dtype('<f2'),
+}
+
+# First byte of a pickle stream (protocol 2+)
+PICKLE_PROTO = 0x80
+
+
+def encode_embedding(vector, dtype='float32'):
+    """
+    Serialize a 1-D embedding to the compact binary format
+
+    Args:
+        vector: array-like of floats
+        dtype: 'float32' (default) or 'float16' for half the storage
+
+    Returns:
+        bytes
+    """
+    if dtype not in DTYPE_CODES:
+        raise ValueError(f'Unsupported embedding dtype: {dtype}')
+    code = DTYPE_CODES[dtype]
+    values = np.asarray(vector, dtype=CODE_DTYPES[code]).ravel()
+    return HEADER.pack(EMBEDDING_FORMAT_VERSION, code, len(values)) + values.tobytes()
+
+
+def is_legacy_embedding(blob):
+    """True if the stored value is an old pickled numpy array"""
+    return bool(blob) and bytes(blob[:1])[0] == PICKLE_PROTO
+
+
+class _NumpyOnlyUnpickler(pickle.Unpickler):
+    """Unpickler that refuses anything but the numpy array reconstructors"""
+
+    ALLOWED = {
+        ('numpy.core.multiarray', '_reconstruct'),
+        ('numpy._core.multiarray', '_reconstruct'),
+        ('numpy.core.numeric', '_frombuffer'),
+        ('numpy._core.numeric', '_frombuffer'),
+        ('numpy', 'ndarray'),
+        ('numpy', 'dtype'),
+        # protocol 2 pickles carry the array bytes as _codecs.encode(latin-1 text)
+        ('_codecs', 'encode'),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) not in self.ALLOWED:
+            raise pickle.UnpicklingError(f'Refusing to load {module}.{name} from embedding')
+        return super().find_class(module, name)
+
+
+def _decode_legacy(blob):
+    return np.asarray(_NumpyOnlyUnpickler(io.BytesIO(bytes(blob))).load(), dtype=np.float32)
+
+
+def decode_embedding(blob):
+    """
+    Decode one stored embedding (new format or legacy pickle) to float32
+
+    Raises:
+        ValueError: if the blob is empty, truncated or of an unknown version
+    """
+    if not blob:
+        raise ValueError('Empty embedding')
+    if is_legacy_embedding(blob):
+        return _decode_legacy(blob)
+
+    version, code, dim = HEADER.unpack_from(blob)
+    if version != EMBEDDING_FORMAT_VERSION or code not in CODE_DTYPES:
+        raise ValueError(f'Unknown embedding format (version={version}, dtype={code})')
+    dtype = CODE_DTYPES[code]
+    if len(blob) != HEADER.size + dim * dtype.itemsize:
+        raise ValueError('Truncated embedding')
+    return np.frombuffer(blob, dtype=dtype, count=dim, offset=HEADER.size).astype(np.float32, copy=False)
+
+
+def decode_embeddings(blobs):
+    """
+    Decode many stored embeddings into one (n, dim) float32 matrix
+
+    When every blob shares the same header (the normal case after
+    `convert_embeddings`), the rows are joined into one buffer and viewed
+    with a structured dtype, so decoding is a single np.frombuffer call.
+    Mixed or legacy rows fall back to per-row decoding.
+
+    Returns:
+        tuple: (matrix, ok) where ok is a boolean mask of blobs that decoded
+    """
+    blobs = [bytes(b) if b is not None else b'' for b in blobs]
+    if not blobs:
+        return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=bool)
+
+    header = blobs[0][:HEADER.size]
+    if len(header) == HEADER.size and not is_legacy_embedding(header) and all(
+        b[:HEADER.size] == header for b in blobs
+    ):
+        version, code, dim = HEADER.unpack(header)
+        if version == EMBEDDING_FORMAT_VERSION and code in CODE_DTYPES:
+            row = np.dtype([('header', 'u1', HEADER.size), ('vector', CODE_DTYPES[code], dim)])
+            if all(len(b) == row.itemsize for b in blobs):
+                records = np.frombuffer(b''.join(blobs), dtype=row)
+                return records['vector'].astype(np.float32, copy=False), np.ones(len(blobs), dtype=bool)
+
+    vectors = []
+    ok = np.zeros(len(blobs), dtype=bool)
+    for i, blob in enumerate(blobs):
+        try:
+            vectors.append(decode_embedding(blob))
+            ok[i] = True
+        except Exception:
+            continue
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32), ok
+    return np.vstack(vectors), ok
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Batching encoder for AI search queries
+Concurrent request threads each submit one sentence; a single worker thread
+waits a few milliseconds for company and runs one batched forward pass,
+which is far cheaper on CPU than N separate one-sentence passes.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingEncoder:
+    """Drop-in `encode(text)` wrapper that micro-batches concurrent calls"""
+
+    def __init__(self, model, max_batch_size=32, max_wait_ms=5, timeout=30):
+        """
+        Args:
+            model: loaded SentenceTransformer
+            max_batch_size: most sentences encoded in one forward pass
+            max_wait_ms: how long the first request of a batch waits for others
+            timeout: seconds a caller waits for its vector before giving up
+        """
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.sentences = 0
+        self.largest_batch = 0
+
+        self._worker = threading.Thread(target=self._run, name='ai-search-encoder', daemon=True)
+        self._worker.start()
+
+    def encode(self, text, **kwargs):
+        """
+        Encode one sentence; blocks until its batch is done
+
+        Extra keyword arguments are accepted for SentenceTransformer.encode
+        compatibility and ignored (results are always float32 numpy).
+        """
+        future = Future()
+        self._queue.put((text, future))
+        return future.result(timeout=self.timeout)
+
+    def _collect(self):
+        """Block for the first item, then gather more until the batch or deadline fills"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.model.encode(
+                    texts, convert_to_numpy=True, show_progress_bar=False, batch_size=len(texts)
+                )
+                vectors = np.asarray(vectors, dtype=np.float32)
+                for (_, future), vector in zip(batch, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                logger.error(f'❌ Batched encode of {len(texts)} queries failed: {str(e)}')
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+            with self._lock:
+                self.batches += 1
+                self.sentences += len(texts)
+                self.largest_batch = max(self.largest_batch, len(texts))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'sentences': self.sentences,
+                'avg_batch': round(self.sentences / self.batches, 2) if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+                'queued': self._queue.qsize(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+
+_encoder_singleton = None
+_encoder_lock = threading.Lock()
+
+
+def loaded_query_encoder():
+    """The batching encoder if one has been started, else None"""
+    return _encoder_singleton
+
+
+def get_query_encoder(model):
+    """
+    Return the object request threads should call `.encode()` on
+
+    With AI_SEARCH_BATCH_ENCODING enabled (default) this is a process-wide
+    BatchingEncoder around `model`; otherwise the model itself.
+    """
+    global _encoder_singleton
+
+    if model is None or not getattr(settings, 'AI_SEARCH_BATCH_ENCODING', True):
+        return model
+
+    if _encoder_singleton is None or _encoder_singleton.model is not model:
+        with _encoder_lock:
+            if _encoder_singleton is None or _encoder_singleton.model is not model:
+                _encoder_singleton = BatchingEncoder(
+                    model,
+                    max_batch_size=getattr(settings, 'AI_SEARCH_BATCH_MAX_SIZE', 32),
+                    max_wait_ms=getattr(settings, 'AI_SEARCH_BATCH_MAX_WAIT_MS', 5),
+                )
+                logger.info(
+                    f'🧵 Batching query encoder started '
+                    f'(max batch {_encoder_singleton.max_batch_size}, '
+                    f'max wait {_encoder_singleton.max_wait * 1000:.0f}ms)'
+                )
+    return _encoder_singleton
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+pgvector-backed nearest neighbour search
+Pushes `ORDER BY embedding <=> query LIMIT k` down to PostgreSQL when the
+vector extension and the products_productembedding table are present
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Re-check availability this often (seconds) so a late backfill is noticed
+AVAILABILITY_TTL = 300
+# Until the backfill covers this share of the catalogue, searches stay on the in-process index
+MIN_COVERAGE = getattr(settings, 'PGVECTOR_MIN_COVERAGE', 1.0)
+
+_available = None
+_checked_at = 0.0
+_check_lock = threading.Lock()
+
+
+def pgvector_available(force=False):
+    """
+    True if ANN queries can run in the database
+
+    Requires PostgreSQL, the vector extension, the ProductEmbedding table
+    and a backfill covering MIN_COVERAGE of the active products with an
+    embedding, so a partial backfill never answers for the whole catalogue.
+    The answer is cached per process.
+    """
+    global _available, _checked_at
+
+    if not force and _available is not None and time.time() - _checked_at < AVAILABILITY_TTL:
+        return _available
+
+    with _check_lock:
+        from products.models import ProductEmbedding
+
+        available = False
+        try:
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
+                    has_extension = cursor.fetchone() is not None
+                table = ProductEmbedding._meta.db_table
+                if has_extension and table in connection.introspection.table_names():
+                    covered, total = vector_coverage()
+                    available = total > 0 and covered >= MIN_COVERAGE * total
+                    if not available and covered:
+                        logger.info(f'🧭 pgvector backfill covers {covered}/{total} products - not used yet')
+        except Exception as e:
+            logger.warning(f'pgvector availability check failed: {str(e)}')
+            available = False
+
+        if available != _available:
+            logger.info(f"🧭 pgvector ANN search {'enabled' if available else 'disabled'}")
+        _available = available
+        _checked_at = time.time()
+    return _available
+
+
+def ann_search(query_embedding, k, ef_search=None):
+    """
+    Find the k nearest active products by cosine distance in PostgreSQL
+
+    Args:
+        query_embedding: 1-D query vector
+        k: number of results wanted
+        ef_search: HNSW candidate list size (defaults to max(40, 2k))
+
+    Returns:
+        list of (product_id, similarity) tuples, best first
+    """
+    from pgvector.django import CosineDistance
+    from products.models import ProductEmbedding
+
+    if k <= 0:
+        return []
+
+    ef_search = ef_search or max(40, 2 * k)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Wider candidate list so the is_active post-filter still fills k
+            cursor.execute('SET LOCAL hnsw.ef_search = %s', [int(ef_search)])
+        rows = list(
+            ProductEmbedding.objects.filter(product__is_active=True)
+            .annotate(distance=CosineDistance('embedding', [float(x) for x in query_embedding]))
+            .order_by('distance')
+            .values_list('product_id', 'distance')[:k]
+        )
+    return [(product_id, 1.0 - float(distance)) for product_id, distance in rows]
+
+
+def upsert_vectors(vectors_by_product_id):
+    """
+    Write embeddings into the pgvector table (insert or replace)
+
+    Args:
+        vectors_by_product_id: dict of product_id -> 1-D vector
+    """
+    from django.utils import timezone
+    from products.models import ProductEmbedding
+
+    if not vectors_by_product_id:
+        return 0
+    now = timezone.now()
+    rows = [
+        ProductEmbedding(product_id=product_id, embedding=[float(x) for x in vector], updated_at=now)
+        for product_id, vector in vectors_by_product_id.items()
+    ]
+    ProductEmbedding.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['product'],
+        update_fields=['embedding', 'updated_at'],
+    )
+    return len(rows)
+
+
+def vector_coverage():
+    """
+    Returns:
+        tuple: (active products with a pgvector row, active products with a search embedding)
+    """
+    from products.models import CoreProduct
+
+    embedded = CoreProduct.objects.filter(is_active=True, search_embedding__isnull=False)
+    return embedded.filter(vector_embedding__isnull=False).count(), embedded.count()
+
+
+def vector_table_exists():
+    """True if the migration created the pgvector table on this database"""
+    from products.models import ProductEmbedding
+    try:
+        return ProductEmbedding._meta.db_table in connection.introspection.table_names()
+    except Exception:
+        return False
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Query embedding cache for AI search
+Popular queries ("ac", "iphone", "tv") are encoded once and reused instead
+of running the sentence transformer on every request.
+
+Two levels:
+    - a per-process LRU with a TTL (always on)
+    - an optional shared Django cache alias (e.g. redis) so gunicorn workers
+      reuse each other's encodings; set QUERY_EMBEDDING_CACHE_ALIAS to enable
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+from .embedding_codec import encode_embedding, decode_embedding
+
+logger = logging.getLogger(__name__)
+
+# Bump when the model changes so stale shared entries are ignored
+MODEL_KEY = 'all-MiniLM-L6-v2'
+
+
+def normalize_query(query):
+    """Cache key text: lowercase, collapsed whitespace"""
+    return ' '.join(query.lower().split())
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU + TTL cache of float32 query vectors with hit/miss counters"""
+
+    def __init__(self, maxsize=2048, ttl=3600, shared_alias=None):
+        """
+        Args:
+            maxsize: entries kept in the local LRU
+            ttl: seconds an entry stays valid (local and shared)
+            shared_alias: Django CACHES alias for the cross-worker level, or None
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared_alias = shared_alias or None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _shared(self):
+        if not self.shared_alias:
+            return None
+        from django.core.cache import caches
+        try:
+            return caches[self.shared_alias]
+        except Exception as e:
+            logger.warning(f'Query cache alias "{self.shared_alias}" unavailable: {str(e)}')
+            self.shared_alias = None
+            return None
+
+    @staticmethod
+    def _shared_key(key):
+        digest = hashlib.sha1(f'{MODEL_KEY}:{key}'.encode('utf-8')).hexdigest()
+        return f'qemb:v1:{digest}'
+
+    def get(self, query):
+        """Return the cached vector for a query, or None"""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+
+        shared = self._shared()
+        if shared is not None:
+            try:
+                blob = shared.get(self._shared_key(key))
+            except Exception as e:
+                logger.debug(f'Shared query cache read failed: {str(e)}')
+                blob = None
+            if blob is not None:
+                vector = decode_embedding(blob)
+                self._store_local(key, vector, now)
+                with self._lock:
+                    self.shared_hits += 1
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, query, vector):
+        """Cache a freshly encoded vector locally and (if enabled) in the shared cache"""
+        key = normalize_query(query)
+        vector = np.asarray(vector, dtype=np.float32)
+        self._store_local(key, vector, time.time())
+
+        shared = self._shared()
+        if shared is not None:
+            try:
+                shared.set(self._shared_key(key), encode_embedding(vector), self.ttl)
+            except Exception as e:
+                logger.debug(f'Shared query cache write failed: {str(e)}')
+        return vector
+
+    def _store_local(self, key, vector, now):
+        vector.setflags(write=False)  # shared between requests, keep it immutable
+        with self._lock:
+            self._entries[key] = (vector, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                'shared_alias': self.shared_alias,
+            }
+
+
+_query_cache_singleton = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache():
+    """Process-wide cache configured from settings"""
+    global _query_cache_singleton
+
+    if _query_cache_singleton is None:
+        with _query_cache_lock:
+            if _query_cache_singleton is None:
+                _query_cache_singleton = QueryEmbeddingCache(
+                    maxsize=getattr(settings, 'QUERY_EMBEDDING_CACHE_SIZE', 2048),
+                    ttl=getattr(settings, 'QUERY_EMBEDDING_CACHE_TTL', 3600),
+                    shared_alias=getattr(settings, 'QUERY_EMBEDDING_CACHE_ALIAS', ''),
+                )
+    return _query_cache_singleton
+
+
+def encode_query(model, query):
+    """
+    Encode a search query through the cache
+
+    Args:
+        model: loaded SentenceTransformer (or a BatchingEncoder around one)
+        query: raw query text
+
+    Returns:
+        np.ndarray: float32 query vector
+    """
+    cache = get_query_cache()
+    vector = cache.get(query)
+    if vector is not None:
+        return vector
+    vector = model.encode(normalize_query(query), convert_to_numpy=True, show_progress_bar=False)
+    return cache.put(query, vector)
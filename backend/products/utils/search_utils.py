@@ -1,5 +1,8 @@
 from typing import Dict, List, Tuple
 
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+
 
 # Focused, safe synonyms (do NOT expand to entire category groups)
 SYNONYMS: Dict[str, List[str]] = {
@@ -40,6 +43,21 @@ def expand_query_synonyms(query: str) -> List[str]:
     return ordered or tokens
 
 
+def search_vector_match(query: str) -> Tuple[Q, SearchRank]:
+    """
+    Full-text match and rank of a query (with synonyms) against CoreProduct.search_vector.
+
+    search_vector is the stored weighted document (name A, brand/category B,
+    description C), kept current by a DB trigger (migrations 0012 and 0017)
+    and covered by the GIN index, so matching it never re-parses product text.
+
+    Returns:
+        (filter matching the query, rank expression to annotate)
+    """
+    search_query = SearchQuery(' '.join(expand_query_synonyms(query)), search_type='plain')
+    return Q(search_vector=search_query), SearchRank(F('search_vector'), search_query)
+
+
 def build_token_groups(query: str) -> List[List[str]]:
     """Return a list of token groups for AND logic with synonyms per token.
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Trigram-backed fallback filter for product search
+The fallback ANDs one OR-clause per token group (see build_token_groups) over
+product name, description, brand name and category name. Every column has a
+pg_trgm GIN index on UPPER(column) (migration 0013), which serves both:
+
+    - exact substring matching: Django's icontains compiles to
+      UPPER(col) LIKE UPPER('%token%'), which the index answers directly
+    - typo-tolerant matching (fuzzy=True): pg_trgm word similarity (%>) on
+      name/description and whole-string similarity (%) on brand/category
+      names, using the server's pg_trgm thresholds
+"""
+
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramSimilar, TrigramWordSimilar
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+# Shorter tokens have too few trigrams to match fuzzily without noise
+MIN_FUZZY_TOKEN_LENGTH = 4
+
+
+def fuzzy_requested(value):
+    """
+    Resolve the typo-tolerant mode from a `fuzzy` query param
+
+    Args:
+        value: raw query param value, or None when absent
+
+    Returns:
+        bool: explicit true/false from the param, else SEARCH_FUZZY_MATCHING
+    """
+    if value is None or value == '':
+        return getattr(settings, 'SEARCH_FUZZY_MATCHING', False)
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def token_clause(token, fuzzy=False):
+    """Match one token in any searched field"""
+    clause = (
+        Q(name__icontains=token) |
+        Q(description__icontains=token) |
+        Q(brand__name__icontains=token)
+    )
+    # Avoid category-name matches for very short tokens like 'ac'
+    if len(token) >= 3:
+        clause |= Q(category__name__icontains=token)
+
+    if fuzzy and len(token) >= MIN_FUZZY_TOKEN_LENGTH:
+        # Same UPPER() expressions as the indexes; pg_trgm itself is case-insensitive
+        pattern = token.upper()
+        clause |= (
+            Q(TrigramWordSimilar(Upper('name'), pattern)) |
+            Q(TrigramWordSimilar(Upper('description'), pattern)) |
+            Q(TrigramSimilar(Upper('brand__name'), pattern)) |
+            Q(TrigramSimilar(Upper('category__name'), pattern))
+        )
+    return clause
+
+
+def build_fallback_filter(token_groups, fuzzy=False):
+    """
+    Build the AND-of-ORs fallback filter: every group must match in some field
+
+    Args:
+        token_groups: output of build_token_groups (synonyms per token)
+        fuzzy: also accept trigram-similar (misspelled) tokens
+
+    Returns:
+        Q: filter for CoreProduct querysets
+    """
+    fallback_q = Q()
+    for group in token_groups:
+        or_clause = Q()
+        for token in group:
+            or_clause |= token_clause(token, fuzzy=fuzzy)
+        fallback_q &= or_clause
+    return fallback_q
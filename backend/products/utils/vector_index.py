@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+In-memory vector index for AI semantic search
+Holds every active product embedding as one pre-normalized float32 matrix
+so a query costs a single matrix-vector product plus a top-k selection
+
+The index is versioned and patched in place: changed products are picked up
+through an updated_at watermark (polled every few seconds) and through
+CoreProduct save/delete signals inside the current process.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+
+from .embedding_codec import decode_embedding, decode_embeddings
+
+logger = logging.getLogger(__name__)
+
+# How often a request may trigger a watermark poll (seconds)
+REFRESH_INTERVAL = getattr(settings, 'VECTOR_INDEX_REFRESH_SECONDS', 5)
+# How often deleted rows are reconciled against the table (seconds)
+RECONCILE_INTERVAL = getattr(settings, 'VECTOR_INDEX_RECONCILE_SECONDS', 300)
+# Re-read rows this close to the watermark to cover commits with equal timestamps
+WATERMARK_OVERLAP = timedelta(seconds=2)
+
+
+class ProductVectorIndex:
+    """Pre-normalized embedding matrix with a parallel array of product ids"""
+
+    # Compact the arrays once this fraction of rows are tombstones
+    COMPACT_RATIO = 0.25
+
+    def __init__(self, ids, matrix, watermark=None, recent=None):
+        """
+        Args:
+            ids: np.ndarray of product ids (int64), one per matrix row
+            matrix: np.ndarray of shape (n, dim), rows L2-normalized float32
+            watermark: latest CoreProduct.updated_at reflected in the index
+            recent: {product_id: updated_at} of loaded rows within WATERMARK_OVERLAP of the watermark
+        """
+        count = len(ids)
+        # Readers grab this tuple once, so writers can swap it atomically
+        self._state = (ids, matrix, np.ones(count, dtype=bool), count)
+        self._positions = {int(product_id): row for row, product_id in enumerate(ids)}
+        self._dead = 0
+        self._write_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirty = False
+        self._pending_removals = set()
+        # product id -> updated_at already applied, for rows inside the overlap window
+        self._recent = dict(recent or {})
+
+        self.version = 0
+        self.watermark = watermark
+        self.built_at = time.time()
+        self.last_polled = self.built_at
+        self.last_reconciled = self.built_at
+
+    @property
+    def size(self):
+        return len(self._positions)
+
+    @property
+    def dim(self):
+        matrix = self._state[1]
+        return matrix.shape[1] if matrix.ndim == 2 else 0
+
+    @staticmethod
+    def normalize(vectors):
+        """L2-normalize a vector or a matrix of row vectors as float32"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @classmethod
+    def build(cls, batch_size=2000):
+        """
+        Load all active product embeddings from the database
+
+        Args:
+            batch_size: rows fetched per round-trip while streaming the table
+
+        Returns:
+            ProductVectorIndex
+        """
+        from django.db.models import Max
+        from products.models import CoreProduct
+
+        start_time = time.time()
+        # Take the watermark first so rows written during the scan are re-read later
+        watermark = CoreProduct.objects.aggregate(latest=Max('updated_at'))['latest']
+        rows = CoreProduct.objects.filter(
+            is_active=True,
+            search_embedding__isnull=False
+        ).values_list('id', 'search_embedding', 'updated_at').iterator(chunk_size=batch_size)
+
+        ids = []
+        blocks = []
+        batch_ids = []
+        batch_blobs = []
+        recent = {}
+        cutoff = watermark - WATERMARK_OVERLAP if watermark is not None else None
+        for product_id, blob, updated_at in rows:
+            if cutoff is not None and updated_at and updated_at > cutoff:
+                recent[product_id] = updated_at
+            batch_ids.append(product_id)
+            batch_blobs.append(blob)
+            if len(batch_blobs) >= batch_size:
+                cls._decode_batch(batch_ids, batch_blobs, ids, blocks)
+                batch_ids, batch_blobs = [], []
+        if batch_blobs:
+            cls._decode_batch(batch_ids, batch_blobs, ids, blocks)
+
+        if blocks:
+            matrix = cls.normalize(np.vstack(blocks))
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        index = cls(np.asarray(ids, dtype=np.int64), matrix, watermark=watermark, recent=recent)
+        logger.info(f'✅ Vector index built: {index.size} products, dim={index.dim} in {time.time() - start_time:.2f}s')
+        return index
+
+    @staticmethod
+    def _decode_batch(batch_ids, batch_blobs, ids, blocks):
+        """Decode one fetched chunk with a single frombuffer where possible"""
+        matrix, ok = decode_embeddings(batch_blobs)
+        skipped = len(batch_ids) - int(ok.sum())
+        if skipped:
+            logger.debug(f'Skipped {skipped} undecodable embeddings')
+        if len(matrix):
+            ids.extend(product_id for product_id, good in zip(batch_ids, ok) if good)
+            blocks.append(matrix)
+
+    def search(self, query_embedding, k):
+        """
+        Find the k most similar products
+
+        Args:
+            query_embedding: 1-D query vector (normalized here)
+            k: number of results wanted
+
+        Returns:
+            list of (product_id, similarity) tuples, best first
+        """
+        ids, matrix, live, count = self._state
+        if count == 0 or k <= 0:
+            return []
+
+        query = self.normalize(query_embedding)
+        scores = matrix[:count] @ query
+        if self._dead:
+            scores[~live[:count]] = -np.inf
+
+        k = min(k, count)
+        if k < count:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (int(ids[i]), float(scores[i]))
+            for i in top
+            if scores[i] != -np.inf
+        ]
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def apply_delta(self, upserts=None, removals=None):
+        """
+        Patch the index without rebuilding the matrix
+
+        Args:
+            upserts: dict of product_id -> embedding vector (added or changed)
+            removals: iterable of product ids to drop (deactivated or deleted)
+
+        Returns:
+            int: index version, bumped only when a row was added, changed or removed
+        """
+        upserts = upserts or {}
+        removals = removals or ()
+
+        with self._write_lock:
+            ids, matrix, live, count = self._state
+            removed = 0
+
+            for product_id in removals:
+                row = self._positions.pop(int(product_id), None)
+                if row is not None:
+                    live[row] = False
+                    self._dead += 1
+                    removed += 1
+            if not upserts and not removed:
+                return self.version
+
+            if upserts:
+                vectors = self.normalize(np.vstack(list(upserts.values())))
+                if matrix.ndim != 2 or matrix.shape[1] != vectors.shape[1]:
+                    if self._positions:
+                        raise ValueError('Embedding dimension changed - rebuild the vector index')
+                    # Index was built empty: allocate arrays now that the dimension is known
+                    ids, matrix, live, count = self._allocate(vectors.shape[1], len(vectors))
+                    self._dead = 0
+
+                new_rows = [
+                    i for i, product_id in enumerate(upserts)
+                    if int(product_id) not in self._positions
+                ]
+                if count + len(new_rows) > len(ids):
+                    ids, matrix, live = self._grow(ids, matrix, live, count, count + len(new_rows))
+
+                for i, product_id in enumerate(upserts):
+                    product_id = int(product_id)
+                    row = self._positions.get(product_id)
+                    if row is None:
+                        row = count
+                        count += 1
+                        ids[row] = product_id
+                        live[row] = True
+                        self._positions[product_id] = row
+                    matrix[row] = vectors[i]
+
+            self._state = (ids, matrix, live, count)
+            if self._dead > self.COMPACT_RATIO * max(count, 1):
+                self._compact()
+
+            self.version += 1
+            return self.version
+
+    @staticmethod
+    def _allocate(dim, capacity):
+        capacity = max(capacity, 1024)
+        return (
+            np.zeros(capacity, dtype=np.int64),
+            np.zeros((capacity, dim), dtype=np.float32),
+            np.zeros(capacity, dtype=bool),
+            0,
+        )
+
+    @staticmethod
+    def _grow(ids, matrix, live, count, needed):
+        """Reallocate with doubling capacity so appends stay amortized O(1)"""
+        capacity = max(needed, 2 * len(ids))
+        new_ids = np.zeros(capacity, dtype=np.int64)
+        new_matrix = np.zeros((capacity, matrix.shape[1]), dtype=np.float32)
+        new_live = np.zeros(capacity, dtype=bool)
+        new_ids[:count] = ids[:count]
+        new_matrix[:count] = matrix[:count]
+        new_live[:count] = live[:count]
+        return new_ids, new_matrix, new_live
+
+    def _compact(self):
+        """Drop tombstoned rows (caller holds the write lock)"""
+        ids, matrix, live, count = self._state
+        keep = np.flatnonzero(live[:count])
+        ids = ids[keep].copy()
+        matrix = matrix[keep].copy()
+        self._positions = {int(product_id): row for row, product_id in enumerate(ids)}
+        self._dead = 0
+        self._state = (ids, matrix, np.ones(len(ids), dtype=bool), len(ids))
+        logger.info(f'🧹 Vector index compacted to {len(ids)} rows')
+
+    def mark_dirty(self, removed_id=None):
+        """Ask the next search to poll immediately (used by model signals)"""
+        if removed_id is not None:
+            self._pending_removals.add(int(removed_id))
+        self._dirty = True
+
+    def refresh(self):
+        """
+        Apply every CoreProduct change since the watermark
+
+        Returns:
+            tuple: (upserted count, removed count)
+        """
+        from products.models import CoreProduct
+
+        queryset = CoreProduct.objects.all()
+        if self.watermark is not None:
+            queryset = queryset.filter(updated_at__gt=self.watermark - WATERMARK_OVERLAP)
+        rows = queryset.values_list('id', 'is_active', 'search_embedding', 'updated_at').iterator(chunk_size=2000)
+
+        upserts = {}
+        removals = set(self._pending_removals)
+        self._pending_removals.difference_update(removals)
+        watermark = self.watermark
+        recent = dict(self._recent)
+        for product_id, is_active, blob, updated_at in rows:
+            if watermark is None or (updated_at and updated_at > watermark):
+                watermark = updated_at
+            # The overlap re-reads rows already applied at this updated_at
+            applied = recent.get(product_id)
+            if applied is not None and updated_at is not None and updated_at <= applied:
+                continue
+            recent[product_id] = updated_at
+            if not is_active or blob is None:
+                removals.add(product_id)
+                continue
+            try:
+                upserts[product_id] = decode_embedding(blob)
+            except Exception as e:
+                logger.debug(f'Failed to load embedding for product {product_id}: {str(e)}')
+                removals.add(product_id)
+
+        now = time.time()
+        if now - self.last_reconciled >= RECONCILE_INTERVAL:
+            # Hard deletes never show up behind the watermark, so diff the id sets
+            current = set(CoreProduct.objects.filter(
+                is_active=True,
+                search_embedding__isnull=False
+            ).values_list('id', flat=True).iterator(chunk_size=10000))
+            removals.update(set(self._positions) - current)
+            self.last_reconciled = now
+
+        if upserts or removals:
+            version = self.version
+            if self.apply_delta(upserts=upserts, removals=removals) != version:
+                logger.info(
+                    f'🔄 Vector index v{self.version}: {len(upserts)} upserted, '
+                    f'{len(removals)} removed, {self.size} products'
+                )
+        self.watermark = watermark
+        if watermark is not None:
+            cutoff = watermark - WATERMARK_OVERLAP
+            recent = {product_id: updated_at for product_id, updated_at in recent.items()
+                      if updated_at and updated_at > cutoff}
+        self._recent = recent
+        self.last_polled = now
+        return len(upserts), len(removals)
+
+    def maybe_refresh(self):
+        """Poll for changes if the interval elapsed; never blocks concurrent searches"""
+        if not self._dirty and time.time() - self.last_polled < REFRESH_INTERVAL:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # another thread is already polling
+        try:
+            self._dirty = False
+            self.refresh()
+        except Exception as e:
+            logger.warning(f'Vector index refresh failed: {str(e)}')
+        finally:
+            self._refresh_lock.release()
+
+
+# ============================================================================
+# PROCESS-WIDE SINGLETON
+# ============================================================================
+
+_vector_index_singleton = None
+_vector_index_lock = threading.Lock()
+
+
+def get_vector_index():
+    """
+    Get or build the vector index singleton (thread-safe, module-level)
+    The first caller pays the build cost; later callers get a refreshed index
+    """
+    global _vector_index_singleton
+
+    if _vector_index_singleton is not None:
+        _vector_index_singleton.maybe_refresh()
+        return _vector_index_singleton
+
+    with _vector_index_lock:
+        if _vector_index_singleton is None:
+            logger.info('📦 Building vector index from product embeddings...')
+            _vector_index_singleton = ProductVectorIndex.build()
+
+    return _vector_index_singleton
+
+
+def loaded_vector_index():
+    """The index if this process has built it, else None (never triggers a build)"""
+    return _vector_index_singleton
+
+
+def mark_vector_index_stale(removed_id=None):
+    """Signal hook: flag the loaded index (if any) for an immediate poll"""
+    if _vector_index_singleton is not None:
+        _vector_index_singleton.mark_dirty(removed_id=removed_id)
+
+
+def reset_vector_index():
+    """Drop the cached index so the next search rebuilds it"""
+    global _vector_index_singleton
+
+    with _vector_index_lock:
+        _vector_index_singleton = None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Background warm-up for AI search
+Loads the sentence transformer, runs a dummy encode and builds the vector
+index on a daemon thread at worker boot, so the first real search does not
+pay the 20-30 second model load. Opt in with AI_SEARCH_WARMUP=True.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_state = {
+    'status': 'disabled',  # disabled | pending | warming | ready | failed
+    'started_at': None,
+    'finished_at': None,
+    'steps': {},
+    'error': None,
+}
+_state_lock = threading.Lock()
+_warmup_thread = None
+
+# Programs that serve web requests and so get the warm-up
+SERVER_PROGRAMS = ('gunicorn', 'uwsgi', 'daphne', 'uvicorn')
+
+
+def _is_server_process():
+    """
+    True for web workers (runserver, gunicorn, uwsgi, ...); False for celery
+    workers, test runners, migrate, shell and other scripts, which never
+    serve a search and should not load the model
+    """
+    argv = sys.argv or ['']
+    if os.path.basename(argv[0]) == 'manage.py':
+        if len(argv) < 2 or argv[1] != 'runserver':
+            return False
+        # The autoreloader parent never serves requests
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in argv
+    if 'uwsgi' in sys.modules:
+        # uWSGI's embedded interpreter provides this module
+        return True
+    # argv[0] is e.g. /venv/bin/gunicorn, or .../gunicorn/__main__.py for python -m gunicorn
+    path = argv[0].replace('\\', '/').lower().split('/')
+    program = path[-2] if path[-1] == '__main__.py' and len(path) > 1 else path[-1]
+    return program.startswith(SERVER_PROGRAMS)
+
+
+def _set(**changes):
+    with _state_lock:
+        _state.update(changes)
+
+
+def _step(name, func):
+    start_time = time.time()
+    result = func()
+    with _state_lock:
+        _state['steps'][name] = round(time.time() - start_time, 3)
+    return result
+
+
+def _warm():
+    # Imported here: views pulls in DRF and the models, which must not load during app setup
+    from products.views import get_ai_model
+    from .encoding_service import get_query_encoder
+    from .vector_index import get_vector_index
+    from .pgvector_search import pgvector_available
+
+    _set(status='warming', started_at=time.time())
+    logger.info('🔥 AI search warm-up started')
+    try:
+        model = _step('load_model', get_ai_model)
+        if model is None:
+            raise RuntimeError('AI model could not be loaded')
+        _step('dummy_encode', lambda: get_query_encoder(model).encode('warm up'))
+        if not _step('check_pgvector', pgvector_available):
+            # The in-process index is only needed when pgvector is not serving queries
+            _step('build_vector_index', get_vector_index)
+        _set(status='ready', finished_at=time.time())
+        logger.info(f"✅ AI search warm-up finished in {_state['finished_at'] - _state['started_at']:.2f}s")
+    except Exception as e:
+        _set(status='failed', finished_at=time.time(), error=str(e))
+        logger.error(f'❌ AI search warm-up failed: {str(e)}')
+
+
+def start_warmup(force=False):
+    """
+    Start the warm-up thread once per process (called from AppConfig.ready)
+
+    Args:
+        force: start even if AI_SEARCH_WARMUP is off or this is not a server process
+    """
+    global _warmup_thread
+
+    if not force and (not getattr(settings, 'AI_SEARCH_WARMUP', False) or not _is_server_process()):
+        return None
+    with _state_lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+        _state['status'] = 'pending'
+        _warmup_thread = threading.Thread(target=_warm, name='ai-search-warmup', daemon=True)
+    _warmup_thread.start()
+    return _warmup_thread
+
+
+def warmup_status():
+    """Snapshot of the warm-up state; 'ready' is True when traffic can be served"""
+    with _state_lock:
+        snapshot = dict(_state, steps=dict(_state['steps']))
+    snapshot['ready'] = snapshot['status'] in ('ready', 'disabled')
+    return snapshot
@@ -15,12 +15,15 @@ from .serializers import ProductSerializer, CategorySerializer, WishlistSerializ
 import logging
 import os
 import time
-import pickle
-import numpy as np
 import threading
 from django.conf import settings
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-from .utils.search_utils import expand_query_synonyms, parse_query_filters, build_token_groups
+from .utils.search_utils import parse_query_filters, build_token_groups, search_vector_match
+from .utils.trigram_search import build_fallback_filter, fuzzy_requested
+from .utils.vector_index import get_vector_index
+from .utils.pgvector_search import pgvector_available, ann_search
+from .utils.query_cache import encode_query
+from .utils.encoding_service import get_query_encoder
+from .utils.availability_queue import enqueue_availability_check
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +79,22 @@ def get_ai_model():
         logger.error(f'Error loading AI model: {str(e)}')
         return None
 
+def semantic_top_k(query_embedding, k):
+    """
+    Return the k most similar active products as (product_id, similarity) pairs.
+    Uses pgvector ANN in PostgreSQL when available, else the in-process index.
+    
+    Returns:
+        tuple: (hits, backend name, number of products searched or None)
+    """
+    if pgvector_available():
+        try:
+            return ann_search(query_embedding, k), 'pgvector', None
+        except Exception as e:
+            logger.warning(f'pgvector search failed, falling back to in-process index: {e}')
+    index = get_vector_index()
+    return index.search(query_embedding, k), 'memory', index.size
+
 class ProductViewSet(viewsets.ModelViewSet):
     queryset = CoreProduct.objects.filter(is_active=True)
     serializer_class = ProductSerializer
@@ -84,31 +103,25 @@ class ProductViewSet(viewsets.ModelViewSet):
     
     def retrieve(self, request, *args, **kwargs):
         """
-        Retrieve a single product and check its availability on source platform
-        Reactive checking: only check when user visits the product
+        Retrieve a single product with its last known availability status
+        Reactive checking: a due check is queued in the background when the
+        user visits the product, so vendor site latency never delays the page
         """
         instance = self.get_object()
         
-        # Check product availability on source platform (non-blocking)
         try:
-            from products.utils.availability_checker import check_product_availability
-            
-            # Check availability (will skip if recently checked)
-            availability_result = check_product_availability(
-                product=instance,
-                force=False,  # Don't force, respect last check time
-                update_db=True  # Update database with results
-            )
-            
-            logger.info(f"Product {instance.id} availability check: {availability_result['status']}")
-            
+            # Skips products checked recently and checks that are already queued
+            check_queued = enqueue_availability_check(instance)
         except Exception as e:
-            # Don't fail the request if availability check fails
-            logger.error(f"Error checking product {instance.id} availability: {str(e)}")
+            # Don't fail the request if the check cannot be queued
+            check_queued = False
+            logger.error(f"Error queueing availability check for product {instance.id}: {str(e)}")
         
-        # Return product data (serializer will include availability status)
+        # Return product data (serializer includes the last known availability status)
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        data = serializer.data
+        data['availability_check_pending'] = check_queued
+        return Response(data)
     
     def get_queryset(self):
         """Override to add filtering support and deduplication"""
@@ -170,36 +183,14 @@ class ProductViewSet(viewsets.ModelViewSet):
         # Search filtering (weighted, with synonyms and safe fallback)
         search = self.request.query_params.get('search')
         if search:
-            # Build AND-of-ORs filter: all tokens must appear (with synonyms), in any field
-            token_groups = build_token_groups(search)
-            group_clauses = []
-            for group in token_groups:
-                or_clause = models.Q()
-                for token in group:
-                    token_clause = (
-                        models.Q(name__icontains=token) |
-                        models.Q(description__icontains=token) |
-                        models.Q(brand__name__icontains=token)
-                    )
-                    # Avoid category-name matches for very short tokens like 'ac'
-                    if len(token) >= 3:
-                        token_clause |= models.Q(category__name__icontains=token)
-                    or_clause |= token_clause
-                group_clauses.append(or_clause)
-            fallback_q = models.Q()
-            for gc in group_clauses:
-                fallback_q &= gc
+            # Build AND-of-ORs filter: all tokens must appear (with synonyms), in any field.
+            # Served by the pg_trgm indexes; ?fuzzy=true also tolerates typos.
+            fuzzy = fuzzy_requested(self.request.query_params.get('fuzzy'))
+            fallback_q = build_fallback_filter(build_token_groups(search), fuzzy=fuzzy)
             try:
-                expanded = expand_query_synonyms(search)
-                search_query = SearchQuery(' '.join(expanded), search_type='plain')
-                vector = (
-                    SearchVector('name', weight='A') +
-                    SearchVector('brand__name', weight='B') +
-                    SearchVector('category__name', weight='B') +
-                    SearchVector('description', weight='C')
-                )
-                queryset = queryset.annotate(rank=SearchRank(vector, search_query))\
-                                   .filter(models.Q(search_vector=search_query) | fallback_q)\
+                match, rank = search_vector_match(search)
+                queryset = queryset.annotate(rank=rank)\
+                                   .filter(match | fallback_q)\
                                    .order_by('-rank', '-created_at')
             except Exception:
                 queryset = queryset.filter(fallback_q)
@@ -248,36 +239,17 @@ class ProductViewSet(viewsets.ModelViewSet):
         limit = int(request.query_params.get('limit', 20))
         if not q:
             return Response([])
-        expanded = expand_query_synonyms(q)
-        token_groups = build_token_groups(q)
-        fallback_q = models.Q()
-        for group in token_groups:
-            or_clause = models.Q()
-            for token in group:
-                token_clause = (
-                    models.Q(name__icontains=token) |
-                    models.Q(description__icontains=token) |
-                    models.Q(brand__name__icontains=token)
-                )
-                if len(token) >= 3:
-                    token_clause |= models.Q(category__name__icontains=token)
-                or_clause |= token_clause
-            fallback_q &= or_clause
+        fuzzy = fuzzy_requested(request.query_params.get('fuzzy'))
+        fallback_q = build_fallback_filter(build_token_groups(q), fuzzy=fuzzy)
         try:
-            search_query = SearchQuery(' '.join(expanded), search_type='plain')
-            vector = (
-                SearchVector('name', weight='A') +
-                SearchVector('brand__name', weight='B') +
-                SearchVector('category__name', weight='B') +
-                SearchVector('description', weight='C')
-            )
+            match, rank = search_vector_match(q)
             # Annotate with trending score and prioritize high-engagement products
             products = CoreProduct.objects.filter(is_active=True)\
                 .annotate(
-                    rank=SearchRank(vector, search_query),
+                    rank=rank,
                     trending_score=Coalesce(F('view_count'), 0) + (Coalesce(F('wishlist_count'), 0) * 3)
                 )\
-                .filter(models.Q(search_vector=search_query) | fallback_q)\
+                .filter(match | fallback_q)\
                 .annotate(
                     # Boost products with trending_score > 50
                     is_trending=Case(
@@ -374,78 +346,37 @@ class ProductViewSet(viewsets.ModelViewSet):
             # Generate query embedding
             logger.info(f'🤖 Generating embedding for query: "{query}"')
             query_start_time = time.time()
-            query_embedding = model.encode(query, convert_to_numpy=True, show_progress_bar=False)
+            # LRU/TTL cached per normalized query; misses are micro-batched with concurrent requests
+            query_embedding = encode_query(get_query_encoder(model), query)
             encode_time = time.time() - query_start_time
-            logger.info(f'✅ Query embedding generated in {encode_time:.3f}s')
+            logger.info(f'✅ Query embedding ready in {encode_time:.3f}s')
             
             total_start_time = time.time()
             
-            # Get products with embeddings (optimized batch processing)
-            logger.info('📦 Fetching products with embeddings...')
-            products = CoreProduct.objects.filter(
-                is_active=True,
-                search_embedding__isnull=False
-            ).select_related('brand', 'category', 'seller').only(
-                'id', 'name', 'description', 'price', 'original_price', 'main_image_url',
-                'search_embedding', 'brand', 'category', 'seller', 'platform_type',
-                'created_at', 'updated_at'
-            )
-            
-            # Batch process embeddings for speed
-            logger.info('🔍 Processing product embeddings...')
-            product_list = list(products)
-            embeddings_matrix = []
-            valid_products = []
+            # Rank in PostgreSQL (pgvector) or against the in-process embedding matrix
+            start_time = time.time()
+            top_hits, backend, searched = semantic_top_k(query_embedding, limit)
+            similarity_time = time.time() - start_time
+            logger.info(f'✅ Top {len(top_hits)} products ranked via {backend} in {similarity_time:.3f}s')
             
-            for product in product_list:
-                try:
-                    embedding = pickle.loads(product.search_embedding)
-                    embeddings_matrix.append(embedding)
-                    valid_products.append(product)
-                except Exception as e:
-                    logger.debug(f'Failed to load embedding for product {product.id}: {str(e)}')
-                    continue
-            
-            logger.info(f'✅ Loaded {len(valid_products)} product embeddings')
-            
-            # Vectorized similarity calculation (MUCH faster!)
-            if embeddings_matrix:
-                logger.info('🔢 Calculating similarities...')
-                start_time = time.time()
-                
-                embeddings_array = np.array(embeddings_matrix)
-                # Normalize embeddings
-                embeddings_norm = embeddings_array / np.linalg.norm(embeddings_array, axis=1, keepdims=True)
-                query_norm = query_embedding / np.linalg.norm(query_embedding)
-                
-                # Calculate all similarities at once (vectorized)
-                similarities = np.dot(embeddings_norm, query_norm)
-                
-                similarity_time = time.time() - start_time
-                logger.info(f'✅ Similarities calculated in {similarity_time:.3f}s')
-                
-                # Create results
-                results = [
-                    {'product': product, 'similarity': float(sim)}
-                    for product, sim in zip(valid_products, similarities)
-                ]
-                
-                # Sort by similarity (descending)
-                results.sort(key=lambda x: x['similarity'], reverse=True)
-                logger.info(f'📊 Top similarity score: {results[0]["similarity"]:.4f}' if results else 'No results')
-            else:
-                results = []
+            if not top_hits:
                 logger.warning('⚠️ No valid embeddings found')
             
-            # Get top results
-            top_results = results[:limit]
+            # Fetch only the winning products, then restore similarity order
+            products_by_id = CoreProduct.objects.filter(
+                id__in=[product_id for product_id, _ in top_hits],
+                is_active=True
+            ).select_related('brand', 'category', 'seller').in_bulk()
             
             # Serialize
-            logger.info(f'📝 Serializing {len(top_results)} results...')
+            logger.info(f'📝 Serializing {len(top_hits)} results...')
             serialized_results = []
-            for result in top_results:
-                product_data = ProductSerializer(result['product']).data
-                product_data['similarity_score'] = result['similarity']
+            for product_id, similarity in top_hits:
+                product = products_by_id.get(product_id)
+                if product is None:
+                    continue
+                product_data = ProductSerializer(product).data
+                product_data['similarity_score'] = similarity
                 serialized_results.append(product_data)
             
             total_time = time.time() - total_start_time
@@ -454,8 +385,9 @@ class ProductViewSet(viewsets.ModelViewSet):
             return Response({
                 'query': query,
                 'results': serialized_results,
-                'total_found': len(results),
-                'returned': len(serialized_results)
+                'total_found': searched if searched is not None else len(serialized_results),
+                'returned': len(serialized_results),
+                'backend': backend
             })
             
         except Exception as e:
@@ -478,7 +410,7 @@ class ProductViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Query parameter "q" is required'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            # === PART 1: AI Semantic Search (Optimized) ===
+            # === PART 1: AI Semantic Search (whole catalog, candidate ids only) ===
             ai_results = []
             try:
                 # Use the same module-level singleton model
@@ -488,72 +420,36 @@ class ProductViewSet(viewsets.ModelViewSet):
                     logger.warning('AI model not available for hybrid search')
                     raise Exception('AI model not loaded')
                 
-                query_embedding = model.encode(query, convert_to_numpy=True, show_progress_bar=False)
+                query_embedding = encode_query(get_query_encoder(model), query)
                 
-                products_with_embeddings = CoreProduct.objects.filter(
-                    is_active=True,
-                    search_embedding__isnull=False
-                ).select_related('brand', 'category', 'seller').only(
-                    'id', 'name', 'description', 'price', 'original_price', 'main_image_url',
-                    'search_embedding', 'brand', 'category', 'seller', 'platform_type',
-                    'created_at', 'updated_at'
-                )[:1000]  # Limit for performance
-                
-                # Batch vectorized processing
-                product_list = list(products_with_embeddings)
-                embeddings_matrix = []
-                valid_products = []
-                
-                for product in product_list:
-                    try:
-                        embedding = pickle.loads(product.search_embedding)
-                        embeddings_matrix.append(embedding)
-                        valid_products.append(product)
-                    except:
-                        continue
-                
-                if embeddings_matrix:
-                    embeddings_array = np.array(embeddings_matrix)
-                    embeddings_norm = embeddings_array / np.linalg.norm(embeddings_array, axis=1, keepdims=True)
-                    query_norm = query_embedding / np.linalg.norm(query_embedding)
-                    similarities = np.dot(embeddings_norm, query_norm)
-                    
-                    ai_results = [
-                        {'product': product, 'ai_score': float(sim)}
-                        for product, sim in zip(valid_products, similarities)
-                    ]
-                    
-                    # Sort and get top results
-                    ai_results.sort(key=lambda x: x['ai_score'], reverse=True)
-                    ai_results = ai_results[:limit * 2]
+                # Top-k over every embedded product (pgvector or in-process index)
+                ai_hits, _, _ = semantic_top_k(query_embedding, limit * 2)
+                ai_results = [
+                    {'product_id': product_id, 'ai_score': score}
+                    for product_id, score in ai_hits
+                ]
                 
             except Exception as e:
                 logger.warning(f'AI search failed in hybrid mode: {e}')
             
-            # === PART 2: PostgreSQL Full-Text Search ===
+            # === PART 2: PostgreSQL Full-Text Search (candidate ids only) ===
             fts_results = []
             try:
-                expanded = expand_query_synonyms(query)
-                search_query = SearchQuery(' '.join(expanded), search_type='plain')
-                vector = (
-                    SearchVector('name', weight='A') +
-                    SearchVector('brand__name', weight='B') +
-                    SearchVector('category__name', weight='B') +
-                    SearchVector('description', weight='C')
-                )
+                match, rank = search_vector_match(query)
                 
-                fts_products = CoreProduct.objects.filter(
+                fts_hits = CoreProduct.objects.filter(
+                    match,  # GIN index match instead of ranking every row
                     is_active=True
                 ).annotate(
-                    rank=SearchRank(vector, search_query)
+                    rank=rank
                 ).filter(
                     rank__gt=0
-                ).select_related('brand', 'category', 'seller').order_by('-rank')[:limit * 2]
+                ).order_by('-rank').values_list('id', 'rank')[:limit * 2]
                 
-                for product in fts_products:
+                for product_id, rank in fts_hits:
                     fts_results.append({
-                        'product': product,
-                        'fts_score': float(product.rank)
+                        'product_id': product_id,
+                        'fts_score': float(rank)
                     })
                     
             except Exception as e:
@@ -567,10 +463,10 @@ class ProductViewSet(viewsets.ModelViewSet):
             if ai_results:
                 max_ai = max(r['ai_score'] for r in ai_results)
                 for result in ai_results:
-                    product_id = result['product'].id
+                    product_id = result['product_id']
                     normalized_ai = result['ai_score'] / max_ai if max_ai > 0 else 0
                     merged[product_id] = {
-                        'product': result['product'],
+                        'product_id': product_id,
                         'ai_score': normalized_ai,
                         'fts_score': 0,
                         'combined_score': normalized_ai * 0.6
@@ -580,7 +476,7 @@ class ProductViewSet(viewsets.ModelViewSet):
             if fts_results:
                 max_fts = max(r['fts_score'] for r in fts_results)
                 for result in fts_results:
-                    product_id = result['product'].id
+                    product_id = result['product_id']
                     normalized_fts = result['fts_score'] / max_fts if max_fts > 0 else 0
                     
                     if product_id in merged:
@@ -588,7 +484,7 @@ class ProductViewSet(viewsets.ModelViewSet):
                         merged[product_id]['combined_score'] += normalized_fts * 0.4
                     else:
                         merged[product_id] = {
-                            'product': result['product'],
+                            'product_id': product_id,
                             'ai_score': 0,
                             'fts_score': normalized_fts,
                             'combined_score': normalized_fts * 0.4
@@ -597,10 +493,20 @@ class ProductViewSet(viewsets.ModelViewSet):
             # Sort by combined score
             final_results = sorted(merged.values(), key=lambda x: x['combined_score'], reverse=True)[:limit]
             
+            # Load rows for the winning candidates in a single query; semantic candidates can
+            # come from a slightly stale index, so deactivated products are dropped here
+            products_by_id = CoreProduct.objects.filter(
+                id__in=[result['product_id'] for result in final_results],
+                is_active=True
+            ).select_related('brand', 'category', 'seller').in_bulk()
+            
             # Serialize
             serialized_results = []
             for result in final_results:
-                product_data = ProductSerializer(result['product']).data
+                product = products_by_id.get(result['product_id'])
+                if product is None:
+                    continue
+                product_data = ProductSerializer(product).data
                 product_data['ai_score'] = result['ai_score']
                 product_data['fts_score'] = result['fts_score']
                 product_data['combined_score'] = result['combined_score']
@@ -1139,6 +1045,31 @@ def scraping_status(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def ai_search_ready(request):
+    """
+    Readiness probe for AI search warm-up
+    Returns 503 until the model is loaded and the search index is built
+    """
+    from .utils.warmup import warmup_status
+    from .utils.query_cache import get_query_cache
+    from .utils.encoding_service import loaded_query_encoder
+    from .utils.vector_index import loaded_vector_index
+    
+    warmup = warmup_status()
+    index = loaded_vector_index()
+    encoder = loaded_query_encoder()
+    
+    return Response({
+        'ready': warmup['ready'],
+        'warmup': warmup,
+        'vector_index': {'size': index.size, 'version': index.version} if index else None,
+        'query_cache': get_query_cache().stats(),
+        'encoder': encoder.stats() if encoder else None,
+    }, status=status.HTTP_200_OK if warmup['ready'] else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 @cache_page(60 * 60 * 24)  # Cache for 24 hours
 def proxy_image(request, image_url):
     """
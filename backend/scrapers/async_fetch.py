@@ -0,0 +1,119 @@
+"""
+aiohttp fetch engine for the API and BeautifulSoup tiers of UnifiedScraper.
+Pages of a paginated source (Shopify products.json?page=N, ?page=N listings)
+are requested ahead in a small window instead of strictly one after another,
+with a per-host connection limit, and consumed in page order so the first
+empty page stops the run and cancels the requests beyond it.
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # optional; UnifiedScraper falls back to requests
+    aiohttp = None
+
+# parse(status, content_type, body_text) -> parsed page, or None / [] to stop
+PageParser = Callable[[int, str, str], Optional[List[Any]]]
+# (url_for_page(page_number) -> url, max_pages, parse)
+PageRun = Tuple[Callable[[int], str], int, PageParser]
+
+
+def async_available() -> bool:
+    return aiohttp is not None
+
+
+async def _fetch(session, url: str) -> Tuple[int, str, str]:
+    async with session.get(url) as resp:
+        body = await resp.text(errors='replace')
+        return resp.status, resp.headers.get('Content-Type', ''), body
+
+
+async def _run_pages(session, url_for_page: Callable[[int], str], max_pages: int,
+                     parse: PageParser, window: int) -> List[List[Any]]:
+    """Fetch pages 1..max_pages with up to `window` in flight; stop at the first empty page"""
+    pages: List[List[Any]] = []
+    tasks = {}
+    next_page = 1
+
+    def launch():
+        nonlocal next_page
+        while next_page <= max_pages and len(tasks) < window:
+            tasks[next_page] = asyncio.ensure_future(_fetch(session, url_for_page(next_page)))
+            next_page += 1
+
+    try:
+        launch()
+        for page in range(1, max_pages + 1):
+            task = tasks.pop(page)
+            try:
+                status, content_type, body = await task
+                parsed = parse(status, content_type, body)
+            except Exception:
+                parsed = None
+            if not parsed:
+                break
+            pages.append(parsed)
+            launch()
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return pages
+
+
+async def _run_all(runs: Sequence[PageRun], max_per_host: int, timeout: float, headers: dict) -> List[List[List[Any]]]:
+    connector = aiohttp.TCPConnector(limit_per_host=max_per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout, headers=headers) as session:
+        return await asyncio.gather(*(
+            _run_pages(session, url_for_page, max_pages, parse, window=max_per_host)
+            for url_for_page, max_pages, parse in runs
+        ))
+
+
+def _run_coroutine(coro):
+    """asyncio.run, or on a helper thread when called from inside a running loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    outcome = {}
+
+    def runner():
+        try:
+            outcome['value'] = asyncio.run(coro)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=runner, name='async-fetch')
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
+
+
+def fetch_page_runs(runs: Sequence[PageRun], max_per_host: int = 4, timeout: float = 15,
+                    headers: Optional[dict] = None) -> List[List[List[Any]]]:
+    """
+    Run several paginated fetches concurrently over one connection pool.
+
+    Args:
+        runs: (url_for_page, max_pages, parse) per paginated source
+        max_per_host: connections (and pages in flight per run) allowed per host
+        timeout: seconds per request
+        headers: default request headers
+
+    Returns:
+        For each run, the parsed pages in order up to the first empty page.
+    """
+    if aiohttp is None:
+        raise RuntimeError('aiohttp is not installed')
+    if not runs:
+        return []
+    return _run_coroutine(_run_all(runs, max(1, max_per_host), timeout, headers or {}))
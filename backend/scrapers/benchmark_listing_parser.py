@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Listing parser microbenchmark
+Parses saved listing pages with the old path (BeautifulSoup html.parser,
+selectors re-parsed per page) and the compiled lxml path, checks that both
+extract the same products, and prints the timings.
+
+Usage:
+    python benchmark_listing_parser.py --platform sehgalmotors --html saved/sehgalmotors.html
+    python benchmark_listing_parser.py --platform sehgalmotors --fetch --save-dir saved/
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from unified_scraper import UnifiedScraper
+from bs_fallback import parse_products as fallback_parse_products
+from listing_parser import lxml_available
+
+# Fields that differ on every call (uuid, timestamps) are left out of the comparison
+VOLATILE_FIELDS = {'uuid', 'scraped_at'}
+
+
+def _comparable(products):
+    return [{k: v for k, v in product.items() if k not in VOLATILE_FIELDS} for product in products]
+
+
+def _time(fn, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def _with_parser(config, backend: str):
+    settings = dict(config.get('settings', {}), html_parser=backend)
+    return dict(config, settings=settings)
+
+
+def load_pages(scraper: UnifiedScraper, config, args):
+    """Saved pages from --html, or the platform's first category page with --fetch"""
+    pages = []
+    for path in args.html or []:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((path, f.read()))
+    if args.fetch:
+        for category in scraper._discover_categories(config)[:args.categories]:
+            url = scraper._category_url(config, category)
+            resp = scraper._requests.get(url, timeout=20)
+            if resp.status_code != 200:
+                print(f"⚠️ {url}: HTTP {resp.status_code}")
+                continue
+            pages.append((url, resp.text))
+            if args.save_dir:
+                os.makedirs(args.save_dir, exist_ok=True)
+                path = os.path.join(args.save_dir, f"{config['platform_name']}-{category}.html")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(resp.text)
+                print(f"💾 Saved {path}")
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare BeautifulSoup and compiled lxml listing parsing')
+    parser.add_argument('--platform', required=True, help='Config name in configs/')
+    parser.add_argument('--html', nargs='*', help='Saved listing pages')
+    parser.add_argument('--fetch', action='store_true', help='Download category pages instead of / as well as --html')
+    parser.add_argument('--categories', type=int, default=3, help='Categories to fetch with --fetch')
+    parser.add_argument('--save-dir', help='Where to save fetched pages for later runs')
+    parser.add_argument('--repeat', type=int, default=20, help='Parses per page and backend')
+    args = parser.parse_args()
+
+    if not lxml_available():
+        print("❌ lxml / cssselect not installed; nothing to compare")
+        return 1
+
+    scraper = UnifiedScraper(headless=True)
+    scraper.logger.setLevel('WARNING')
+    config = scraper.load_config(args.platform)
+    pages = load_pages(scraper, config, args)
+    if not pages:
+        print("❌ No pages: pass --html files or --fetch")
+        return 1
+
+    print("=" * 80)
+    print(f"⏱️ LISTING PARSER BENCHMARK: {args.platform} ({len(pages)} pages x {args.repeat} runs)")
+    print("=" * 80)
+
+    totals = {'beautifulsoup': 0.0, 'lxml': 0.0}
+    mismatches = 0
+    for name, html in pages:
+        print(f"\n📄 {name} ({len(html) / 1024:.0f} KB)")
+        for label, parse in (
+            ('listing', lambda cfg: scraper._parse_bs_listing_html(cfg, html, name)),
+            ('bs_fallback', lambda cfg: fallback_parse_products(html, cfg)),
+        ):
+            results = {}
+            for backend in ('beautifulsoup', 'lxml'):
+                backend_config = _with_parser(config, backend)
+                products, timings = _time(lambda: parse(backend_config), args.repeat)
+                results[backend] = _comparable(products)
+                median = statistics.median(timings)
+                totals[backend] += median
+                print(f"   {label:<12} {backend:<14} {len(products):>4} products  median {median * 1000:8.2f} ms")
+            same = results['beautifulsoup'] == results['lxml']
+            mismatches += 0 if same else 1
+            print(f"   {label:<12} {'✅ identical output' if same else '❌ outputs differ'}")
+
+    speedup = totals['beautifulsoup'] / totals['lxml'] if totals['lxml'] else 0.0
+    print("\n" + "=" * 80)
+    print(f"BeautifulSoup: {totals['beautifulsoup'] * 1000:.1f} ms | lxml: {totals['lxml'] * 1000:.1f} ms "
+          f"| speedup {speedup:.1f}x | {mismatches} mismatching parses")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
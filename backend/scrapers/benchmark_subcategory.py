@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Subcategory classifier benchmark
+Runs the previous per-product keyword loop and the compiled
+SubcategoryMatcher over a few thousand product names per config, checks that
+every name gets the same subcategory, and prints the timings.
+
+Names are built from each config's own keywords and synonyms mixed with
+filler words, so most of them hit one or more subcategories.
+
+Usage:
+    python benchmark_subcategory.py                      # every config with keywords
+    python benchmark_subcategory.py --platforms sehgalmotors alfatah --names 5000
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+from typing import Dict, List, Optional
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from subcategory_matcher import SubcategoryMatcher, normalize_token
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), 'configs')
+FILLER = ['Pro', 'Original', 'Imported', 'Black', 'Large', 'Set of 2', 'Premium', 'XL', '2024',
+          'for Kids', 'Heavy Duty', 'Pack', 'Deluxe', 'Mini', 'Edition', '(Pakistan)']
+
+
+def legacy_detect(product_name: str, keywords: Dict[str, List[str]], synonyms: Dict[str, List[str]] = None) -> Optional[str]:
+    """The loop UnifiedScraper._detect_subcategory ran for every product before compilation."""
+    if not keywords:
+        return None
+    syn_map = {normalize_token(k): [normalize_token(v) for v in vs] for k, vs in (synonyms or {}).items()}
+    name_norm = normalize_token(product_name)
+    category_scores: Dict[str, int] = {}
+    for subcat, kw_list in keywords.items():
+        score = 0
+        for kw in kw_list:
+            base_kw = normalize_token(kw)
+            forms = set([base_kw] + syn_map.get(base_kw, []))
+            for form in forms:
+                if form and form in name_norm:
+                    score += 1
+                    break
+        if score > 0:
+            category_scores[subcat] = score
+    if category_scores:
+        return max(category_scores.items(), key=lambda x: x[1])[0]
+    return None
+
+
+def make_names(keywords: Dict[str, List[str]], synonyms: Dict[str, List[str]], count: int, rng: random.Random) -> List[str]:
+    vocabulary = [kw for kws in keywords.values() for kw in kws]
+    vocabulary += [v for vs in (synonyms or {}).values() for v in vs]
+    names = []
+    for _ in range(count):
+        words = rng.sample(FILLER, rng.randint(1, 3))
+        words += [rng.choice(vocabulary).title() for _ in range(rng.randint(0, 3))]
+        rng.shuffle(words)
+        if rng.random() < 0.2:
+            words.append(rng.choice(['s', 'es', 'ies', '-', '_']))
+        names.append(' '.join(words))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare legacy and compiled subcategory detection')
+    parser.add_argument('--platforms', nargs='*', help='Config names (default: all with keywords)')
+    parser.add_argument('--names', type=int, default=3000, help='Product names per config')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    platforms = args.platforms or sorted(name[:-5] for name in os.listdir(CONFIG_DIR) if name.endswith('.json'))
+    rng = random.Random(args.seed)
+
+    print("=" * 80)
+    print(f"⏱️ SUBCATEGORY CLASSIFIER BENCHMARK ({args.names} names per config)")
+    print("=" * 80)
+
+    legacy_total = compiled_total = compile_total = 0.0
+    mismatches = 0
+    for platform in platforms:
+        with open(os.path.join(CONFIG_DIR, f'{platform}.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        keywords, synonyms = config.get('keywords', {}), config.get('synonyms', {})
+        if not keywords:
+            continue
+        names = make_names(keywords, synonyms, args.names, rng)
+
+        start = time.perf_counter()
+        expected = [legacy_detect(name, keywords, synonyms) for name in names]
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = SubcategoryMatcher(keywords, synonyms)
+        compile_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = [matcher.detect(name) for name in names]
+        compiled_seconds = time.perf_counter() - start
+
+        diff = sum(1 for a, b in zip(expected, actual) if a != b)
+        mismatches += diff
+        legacy_total += legacy_seconds
+        compiled_total += compiled_seconds
+        compile_total += compile_seconds
+        matched = sum(1 for subcat in actual if subcat)
+        print(f"{'✅' if not diff else '❌'} {platform:<24} {matched:>5}/{len(names)} matched  "
+              f"legacy {legacy_seconds * 1000:7.1f} ms  compiled {compiled_seconds * 1000:6.1f} ms "
+              f"(+{compile_seconds * 1000:.2f} ms build)  {diff} mismatches")
+
+    speedup = legacy_total / (compiled_total + compile_total) if compiled_total else 0.0
+    print("\n" + "=" * 80)
+    print(f"Legacy: {legacy_total:.2f}s | Compiled: {compiled_total:.2f}s + {compile_total * 1000:.1f} ms build "
+          f"| speedup {speedup:.1f}x | {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,15 @@
 """
-BeautifulSoup fallback parser for product listing pages.
+Static HTML fallback parser for product listing pages.
 Used when Selenium is slow, times out, or returns 0 containers.
+Selectors run through listing_parser (compiled lxml, BeautifulSoup fallback).
 """
 
 from typing import Dict, List, Any
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+try:
+    from .listing_parser import compile_listing_parser
+except Exception:
+    from listing_parser import compile_listing_parser
 
 
 def _derive_name_from_url(href: str) -> str:
@@ -32,11 +36,13 @@ def parse_products(html: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
     if not html:
         return products
 
-    soup = BeautifulSoup(html, 'html.parser')
     selectors = config.get('selectors', {})
     container_sel = selectors.get('product_container') or ''
+    fields = {'anchors': 'a[href]'}
+    fields.update({key: selectors[key] for key in ('title', 'url', 'price', 'image', 'brand') if selectors.get(key)})
+    prefer_lxml = config.get('settings', {}).get('html_parser', 'lxml') != 'beautifulsoup'
 
-    containers = soup.select(container_sel) if container_sel else []
+    containers = list(compile_listing_parser(container_sel, fields, prefer_lxml).items(html)) if container_sel else []
     if not containers:
         return products
 
@@ -52,24 +58,17 @@ def parse_products(html: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
 
             # Title
             name_val = ''
-            title_sel = selectors.get('title')
-            if title_sel:
-                tnode = el.select_one(title_sel)
-                name_val = (tnode.get_text(strip=True) if tnode else '')
+            if 'title' in fields:
+                name_val = el.text('title')
 
             # URL
             url_val = ''
-            url_sel = selectors.get('url')
-            if url_sel:
-                unode = el.select_one(url_sel)
-                if unode and unode.has_attr('href'):
-                    url_val = unode['href']
+            if 'url' in fields:
+                url_val = el.attr('url', 'href')
             if not url_val:
                 # heuristics: choose deepest anchor
-                anchors = el.select('a[href]')
                 candidates = []
-                for a in anchors:
-                    href = a.get('href', '')
+                for href in el.attrs('anchors', 'href'):
                     if not href:
                         continue
                     if href.startswith('javascript:') or href.endswith('#'):
@@ -89,29 +88,19 @@ def parse_products(html: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
 
             # Price
             price_val = ''
-            price_sel = selectors.get('price')
-            if price_sel:
-                pnode = el.select_one(price_sel)
-                price_val = (pnode.get_text(strip=True) if pnode else '')
+            if 'price' in fields:
+                price_val = el.text('price')
             product['price'] = price_val
             product['currency'] = config.get('currency', 'PKR')
 
             # Image
             image_val = ''
-            img_sel = selectors.get('image')
-            if img_sel:
-                inode = el.select_one(img_sel)
-                if inode:
-                    image_val = inode.get('src') or inode.get('data-src') or ''
+            if 'image' in fields:
+                image_val = el.attr('image', 'src', 'data-src')
             product['image_url'] = urljoin(config.get('base_url', ''), image_val) if image_val else ''
 
             # Brand (optional)
-            brand_sel = selectors.get('brand')
-            if brand_sel:
-                bnode = el.select_one(brand_sel)
-                product['brand_name'] = (bnode.get_text(strip=True) if bnode else '')
-            else:
-                product['brand_name'] = ''
+            product['brand_name'] = el.text('brand') if 'brand' in fields else ''
 
             # Defaults needed by importer
             product.update({
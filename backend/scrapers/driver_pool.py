@@ -0,0 +1,429 @@
+"""
+Pooled headless Chrome drivers for the Selenium tier.
+Chrome cold starts (2-5s each) dominate short category scrapes, so a pool
+keeps N browsers warm across categories and platforms:
+    - cookies, cache and the last origin's storage are cleared between leases
+    - a driver is recycled after max_pages pages or above max_memory_mb RSS
+    - stats() reports leases, waits, resets and recycles
+    - settings.block_resources blocks images, media, fonts and ad domains via CDP
+
+StubDriver implements the small WebDriver surface the pool touches, so the
+pool can be exercised without Chrome (see tests/test_driver_pool.py)
+"""
+
+import os
+import json
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def build_chrome_options(headless: bool = True):
+    """Chrome options shared by pooled and one-off drivers."""
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+
+    if headless:
+        chrome_options.add_argument('--headless')
+
+    # Performance optimizations
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-popup-blocking')
+    chrome_options.add_argument('--disable-notifications')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+    chrome_options.add_argument('--disable-background-timer-throttling')
+    chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+    chrome_options.add_argument('--disable-renderer-backgrounding')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-component-extensions-with-background-pages')
+    # NOTE: Do not disable JS/CSS/images for SPA sites like Telemart
+
+    # User agent
+    chrome_options.add_argument(f'--user-agent={USER_AGENT}')
+    # CDP Network events for page_transfer_kb
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def create_chrome_driver(headless: bool = True):
+    """Start Chrome: local ChromeDriver first, then webdriver-manager, then Selenium Manager."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = build_chrome_options(headless)
+    try:
+        driver_path = os.path.join(os.path.dirname(__file__), 'chromedriver.exe' if os.name == 'nt' else 'chromedriver')
+        if os.path.exists(driver_path):
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        else:
+            raise FileNotFoundError("Local ChromeDriver not found")
+    except Exception:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            service = Service(ChromeDriverManager().install())
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except ImportError:
+            driver = webdriver.Chrome(options=chrome_options)
+
+    driver.set_page_load_timeout(30)
+    return driver
+
+
+def _extension_patterns(*extensions: str) -> List[str]:
+    # '*.gif' and '*.gif?*' only, so hosts like gifts.pk are not caught
+    return [pattern for ext in extensions for pattern in (f'*.{ext}', f'*.{ext}?*')]
+
+
+# Network.setBlockedURLs patterns ('*' wildcard) per settings.block_resources category
+BLOCKED_RESOURCE_PATTERNS = {
+    'images': _extension_patterns('jpg', 'jpeg', 'png', 'gif', 'webp', 'avif', 'svg', 'ico'),
+    'media': _extension_patterns('mp4', 'webm', 'm3u8', 'mp3', 'ogg', 'mov'),
+    'fonts': _extension_patterns('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'ads': [
+        '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*',
+        '*google-analytics.com*', '*googletagmanager.com*', '*adservice.google.*',
+        '*connect.facebook.net*', '*facebook.com/tr*', '*analytics.tiktok.com*',
+        '*hotjar.com*', '*clarity.ms*', '*snap.licdn.com*', '*taboola.com*', '*outbrain.com*',
+    ],
+}
+
+
+def blocked_url_patterns(settings: Dict[str, Any]) -> List[str]:
+    """
+    URL patterns to block for a scraper config's settings block.
+
+    settings.block_resources: true (every category), a list of categories from
+    BLOCKED_RESOURCE_PATTERNS, or false/missing. settings.blocked_url_patterns
+    adds site-specific patterns.
+    """
+    block = settings.get('block_resources', False)
+    if block is True:
+        categories = list(BLOCKED_RESOURCE_PATTERNS)
+    elif isinstance(block, str):
+        categories = [block]
+    elif isinstance(block, (list, tuple)):
+        categories = list(block)
+    else:
+        categories = []
+
+    patterns: List[str] = []
+    for category in categories:
+        patterns.extend(BLOCKED_RESOURCE_PATTERNS.get(category, []))
+    patterns.extend(settings.get('blocked_url_patterns', []) if block else [])
+    return patterns
+
+
+def apply_resource_blocking(driver, patterns: List[str]) -> bool:
+    """
+    Block matching requests in this browser through CDP (an empty list unblocks).
+    Image URLs stay in the DOM (src / data-src); only the downloads are skipped.
+
+    Returns:
+        True if the driver supports CDP and the block list was applied.
+    """
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        return True
+    except Exception as e:
+        logger.warning(f"Resource blocking unavailable: {e}")
+        return False
+
+
+def page_transfer_kb(driver) -> Optional[float]:
+    """
+    Bytes the browser received since the previous call, in KB.
+
+    Sums encodedDataLength of the CDP Network.loadingFinished events in Chrome's
+    performance log, which get_log drains, so successive calls measure one
+    listing page each, cross-origin and XHR/SPA traffic included. Resource
+    Timing's transferSize is not used: it reads 0 for cross-origin resources
+    without Timing-Allow-Origin and its buffer stops at 250 entries.
+
+    Returns:
+        None if the driver has no performance log (see build_chrome_options).
+    """
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return None
+    total = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        if message.get('method') == 'Network.loadingFinished':
+            total += message.get('params', {}).get('encodedDataLength', 0)
+    return round(total / 1024, 1)
+
+
+def driver_memory_mb(driver) -> Optional[float]:
+    """Resident memory of the driver's browser process tree (psutil), else the JS heap, else None."""
+    try:
+        import psutil
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except Exception:
+        pass
+    try:
+        heap = driver.execute_script('return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null')
+        return heap / (1024 * 1024) if heap else None
+    except Exception:
+        return None
+
+
+def reset_driver(driver):
+    """Clear cookies, cache and storage so the next lease starts clean."""
+    try:
+        # Storage is per origin: clear the one this driver last visited
+        driver.execute_script('try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}')
+    except Exception:
+        pass
+    if hasattr(driver, 'execute_cdp_cmd'):
+        # All origins' cookies and the HTTP cache in one go
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        # The next lease may be for a config that does not block resources
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+    else:
+        driver.delete_all_cookies()
+    driver.get('about:blank')
+    # Start the next lease's transfer count from zero
+    page_transfer_kb(driver)
+
+
+class _PooledDriver:
+    __slots__ = ('driver', 'pages', 'leases', 'created_at')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.leases = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """Thread-safe pool of warm WebDriver instances."""
+
+    def __init__(self, size: int = 2, headless: bool = True, max_pages: int = 200,
+                 max_memory_mb: Optional[float] = 1500, factory: Optional[Callable[[], Any]] = None,
+                 warm: bool = True):
+        """
+        Args:
+            size: most drivers alive at once (and leases outstanding)
+            headless: passed to create_chrome_driver when no factory is given
+            max_pages: recycle a driver after this many pages
+            max_memory_mb: recycle a driver above this RSS (None disables the check)
+            factory: callable returning a new driver (e.g. StubDriver for tests)
+            warm: start all drivers now instead of on first use
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.factory = factory or (lambda: create_chrome_driver(headless))
+
+        self._idle: "queue.LifoQueue[_PooledDriver]" = queue.LifoQueue()
+        self._entries: Dict[int, _PooledDriver] = {}
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'created': 0, 'leases': 0, 'resets': 0, 'reset_failures': 0,
+            'recycled_pages': 0, 'recycled_memory': 0, 'recycled_broken': 0,
+            'wait_seconds': 0.0, 'startup_seconds': 0.0,
+        }
+
+        if warm:
+            for _ in range(self.size):
+                self._idle.put(self._create())
+
+    def _create(self) -> _PooledDriver:
+        start = time.time()
+        entry = _PooledDriver(self.factory())
+        with self._lock:
+            self._entries[id(entry.driver)] = entry
+            self._stats['created'] += 1
+            self._stats['startup_seconds'] += time.time() - start
+        logger.info(f"🟢 Driver pool: started driver {self._stats['created']} in {time.time() - start:.1f}s")
+        return entry
+
+    def _destroy(self, entry: _PooledDriver, reason: str):
+        with self._lock:
+            self._entries.pop(id(entry.driver), None)
+            self._stats[f'recycled_{reason}'] += 1
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+        logger.info(f"♻️ Driver pool: recycled driver after {entry.pages} pages ({reason})")
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a driver; blocks while all `size` drivers are leased."""
+        if self._closed:
+            raise RuntimeError('Driver pool is closed')
+        start = time.time()
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f'No driver free within {timeout}s')
+        try:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                entry = self._create()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            entry.leases += 1
+            self._stats['leases'] += 1
+            self._stats['wait_seconds'] += time.time() - start
+        return entry.driver
+
+    def release(self, driver, pages: int = 0, broken: bool = False):
+        """
+        Return a driver to the pool.
+
+        Args:
+            driver: driver from acquire()
+            pages: pages loaded during this lease (for the recycle budget)
+            broken: the driver misbehaved; quit it instead of reusing it
+        """
+        with self._lock:
+            entry = self._entries.get(id(driver))
+        if entry is None:
+            raise ValueError('Driver does not belong to this pool')
+        try:
+            entry.pages += pages
+            if broken or self._closed:
+                self._destroy(entry, 'broken')
+                return
+            if self.max_pages and entry.pages >= self.max_pages:
+                self._destroy(entry, 'pages')
+                return
+            if self.max_memory_mb:
+                memory = driver_memory_mb(driver)
+                if memory is not None and memory > self.max_memory_mb:
+                    self._destroy(entry, 'memory')
+                    return
+            try:
+                reset_driver(driver)
+                with self._lock:
+                    self._stats['resets'] += 1
+            except Exception as e:
+                logger.warning(f"Driver pool: reset failed ({e}); recycling driver")
+                with self._lock:
+                    self._stats['reset_failures'] += 1
+                self._destroy(entry, 'broken')
+                return
+            self._idle.put(entry)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """with pool.lease() as driver: ...  (a raised exception recycles the driver)"""
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, broken=True)
+            raise
+        else:
+            self.release(driver)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            alive = len(self._entries)
+            pages = sum(entry.pages for entry in self._entries.values())
+        idle = self._idle.qsize()
+        stats.update({
+            'size': self.size,
+            'alive': alive,
+            'idle': idle,
+            'in_use': alive - idle,
+            'pages_on_live_drivers': pages,
+            'avg_wait_seconds': round(stats['wait_seconds'] / stats['leases'], 3) if stats['leases'] else 0.0,
+            'wait_seconds': round(stats['wait_seconds'], 3),
+            'startup_seconds': round(stats['startup_seconds'], 3),
+        })
+        return stats
+
+    def close(self):
+        """Quit every idle driver; leased drivers are quit when released."""
+        self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._entries.pop(id(entry.driver), None)
+            try:
+                entry.driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StubDriver:
+    """In-memory stand-in for a Chrome WebDriver (no browser, no network)."""
+
+    def __init__(self, page_source: str = '<html><body></body></html>', memory_mb: float = 100.0):
+        self.current_url = 'about:blank'
+        self.page_source = page_source
+        self.memory_mb = memory_mb
+        self.cookies = []
+        self.local_storage = {}
+        self.visited = []
+        self.performance_log = []
+        self.quit_called = False
+
+    def get(self, url: str):
+        self.current_url = url
+        self.visited.append(url)
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def add_cookie(self, cookie: dict):
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def execute_script(self, script: str, *args):
+        if 'localStorage.clear' in script:
+            self.local_storage.clear()
+            return None
+        if 'performance.memory' in script:
+            return self.memory_mb * 1024 * 1024
+        return None
+
+    def get_log(self, log_type: str):
+        entries, self.performance_log = self.performance_log, []
+        return entries
+
+    def quit(self):
+        self.quit_called = True
+
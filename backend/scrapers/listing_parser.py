@@ -0,0 +1,240 @@
+"""
+Compiled listing-page parser for the static HTML tier and bs_fallback.
+A config's container and field selectors are compiled once (cssselect ->
+lxml XPath) and reused for every page of every category, and pages are parsed
+with lxml instead of BeautifulSoup's pure-Python html.parser.
+
+BeautifulSoup stays the fallback: when lxml / cssselect is not installed, a
+selector uses syntax cssselect cannot translate (soupsieve extensions such as
+:-soup-contains), or lxml cannot parse the page.
+
+Usage:
+    parser = compile_listing_parser('.product-card', {'name': 'h3', 'image': 'img'})
+    for item in parser.items(html):
+        item.text('name'), item.attr('image', 'src', 'data-src')
+"""
+
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import HTMLTranslator, SelectorError, parse as parse_css
+    from cssselect.parser import CombinedSelector
+except ImportError:  # optional; BeautifulSoup is used instead
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+_SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def lxml_available() -> bool:
+    return etree is not None
+
+
+def _lxml_text(node) -> str:
+    """Equivalent of BeautifulSoup get_text(strip=True): stripped strings joined with ''."""
+    parts = []
+
+    def walk(el):
+        if el.text:
+            parts.append(el.text.strip())
+        for child in el:
+            # Comments, processing instructions and script/style/template bodies add no text
+            if isinstance(child.tag, str) and child.tag not in _SKIP_TEXT_TAGS:
+                walk(child)
+            if child.tail:
+                parts.append(child.tail.strip())
+
+    if not isinstance(node.tag, str) or node.tag in _SKIP_TEXT_TAGS:
+        return ''
+    walk(node)
+    return ''.join(parts)
+
+
+class _LxmlPage:
+    """
+    One parsed page. Fields with combinators are matched once from the document
+    root and grouped by container, since bs4 select() lets the leading part of
+    a selector match the container or its ancestors (".grid h3" inside ".card").
+    """
+    __slots__ = ('root', 'containers', '_grouped')
+
+    def __init__(self, root, containers: list):
+        self.root = root
+        self.containers = containers
+        self._grouped = {}
+
+    def matches(self, parser: 'LxmlListingParser', field: str, element) -> list:
+        if field not in parser.contextual:
+            return parser.fields[field](element)
+        grouped = self._grouped.get(field)
+        if grouped is None:
+            grouped = self._grouped[field] = self._group(parser.fields[field])
+        return grouped.get(element, [])
+
+    def _group(self, xpath) -> dict:
+        # The containers list keeps their proxies alive, so iterancestors() yields the same objects
+        containers = set(self.containers)
+        grouped = defaultdict(list)
+        for node in xpath(self.root):  # document order, like select()
+            for ancestor in node.iterancestors():
+                if ancestor in containers:
+                    grouped[ancestor].append(node)
+        return grouped
+
+
+class _LxmlItem:
+    __slots__ = ('element', 'parser', 'page')
+
+    def __init__(self, element, parser: 'LxmlListingParser', page: _LxmlPage):
+        self.element = element
+        self.parser = parser
+        self.page = page
+
+    def _first(self, field: str):
+        matches = self.page.matches(self.parser, field, self.element)
+        return matches[0] if matches else None
+
+    def has(self, field: str) -> bool:
+        return self._first(field) is not None
+
+    def text(self, field: str) -> str:
+        node = self._first(field)
+        return _lxml_text(node) if node is not None else ''
+
+    def attr(self, field: str, *names: str) -> str:
+        """First non-empty attribute of the field's first match, in `names` order."""
+        node = self._first(field)
+        if node is None:
+            return ''
+        for name in names:
+            value = node.get(name)
+            if value:
+                return value
+        return ''
+
+    def attrs(self, field: str, name: str) -> List[str]:
+        """Attribute `name` of every match (missing attributes are skipped)."""
+        matches = self.page.matches(self.parser, field, self.element)
+        return [node.get(name) for node in matches if node.get(name) is not None]
+
+
+class _SoupItem:
+    __slots__ = ('element', 'parser')
+
+    def __init__(self, element, parser: 'SoupListingParser'):
+        self.element = element
+        self.parser = parser
+
+    def _first(self, field: str):
+        return self.element.select_one(self.parser.fields[field])
+
+    def has(self, field: str) -> bool:
+        return self._first(field) is not None
+
+    def text(self, field: str) -> str:
+        node = self._first(field)
+        return node.get_text(strip=True) if node else ''
+
+    def attr(self, field: str, *names: str) -> str:
+        node = self._first(field)
+        if not node:
+            return ''
+        for name in names:
+            value = node.get(name)
+            if value:
+                return value
+        return ''
+
+    def attrs(self, field: str, name: str) -> List[str]:
+        return [node.get(name) for node in self.element.select(self.parser.fields[field]) if node.has_attr(name)]
+
+
+class SoupListingParser:
+    """BeautifulSoup (html.parser) backend with the same interface."""
+
+    backend = 'beautifulsoup'
+
+    def __init__(self, container: str, fields: Dict[str, str]):
+        self.container = container
+        self.fields = dict(fields)
+
+    def items(self, html: str) -> Iterator[_SoupItem]:
+        if not html or not self.container:
+            return iter(())
+        soup = BeautifulSoup(html, 'html.parser')
+        return (_SoupItem(el, self) for el in soup.select(self.container))
+
+
+class LxmlListingParser:
+    """lxml backend: selectors are XPath objects compiled at construction."""
+
+    backend = 'lxml'
+
+    def __init__(self, container: str, fields: Dict[str, str]):
+        translator = HTMLTranslator()
+        self.container = container
+        # Containers may match anywhere. Fields match below their container, as with bs4
+        # select(); one with a combinator is run from the document root (see _LxmlPage).
+        self._container_xpath = etree.XPath(translator.css_to_xpath(container, prefix='descendant-or-self::'))
+        self.contextual = frozenset(
+            name for name, css in fields.items()
+            if any(isinstance(selector.parsed_tree, CombinedSelector) for selector in parse_css(css))
+        )
+        self.fields = {
+            name: etree.XPath(translator.css_to_xpath(
+                css, prefix='descendant-or-self::' if name in self.contextual else 'descendant::'
+            ))
+            for name, css in fields.items()
+        }
+        self._fallback = SoupListingParser(container, fields)
+
+    def items(self, html: str):
+        if not html or not self.container:
+            return iter(())
+        try:
+            # Bytes, so pages that declare their encoding still parse
+            root = lxml.html.fromstring(html.encode('utf-8'), parser=_html_parser())
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"lxml could not parse page ({e}); using BeautifulSoup")
+            return self._fallback.items(html)
+        containers = self._container_xpath(root)
+        page = _LxmlPage(root.getroottree().getroot(), containers)
+        return (_LxmlItem(el, self, page) for el in containers)
+
+
+@lru_cache(maxsize=1)
+def _html_parser():
+    return lxml.html.HTMLParser(encoding='utf-8')
+
+
+@lru_cache(maxsize=256)
+def _compile(container: str, fields: Tuple[Tuple[str, str], ...], prefer_lxml: bool):
+    if prefer_lxml and lxml_available():
+        try:
+            return LxmlListingParser(container, dict(fields))
+        except (SelectorError, etree.XPathError) as e:
+            logger.info(f"Selector not supported by lxml ({e}); using BeautifulSoup for {container!r}")
+    return SoupListingParser(container, dict(fields))
+
+
+def compile_listing_parser(container: str, fields: Dict[str, str], prefer_lxml: bool = True):
+    """
+    Parser for one config's listing selectors, compiled once and cached.
+
+    Args:
+        container: CSS selector for product containers
+        fields: {field name: CSS selector relative to a container}
+        prefer_lxml: False forces the BeautifulSoup backend (e.g. settings.html_parser = "beautifulsoup")
+
+    Returns:
+        LxmlListingParser or SoupListingParser; both yield items with has(), text(), attr() and attrs().
+    """
+    return _compile(container or '', tuple(sorted(fields.items())), prefer_lxml)
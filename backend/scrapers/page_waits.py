@@ -0,0 +1,191 @@
+"""
+Condition-based waits for the Selenium tier of UnifiedScraper.
+The fixed sleeps (page_load_delay, scroll_pause, load-more and next-page
+pauses) become ceilings: each wait polls a readiness condition and returns as
+soon as it holds, so fast pages proceed immediately and slow pages wait no
+longer than before. Every wait is recorded with the time it saved.
+
+Conditions (settings.waits.<phase>.until):
+    count_stable   product container count > 0 and unchanged for `settle` seconds
+    network_idle   document complete and no new resource requests for `settle` seconds
+    height_stable  document height unchanged for `settle` seconds
+    selector       `selector` (default: the product container) is present
+    sleep          the old fixed sleep
+
+Example config:
+    "settings": {
+        "page_load_delay": 15,
+        "waits": {"page_load": {"until": "selector", "selector": ".product-card", "timeout": 20}}
+    }
+"""
+
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL = 0.25
+DEFAULT_SETTLE = 0.75
+
+# Condition used for each phase when the config does not name one
+DEFAULT_CONDITIONS = {
+    'page_load': 'count_stable',
+    'containers': 'count_stable',
+    'scroll': 'height_stable',
+    'lazy_images': 'network_idle',
+    'load_more': 'count_stable',
+    'next_page': 'count_stable',
+}
+
+_RESOURCE_COUNT_JS = (
+    "return [document.readyState, "
+    "(window.performance && performance.getEntriesByType) ? performance.getEntriesByType('resource').length : 0]"
+)
+_HEIGHT_JS = "return document.body ? document.body.scrollHeight : 0"
+
+
+def _wait_until(probe: Callable[[], Any], timeout: float, settle: float, poll: float,
+                ready: Callable[[Any], bool] = bool) -> bool:
+    """
+    Poll `probe` until its value is ready and unchanged for `settle` seconds.
+
+    Returns:
+        True if the condition held before `timeout`, False on the ceiling.
+    """
+    deadline = time.monotonic() + timeout
+    last = object()
+    stable_since = None
+    while True:
+        now = time.monotonic()
+        try:
+            value = probe()
+        except Exception:
+            value = None
+        if ready(value) and settle <= 0:
+            return True
+        if value != last or not ready(value):
+            last = value
+            stable_since = now if ready(value) else None
+        elif stable_since is not None and now - stable_since >= settle:
+            return True
+        if now >= deadline:
+            return False
+        time.sleep(min(poll, max(0.0, deadline - now)))
+
+
+class PageWaiter:
+    """Config-driven waits for one platform, with per-page timing records."""
+
+    def __init__(self, driver, config: Dict[str, Any]):
+        settings = config.get('settings', {})
+        self.driver = driver
+        self.container_selector = config.get('selectors', {}).get('product_container', '')
+        self.fixed = bool(settings.get('fixed_waits', False))
+        self.phases: Dict[str, Dict[str, Any]] = settings.get('waits', {}) or {}
+        self.records: List[Dict[str, Any]] = []
+        self.page = 1  # listing page the next records belong to
+        self.transfer_kb: Dict[int, float] = {}
+
+    def _phase(self, phase: str) -> Dict[str, Any]:
+        spec = self.phases.get(phase, {})
+        if isinstance(spec, str):
+            spec = {'until': spec}
+        return spec
+
+    def _count(self, selector: str) -> int:
+        from selenium.webdriver.common.by import By
+        return len(self.driver.find_elements(By.CSS_SELECTOR, selector))
+
+    def _network_state(self):
+        return tuple(self.driver.execute_script(_RESOURCE_COUNT_JS))
+
+    def _left(self, url: str, element) -> bool:
+        """True once the browser navigated away from `url` or `element` was replaced."""
+        if element is not None:
+            try:
+                element.is_enabled()
+            except Exception:  # StaleElementReferenceException: the listing was re-rendered
+                return True
+        return self.driver.current_url != url
+
+    def wait(self, phase: str, ceiling: float, min_count: int = 1, leaving: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        Wait for the phase's condition, at most its timeout (default: `ceiling`).
+
+        Args:
+            phase: page_load, containers, scroll, lazy_images, load_more or next_page
+            ceiling: the fixed sleep this wait replaces, in seconds
+            min_count: container count that counts as ready (count_stable)
+            leaving: (url, element) captured before a click; not ready until the page changed
+
+        Returns:
+            The timing record: condition, budget, waited, saved and whether it was met.
+        """
+        spec = self._phase(phase)
+        condition = 'sleep' if self.fixed else spec.get('until', DEFAULT_CONDITIONS.get(phase, 'sleep'))
+        timeout = float(spec.get('timeout', ceiling))
+        settle = float(spec.get('settle', DEFAULT_SETTLE))
+        poll = float(spec.get('poll', DEFAULT_POLL))
+        selector = spec.get('selector') or self.container_selector
+
+        start = time.monotonic()
+        met = True
+        if timeout <= 0:
+            pass
+        elif condition in ('count_stable', 'selector') and selector:
+            left = leaving is None
+
+            def count():
+                nonlocal left
+                left = left or self._left(*leaving)
+                return self._count(selector) if left else 0
+
+            met = _wait_until(count, timeout, settle if condition == 'count_stable' else 0.0, poll,
+                              ready=lambda n: bool(n) and n >= min_count)
+        elif condition == 'network_idle':
+            met = _wait_until(self._network_state, timeout, settle, poll,
+                              ready=lambda s: bool(s) and s[0] == 'complete')
+        elif condition == 'height_stable':
+            met = _wait_until(lambda: self.driver.execute_script(_HEIGHT_JS), timeout, settle, poll)
+        else:
+            condition = 'sleep'
+            time.sleep(timeout)
+        waited = time.monotonic() - start
+
+        record = {
+            'phase': phase,
+            'page': self.page,
+            'condition': condition,
+            'met': met,
+            'budget': round(ceiling, 3),
+            'waited': round(waited, 3),
+            'saved': round(max(0.0, ceiling - waited), 3),
+        }
+        self.records.append(record)
+        if not met:
+            logger.debug(f"Wait for {phase} ({condition}) hit its {timeout:.1f}s ceiling")
+        return record
+
+    def record_transfer(self, kb: Optional[float]):
+        """Bytes (KB) the current listing page downloaded, for the page summary."""
+        if kb is not None:
+            self.transfer_kb[self.page] = kb
+
+    def page_summary(self) -> List[Dict[str, Any]]:
+        """Waited and saved seconds (and transferred KB when recorded) per listing page."""
+        pages: Dict[Any, Dict[str, Any]] = {}
+        for record in self.records:
+            stats = pages.setdefault(record['page'], {'page': record['page'], 'waits': 0, 'waited': 0.0,
+                                                      'budget': 0.0, 'saved': 0.0, 'ceilings_hit': 0})
+            stats['waits'] += 1
+            stats['waited'] += record['waited']
+            stats['budget'] += record['budget']
+            stats['saved'] += record['saved']
+            stats['ceilings_hit'] += 0 if record['met'] else 1
+        return [dict(s, waited=round(s['waited'], 3), budget=round(s['budget'], 3), saved=round(s['saved'], 3),
+                     transfer_kb=self.transfer_kb.get(s['page']))
+                for s in pages.values()]
+
+    def total_saved(self) -> float:
+        return round(sum(record['saved'] for record in self.records), 3)
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Parallel multi-platform scraper
+Scrapes many platforms and categories at once around UnifiedScraper:
+    - API / BeautifulSoup tiers run on a thread pool (I/O bound, no browser)
+    - Selenium work runs on a process pool, one warm Chrome per process
+    - a global worker budget and per-host limits keep every site polite
+    - progress is printed as jobs finish, followed by a combined metrics report
+
+Usage:
+    python parallel_scraper.py                         # every config in configs/
+    python parallel_scraper.py --platforms alfatah sehgalmotors --max-pages 3
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import threading
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing.util import Finalize
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from unified_scraper import UnifiedScraper
+from driver_pool import DriverPool
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), 'configs')
+
+
+@dataclass
+class ScrapeJob:
+    """One platform category to scrape"""
+    platform: str
+    category: str
+    host: str
+    needs_selenium: bool = False
+    tier: str = ''
+    products: List[Dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+    wait_saved_seconds: float = 0.0
+    error: str = ''
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+_thread_state = threading.local()
+
+
+def _thread_scraper() -> UnifiedScraper:
+    """One scraper (and requests session) per pool thread"""
+    scraper = getattr(_thread_state, 'scraper', None)
+    if scraper is None:
+        scraper = UnifiedScraper(headless=True)
+        _thread_state.scraper = scraper
+    return scraper
+
+
+def run_fast_job(platform: str, category: str, max_pages: int) -> Dict[str, Any]:
+    """API / BeautifulSoup tiers; tier is None when the category needs Selenium"""
+    start = time.time()
+    scraper = _thread_scraper()
+    config = scraper.load_config(platform)
+    products, tier = scraper._scrape_category_fast(config, category, max_pages)
+    return {'products': products, 'tier': tier, 'seconds': time.time() - start}
+
+
+_process_scraper: Optional[UnifiedScraper] = None
+
+
+def _init_selenium_worker(headless: bool, recycle_pages: int):
+    """Process pool initializer: one warm pooled browser for the process lifetime"""
+    global _process_scraper
+    pool = DriverPool(size=1, headless=headless, max_pages=recycle_pages, warm=False)
+    _process_scraper = UnifiedScraper(headless=headless, driver_pool=pool)
+    # Pool workers end with os._exit, which skips atexit; multiprocessing still runs its finalizers
+    Finalize(None, pool.close, exitpriority=10)
+
+
+def run_selenium_job(platform: str, category: str, max_pages: int) -> Dict[str, Any]:
+    """Selenium tier inside a pool process; the browser is reset, not restarted, between jobs"""
+    start = time.time()
+    config = _process_scraper.load_config(platform)
+    try:
+        products = _process_scraper._scrape_category_selenium(config, category, max_pages)
+    except Exception:
+        # A broken browser must not poison the next job in this process
+        _process_scraper.release_driver(broken=True)
+        raise
+    _process_scraper.release_driver()
+    return {
+        'products': products,
+        'tier': 'selenium',
+        'seconds': time.time() - start,
+        'wait_saved_seconds': sum(page['saved'] for page in _process_scraper.page_waits),
+        'driver_pool': _process_scraper.driver_pool.stats(),
+        'worker_pid': os.getpid(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator
+# ---------------------------------------------------------------------------
+
+class ParallelScraper:
+    """Dispatch scrape jobs across thread and process pools with per-host politeness"""
+
+    def __init__(self, workers: int = 8, selenium_workers: int = 2, per_host: int = 1,
+                 host_delay: float = 1.0, max_pages: int = 2, headless: bool = True,
+                 recycle_pages: int = 200):
+        """
+        Args:
+            workers: global budget of jobs in flight (threads + processes)
+            selenium_workers: browser processes (each counts against workers)
+            per_host: jobs allowed in flight against one host
+            host_delay: minimum seconds between job starts on one host
+            max_pages: pages per category
+            headless: run Chrome headless
+            recycle_pages: restart a worker's browser after this many pages
+        """
+        self.workers = max(1, workers)
+        self.selenium_workers = max(0, min(selenium_workers, self.workers))
+        self.per_host = max(1, per_host)
+        self.host_delay = max(0.0, host_delay)
+        self.max_pages = max_pages
+        self.headless = headless
+        self.recycle_pages = recycle_pages
+        self.driver_pool_stats: Dict[int, Dict[str, Any]] = {}
+
+        self._host_active: Dict[str, int] = defaultdict(int)
+        self._host_next_start: Dict[str, float] = defaultdict(float)
+        self._selenium_active = 0
+
+    @staticmethod
+    def available_platforms() -> List[str]:
+        return sorted(name[:-5] for name in os.listdir(CONFIG_DIR) if name.endswith('.json'))
+
+    def build_jobs(self, platforms: List[str]) -> List[ScrapeJob]:
+        """One job per (platform, category) from the JSON configs"""
+        loader = UnifiedScraper(headless=True)
+        jobs = []
+        for platform in platforms:
+            try:
+                config = loader.load_config(platform)
+            except Exception as e:
+                print(f"❌ {platform}: could not load config ({e})")
+                continue
+            host = urlparse(config.get('base_url', '')).netloc.lower() or platform
+            force_selenium = bool(config.get('settings', {}).get('force_selenium', False))
+            for category in loader._discover_categories(config):
+                jobs.append(ScrapeJob(platform, category, host, needs_selenium=force_selenium))
+        return jobs
+
+    def _can_start(self, job: ScrapeJob, running: int, now: float) -> bool:
+        if running >= self.workers:
+            return False
+        if self._host_active[job.host] >= self.per_host or now < self._host_next_start[job.host]:
+            return False
+        if job.needs_selenium and self._selenium_active >= self.selenium_workers:
+            return False
+        return True
+
+    def run(self, jobs: List[ScrapeJob]) -> List[ScrapeJob]:
+        """Run every job; returns them with products, tier, timing and errors filled in"""
+        pending = deque(jobs)
+        running = {}
+        finished: List[ScrapeJob] = []
+        total = len(jobs)
+
+        threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scrape-fast')
+        # Browser processes are only started once a Selenium job is submitted
+        processes = ProcessPoolExecutor(
+            max_workers=self.selenium_workers,
+            initializer=_init_selenium_worker,
+            initargs=(self.headless, self.recycle_pages),
+        ) if self.selenium_workers else None
+
+        try:
+            while pending or running:
+                # Submit everything the budget and host limits allow, keeping queue order
+                now = time.monotonic()
+                for _ in range(len(pending)):
+                    job = pending.popleft()
+                    if job.needs_selenium and processes is None:
+                        job.error = 'needs Selenium but --selenium-workers is 0'
+                        finished.append(job)
+                        continue
+                    if not self._can_start(job, len(running), now):
+                        pending.append(job)
+                        continue
+                    if job.needs_selenium:
+                        future = processes.submit(run_selenium_job, job.platform, job.category, self.max_pages)
+                        self._selenium_active += 1
+                    else:
+                        future = threads.submit(run_fast_job, job.platform, job.category, self.max_pages)
+                    self._host_active[job.host] += 1
+                    self._host_next_start[job.host] = now + self.host_delay
+                    running[future] = job
+
+                if not running:
+                    time.sleep(0.1)  # only host delays are holding jobs back
+                    continue
+
+                done, _ = wait(list(running), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    self._host_active[job.host] -= 1
+                    if job.needs_selenium:
+                        self._selenium_active -= 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        job.error = str(e)[:200]
+                        finished.append(job)
+                        self._print_progress(job, len(finished), total)
+                        continue
+
+                    job.seconds += result['seconds']
+                    job.wait_saved_seconds += result.get('wait_saved_seconds', 0.0)
+                    if 'driver_pool' in result:
+                        self.driver_pool_stats[result['worker_pid']] = result['driver_pool']
+                    if result['tier'] is None:
+                        # API and static HTML came back empty: queue for a browser
+                        job.needs_selenium = True
+                        pending.appendleft(job)
+                        continue
+                    job.tier = result['tier']
+                    job.products = result['products']
+                    finished.append(job)
+                    self._print_progress(job, len(finished), total)
+        finally:
+            threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+
+        return finished
+
+    @staticmethod
+    def _print_progress(job: ScrapeJob, done: int, total: int):
+        if job.error:
+            print(f"[{done}/{total}] ❌ {job.platform}/{job.category}: {job.error}")
+        else:
+            print(f"[{done}/{total}] ✅ {job.platform}/{job.category}: "
+                  f"{len(job.products)} products via {job.tier} in {job.seconds:.1f}s")
+
+
+def build_report(jobs: List[ScrapeJob], elapsed: float) -> Dict[str, Any]:
+    """Combined metrics: totals, per tier and per platform"""
+    per_platform: Dict[str, Dict[str, Any]] = {}
+    per_tier: Dict[str, Dict[str, Any]] = defaultdict(lambda: {'jobs': 0, 'products': 0, 'seconds': 0.0})
+    for job in jobs:
+        stats = per_platform.setdefault(job.platform, {
+            'jobs': 0, 'failed': 0, 'products': 0, 'seconds': 0.0, 'tiers': defaultdict(int),
+        })
+        stats['jobs'] += 1
+        stats['seconds'] += job.seconds
+        if job.error:
+            stats['failed'] += 1
+            continue
+        stats['products'] += len(job.products)
+        stats['tiers'][job.tier] += 1
+        per_tier[job.tier]['jobs'] += 1
+        per_tier[job.tier]['products'] += len(job.products)
+        per_tier[job.tier]['seconds'] += job.seconds
+
+    total_products = sum(len(job.products) for job in jobs)
+    work_seconds = sum(job.seconds for job in jobs)
+    return {
+        'jobs': len(jobs),
+        'failed': sum(1 for job in jobs if job.error),
+        'products': total_products,
+        'elapsed_seconds': round(elapsed, 2),
+        'work_seconds': round(work_seconds, 2),
+        'speedup': round(work_seconds / elapsed, 2) if elapsed else 0.0,
+        'products_per_minute': round(total_products / elapsed * 60, 1) if elapsed else 0.0,
+        'wait_saved_seconds': round(sum(job.wait_saved_seconds for job in jobs), 2),
+        'tiers': {tier: dict(stats, seconds=round(stats['seconds'], 2)) for tier, stats in per_tier.items()},
+        'platforms': {
+            name: dict(stats, seconds=round(stats['seconds'], 2), tiers=dict(stats['tiers']))
+            for name, stats in sorted(per_platform.items())
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print("📊 PARALLEL SCRAPE REPORT")
+    print("=" * 80)
+    print(f"Jobs: {report['jobs']} ({report['failed']} failed)")
+    print(f"Products: {report['products']}")
+    print(f"Wall clock: {report['elapsed_seconds']}s | Work time: {report['work_seconds']}s "
+          f"| Speedup: {report['speedup']}x | {report['products_per_minute']} products/min")
+    if report.get('wait_saved_seconds'):
+        print(f"Browser waits ended early, saving {report['wait_saved_seconds']}s of fixed sleeps")
+
+    print("\n📈 By tier:")
+    for tier, stats in sorted(report['tiers'].items()):
+        print(f"   {tier:<14} {stats['jobs']:>4} jobs {stats['products']:>7} products {stats['seconds']:>9.1f}s")
+
+    print("\n🏪 By platform:")
+    for name, stats in report['platforms'].items():
+        tiers = ', '.join(f"{tier}:{count}" for tier, count in sorted(stats['tiers'].items())) or '-'
+        failed = f" ❌ {stats['failed']} failed" if stats['failed'] else ''
+        print(f"   {name:<24} {stats['products']:>6} products {stats['seconds']:>8.1f}s [{tiers}]{failed}")
+
+    pools = report.get('driver_pools') or {}
+    if pools:
+        print("\n🧭 Browser pools:")
+        for pid, stats in pools.items():
+            print(f"   worker {pid}: {stats['leases']} leases, {stats['created']} browsers started "
+                  f"({stats['startup_seconds']}s), {stats['resets']} resets, "
+                  f"{stats['recycled_pages'] + stats['recycled_memory'] + stats['recycled_broken']} recycled")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape many platforms concurrently')
+    parser.add_argument('--platforms', nargs='+', help='Config names (default: every config in configs/)')
+    parser.add_argument('--max-pages', type=int, default=2, help='Maximum pages per category')
+    parser.add_argument('--workers', type=int, default=8, help='Global budget of concurrent jobs')
+    parser.add_argument('--selenium-workers', type=int, default=2, help='Chrome processes (part of --workers)')
+    parser.add_argument('--per-host', type=int, default=1, help='Concurrent jobs per host')
+    parser.add_argument('--host-delay', type=float, default=1.0, help='Seconds between job starts on one host')
+    parser.add_argument('--recycle-pages', type=int, default=200, help='Restart a browser after this many pages')
+    parser.add_argument('--show-browser', action='store_true', help='Run Chrome with a visible window')
+    parser.add_argument('--output', help='Combined CSV filename')
+    parser.add_argument('--metrics-json', help='Also write the metrics report to this JSON file')
+    args = parser.parse_args()
+
+    platforms = args.platforms or ParallelScraper.available_platforms()
+
+    print("🚀 BuyVaultHub Parallel Scraper")
+    print("=" * 50)
+    print(f"📋 Platforms: {len(platforms)}")
+    print(f"👷 Workers: {args.workers} (Selenium processes: {args.selenium_workers}) | per host: {args.per_host}")
+    print(f"📄 Max pages per category: {args.max_pages}")
+    print()
+
+    orchestrator = ParallelScraper(
+        workers=args.workers,
+        selenium_workers=args.selenium_workers,
+        per_host=args.per_host,
+        host_delay=args.host_delay,
+        max_pages=args.max_pages,
+        headless=not args.show_browser,
+        recycle_pages=args.recycle_pages,
+    )
+    jobs = orchestrator.build_jobs(platforms)
+    print(f"🗂️  Jobs queued: {len(jobs)}\n")
+
+    start_time = time.time()
+    finished = orchestrator.run(jobs)
+    report = build_report(finished, time.time() - start_time)
+    report['driver_pools'] = {str(pid): stats for pid, stats in orchestrator.driver_pool_stats.items()}
+    print_report(report)
+
+    if args.metrics_json:
+        with open(args.metrics_json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Metrics written to: {args.metrics_json}")
+
+    products = [product for job in finished for product in job.products]
+    if not products:
+        print("⚠️ No products scraped")
+        return 1
+
+    exporter = UnifiedScraper(headless=True)
+    exporter.scraped_data = products
+    csv_file = exporter.export_to_csv(args.output)
+    print(f"💾 Exported {len(products)} products to: {csv_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
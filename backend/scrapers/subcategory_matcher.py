@@ -0,0 +1,119 @@
+"""
+Compiled subcategory classifier for UnifiedScraper._detect_subcategory.
+A config's keywords and synonyms are normalized once into an Aho-Corasick
+automaton over every keyword form, so each product name is scanned in a
+single pass instead of re-normalizing every keyword for every product.
+
+Matching rules are unchanged: the whole name and each keyword go through
+normalize_token, a keyword hits when any of its forms (itself plus its
+synonyms) occurs anywhere in the name, the subcategory with the most keyword
+hits wins, and ties go to the subcategory listed first in the config.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def normalize_token(t: str) -> str:
+    t = t.lower().strip()
+    t = t.replace('-', ' ').replace('_', ' ')
+    # naive plural handling
+    if t.endswith('ies'):
+        t = t[:-3] + 'y'
+    elif t.endswith('es') and len(t) > 3:
+        t = t[:-2]
+    elif t.endswith('s') and len(t) > 2:
+        t = t[:-1]
+    return t
+
+
+class SubcategoryMatcher:
+    """Keyword -> subcategory classifier compiled from one config."""
+
+    def __init__(self, keywords: Dict[str, List[str]], synonyms: Optional[Dict[str, List[str]]] = None):
+        self.keywords = keywords
+        self.synonyms = synonyms
+        self.subcategories = list(keywords or {})
+
+        syn_map = {normalize_token(k): [normalize_token(v) for v in vs] for k, vs in (synonyms or {}).items()}
+
+        # Every keyword entry (duplicates included, they score twice as before) and the forms that hit it
+        form_ids: Dict[str, int] = {}
+        self._form_entries: List[List[int]] = []   # form id -> keyword entry ids
+        self._entry_subcat: List[int] = []          # keyword entry id -> subcategory index
+        for subcat_index, subcat in enumerate(self.subcategories):
+            for kw in keywords[subcat]:
+                entry = len(self._entry_subcat)
+                self._entry_subcat.append(subcat_index)
+                base_kw = normalize_token(kw)
+                for form in set([base_kw] + syn_map.get(base_kw, [])):
+                    if not form:
+                        continue
+                    if form not in form_ids:
+                        form_ids[form] = len(self._form_entries)
+                        self._form_entries.append([])
+                    self._form_entries[form_ids[form]].append(entry)
+
+        self._build_automaton(form_ids)
+
+    def _build_automaton(self, form_ids: Dict[str, int]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for form, form_id in form_ids.items():
+            state = 0
+            for ch in form:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(form_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                candidate = goto[f].get(ch, 0)
+                fail[nxt] = candidate if candidate != nxt else 0
+                # A state also reports every form that ends at its failure state
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def _forms_in(self, text: str) -> set:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+    def detect(self, product_name: str) -> Optional[str]:
+        """Best-scoring subcategory for a product name, or None when no keyword matches."""
+        if not self.subcategories:
+            return None
+        forms = self._forms_in(normalize_token(product_name))
+        if not forms:
+            return None
+
+        hit_entries = set()
+        for form_id in forms:
+            hit_entries.update(self._form_entries[form_id])
+        scores = [0] * len(self.subcategories)
+        for entry in hit_entries:
+            scores[self._entry_subcat[entry]] += 1
+
+        best = max(scores)
+        return self.subcategories[scores.index(best)] if best > 0 else None
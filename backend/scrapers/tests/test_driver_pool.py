@@ -0,0 +1,131 @@
+"""
+DriverPool with stub drivers: lease, reset, recycle and stats
+Run from backend/: python -m unittest discover -s scrapers/tests
+"""
+
+import json
+import os
+import sys
+import threading
+import unittest
+
+# scrapers/ is run as a directory of scripts, not imported as a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from driver_pool import DriverPool, StubDriver, page_transfer_kb
+
+
+def network_event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class DriverPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.stubs = []
+
+    def make_stub(self):
+        stub = StubDriver()
+        self.stubs.append(stub)
+        return stub
+
+    def pool(self, **options):
+        options.setdefault('size', 2)
+        return DriverPool(factory=self.make_stub, **options)
+
+    def test_lease_reuses_warm_drivers(self):
+        with self.pool(size=2) as pool:
+            for _ in range(5):
+                with pool.lease() as driver:
+                    driver.get('https://example.com/')
+            stats = pool.stats()
+        self.assertEqual(len(self.stubs), 2)
+        self.assertEqual(stats['created'], 2)
+        self.assertEqual(stats['leases'], 5)
+        self.assertEqual(stats['resets'], 5)
+
+    def test_release_clears_cookies_and_storage(self):
+        with self.pool(size=1) as pool:
+            with pool.lease() as driver:
+                driver.get('https://example.com/')
+                driver.add_cookie({'name': 'session', 'value': 'x'})
+                driver.local_storage['cart'] = '1'
+            with pool.lease() as driver:
+                self.assertEqual(driver.cookies, [])
+                self.assertEqual(driver.local_storage, {})
+                self.assertEqual(driver.current_url, 'about:blank')
+
+    def test_recycles_after_max_pages(self):
+        with self.pool(size=1, max_pages=5) as pool:
+            first = pool.acquire()
+            pool.release(first, pages=5)
+            second = pool.acquire()
+            pool.release(second)
+            stats = pool.stats()
+        self.assertIsNot(first, second)
+        self.assertTrue(first.quit_called)
+        self.assertEqual(stats['recycled_pages'], 1)
+
+    def test_recycles_above_max_memory(self):
+        with self.pool(size=1, max_memory_mb=500) as pool:
+            heavy = pool.acquire()
+            heavy.memory_mb = 900
+            pool.release(heavy)
+            self.assertIsNot(pool.acquire(), heavy)
+            self.assertEqual(pool.stats()['recycled_memory'], 1)
+
+    def test_exception_in_lease_recycles_driver(self):
+        with self.pool(size=1) as pool:
+            with self.assertRaises(RuntimeError):
+                with pool.lease() as driver:
+                    raise RuntimeError('page crashed')
+            self.assertTrue(driver.quit_called)
+            self.assertEqual(pool.stats()['recycled_broken'], 1)
+
+    def test_concurrent_leases_never_exceed_size(self):
+        with self.pool(size=2, max_pages=5) as pool:
+            def work():
+                for _ in range(4):
+                    driver = pool.acquire()
+                    self.assertLessEqual(pool.stats()['in_use'], 2)
+                    pool.release(driver, pages=2)
+
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats = pool.stats()
+        self.assertEqual(stats['leases'], 16)
+        self.assertLessEqual(stats['alive'], 2)
+        # A driver is recycled on its 3rd lease (6 pages); the live ones hold at most 2 each
+        self.assertGreaterEqual(stats['recycled_pages'], 4)
+
+    def test_close_quits_idle_drivers(self):
+        pool = self.pool(size=2)
+        pool.close()
+        self.assertTrue(all(stub.quit_called for stub in self.stubs))
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+
+class PageTransferTests(unittest.TestCase):
+    def test_counts_finished_loads_since_previous_call(self):
+        driver = StubDriver()
+        driver.performance_log = [
+            network_event('Network.responseReceived', requestId='1'),
+            network_event('Network.loadingFinished', requestId='1', encodedDataLength=2048),
+            network_event('Network.loadingFinished', requestId='2', encodedDataLength=1024),
+            network_event('Network.loadingFailed', requestId='3'),
+        ]
+        self.assertEqual(page_transfer_kb(driver), 3.0)
+        self.assertEqual(page_transfer_kb(driver), 0.0)
+
+    def test_none_without_performance_log(self):
+        self.assertIsNone(page_transfer_kb(object()))
+
+    def test_reset_drops_previous_lease_traffic(self):
+        with DriverPool(size=1, factory=StubDriver) as pool:
+            with pool.lease() as driver:
+                driver.performance_log.append(network_event('Network.loadingFinished', encodedDataLength=4096))
+            with pool.lease() as driver:
+                self.assertEqual(page_transfer_kb(driver), 0.0)
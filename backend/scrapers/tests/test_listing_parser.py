@@ -0,0 +1,176 @@
+"""
+LxmlListingParser against SoupListingParser (bs4 select()) on every config's selectors
+Run from backend/: python -m unittest discover -s scrapers/tests
+"""
+
+import glob
+import itertools
+import json
+import os
+import sys
+import unittest
+
+# scrapers/ is run as a directory of scripts, not imported as a package
+SCRAPERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPERS_DIR)
+
+from bs4 import BeautifulSoup
+
+from listing_parser import LxmlListingParser, SoupListingParser, lxml_available
+
+if lxml_available():
+    import lxml.html
+    from cssselect import HTMLTranslator, parse as parse_css
+    from cssselect.parser import Attrib, Class, CombinedSelector, Element, Hash
+
+VOID_TAGS = {'img', 'input', 'br', 'hr', 'meta', 'link', 'source'}
+# Selector keys compiled by UnifiedScraper._listing_parser and bs_fallback.parse_products
+LISTING_KEYS = (
+    'product_name', 'product_url', 'product_price', 'product_image', 'product_description',
+    'product_availability', 'title', 'url', 'price', 'image', 'brand',
+)
+ATTRIBUTES = ('src', 'data-src', 'href')
+
+
+def _compound(tree):
+    """(tag, {attribute: value}) of an element matching one compound selector (pseudo-classes ignored)"""
+    tag, attrs, classes = 'div', {}, []
+    while tree is not None and not isinstance(tree, Element):
+        if isinstance(tree, Class):
+            classes.append(tree.class_name)
+        elif isinstance(tree, Hash):
+            attrs['id'] = tree.id
+        elif isinstance(tree, Attrib):
+            value = getattr(tree.value, 'value', tree.value)
+            attrs[tree.attrib] = value if value else 'x'
+        tree = getattr(tree, 'selector', None)
+    if tree is not None and tree.element:
+        tag = tree.element
+    if classes:
+        attrs['class'] = ' '.join(classes + [attrs['class']] if 'class' in attrs else classes)
+    return tag, attrs
+
+
+def _chain(tree):
+    """Compounds of a selector from its left end, each with the combinator that follows it"""
+    if isinstance(tree, CombinedSelector):
+        left = _chain(tree.selector)
+        left[-1] = (left[-1][0], tree.combinator)
+        return left + _chain(tree.subselector)
+    return [(_compound(tree), None)]
+
+
+class _Html:
+    """Numbered elements, so every match has its own text and attributes"""
+
+    def __init__(self):
+        self.counter = itertools.count(1)
+
+    def element(self, compound, inner=''):
+        tag, attrs = compound
+        n = next(self.counter)
+        values = dict({name: f'{name}-{n}' for name in ATTRIBUTES}, **attrs)
+        rendered = ' '.join(f'{name}="{value}"' for name, value in values.items())
+        if tag in VOID_TAGS:
+            return f'<{tag} {rendered}>'
+        return f'<{tag} {rendered}>text {n}{inner}</{tag}>'
+
+    def chain(self, chain, inner=''):
+        """The compounds nested (descendant / child) or side by side (sibling combinators)"""
+        html = self.element(chain[-1][0], inner)
+        for compound, combinator in reversed(chain[:-1]):
+            html = self.element(compound) + html if combinator in ('+', '~') else self.element(compound, html)
+        return html
+
+
+def _shape(html):
+    """Tag structure of a snippet as bs4's html.parser and lxml see it"""
+    soup = [(el.name, len(list(el.parents))) for el in BeautifulSoup(html, 'html.parser').find_all(True)]
+    body = lxml.html.fromstring(f'<html><body>{html}</body></html>').find('body')
+    tree = [(el.tag, sum(1 for _ in el.iterancestors()) - 1) for el in body.iterdescendants() if isinstance(el.tag, str)]
+    return soup, tree
+
+
+def listing_page(container, fields):
+    """
+    Page with each container alternative holding, for every field alternative:
+    the whole field selector, only its last compound, and that compound with
+    the rest of the selector wrapped around the container.
+    """
+    html = _Html()
+    snippets = []
+    for container_selector in parse_css(container):
+        container_chain = _chain(container_selector.parsed_tree)
+        for css in fields.values():
+            for field_selector in parse_css(css):
+                chain = _chain(field_selector.parsed_tree)
+                last = [(chain[-1][0], None)]
+                snippets.append(html.chain(container_chain, html.chain(chain)))
+                snippets.append(html.chain(container_chain, html.chain(last)))
+                if len(chain) > 1:
+                    snippets.append(html.chain(chain[:-1], html.chain(container_chain, html.chain(last))))
+    # Markup that html.parser and lxml build differently (e.g. a block inside <p>) is not a selector question
+    snippets = [snippet for snippet in snippets if _shape(snippet)[0] == _shape(snippet)[1]]
+    return f"<html><body>{''.join(snippets)}</body></html>"
+
+
+def extract(parser, html, fields):
+    return [
+        {
+            name: (item.has(name), item.text(name), item.attr(name, *ATTRIBUTES), item.attrs(name, 'src'))
+            for name in fields
+        }
+        for item in parser.items(html)
+    ]
+
+
+def config_selectors():
+    """(platform, container, {field: selector}) for every config, fields cssselect and bs4 both accept"""
+    translator = HTMLTranslator()
+    for path in sorted(glob.glob(os.path.join(SCRAPERS_DIR, 'configs', '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            selectors = json.load(f).get('selectors', {})
+        container = selectors.get('product_container')
+        if not container:
+            continue
+        fields = {}
+        for name in LISTING_KEYS:
+            css = selectors.get(name)
+            if not css or not isinstance(css, str):
+                continue
+            try:
+                translator.css_to_xpath(css)
+                BeautifulSoup('', 'html.parser').select(css)
+            except Exception:
+                continue  # such a config is parsed with BeautifulSoup alone
+            fields[name] = css
+        yield os.path.basename(path)[:-5], container, fields
+
+
+@unittest.skipUnless(lxml_available(), 'lxml / cssselect not installed')
+class ListingParserParityTests(unittest.TestCase):
+    def assertSameItems(self, container, fields, html):
+        expected = extract(SoupListingParser(container, fields), html, fields)
+        self.assertEqual(extract(LxmlListingParser(container, fields), html, fields), expected)
+        return expected
+
+    def test_selector_may_start_above_the_container(self):
+        html = '<div class="grid"><div class="card"><h3>A</h3></div></div>'
+        items = self.assertSameItems('.card', {'title': '.grid h3', 'self': '.card'}, html)
+        self.assertEqual(items[0]['title'][1], 'A')
+        self.assertFalse(items[0]['self'][0])  # select() never matches the container itself
+
+    def test_matches_stay_with_their_container(self):
+        html = '<a class="link"><img src="1.jpg"></a><a class="link"><img src="2.jpg"></a>'
+        items = self.assertSameItems('.link', {'image': '.link img'}, html)
+        self.assertEqual([item['image'][3] for item in items], [['1.jpg'], ['2.jpg']])
+
+    def test_every_config(self):
+        for platform, container, fields in config_selectors():
+            with self.subTest(platform=platform):
+                html = listing_page(container, fields)
+                self.assertTrue(self.assertSameItems(container, fields, html), f'{platform}: page has no containers')
+
+
+if __name__ == '__main__':
+    unittest.main()
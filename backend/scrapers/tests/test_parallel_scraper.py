@@ -0,0 +1,45 @@
+"""
+ParallelScraper Selenium workers close their driver pool when the process pool shuts down
+Run from backend/: python -m unittest discover -s scrapers/tests
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+# scrapers/ is run as a directory of scripts, not imported as a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parallel_scraper
+from driver_pool import DriverPool
+
+
+def record_close(pool):
+    """DriverPool.close stand-in: leaves a file named after the closing process"""
+    open(os.path.join(os.environ['POOL_CLOSE_DIR'], str(os.getpid())), 'w').close()
+
+
+@unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'needs fork so workers inherit the stub')
+class SeleniumWorkerTests(unittest.TestCase):
+    def test_worker_closes_its_pool_on_shutdown(self):
+        closed = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, closed)
+        with mock.patch.dict(os.environ, {'POOL_CLOSE_DIR': closed}), mock.patch.object(DriverPool, 'close', record_close):
+            executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=parallel_scraper._init_selenium_worker,
+                initargs=(True, 10),
+            )
+            worker_pid = executor.submit(os.getpid).result()
+            executor.shutdown(wait=True)
+        self.assertEqual(os.listdir(closed), [str(worker_pid)])
+
+
+if __name__ == '__main__':
+    unittest.main()
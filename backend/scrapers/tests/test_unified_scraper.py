@@ -0,0 +1,84 @@
+"""
+UnifiedScraper subcategory detection (one compiled matcher per config) and listing pagination
+Run from backend/: python -m unittest discover -s scrapers/tests
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# scrapers/ is run as a directory of scripts, not imported as a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import unified_scraper
+from subcategory_matcher import SubcategoryMatcher
+
+
+class SubcategoryDetectionTests(unittest.TestCase):
+    def setUp(self):
+        self.scraper = unified_scraper.UnifiedScraper(headless=True)
+        self.build = mock.patch.object(unified_scraper, 'SubcategoryMatcher', wraps=SubcategoryMatcher).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_config_without_synonyms_builds_one_matcher(self):
+        config = self.scraper.load_config('telemart')
+        self.assertFalse(config.get('synonyms'))
+        for _ in range(1000):
+            self.scraper._detect_subcategory('Samsung Galaxy A15 mobile phone', config)
+        self.assertEqual(self.build.call_count, 1)
+        self.assertEqual(len(self.scraper._subcategory_matchers), 1)
+
+    def test_reloaded_config_replaces_its_matcher(self):
+        for _ in range(3):
+            config = self.scraper.load_config('telemart')
+            self.scraper._detect_subcategory('Dell laptop', config)
+        self.assertEqual(self.build.call_count, 3)
+        self.assertEqual(len(self.scraper._subcategory_matchers), 1)
+
+    def test_same_result_as_a_fresh_matcher(self):
+        config = self.scraper.load_config('telemart')
+        names = ['Samsung Galaxy A15 mobile phone', 'Dell Inspiron laptop', 'Haier washing machine', 'unrelated']
+        fresh = SubcategoryMatcher(config['keywords'], config.get('synonyms'))
+        self.assertEqual([self.scraper._detect_subcategory(name, config) for name in names],
+                         [fresh.detect(name) for name in names])
+
+
+class ListingPaginationTests(unittest.TestCase):
+    config = {
+        'base_url': 'https://shop.pk',
+        'pagination': {'page_param': 'page'},
+        'settings': {'async_fetch': False},
+    }
+
+    def setUp(self):
+        self.scraper = unified_scraper.UnifiedScraper(headless=True)
+        self.get = mock.patch.object(self.scraper._requests, 'get', return_value=mock.Mock(status_code=200, text='')).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def listing(self, pages):
+        """Parse the n-th request as pages[n - 1], the last page again after that"""
+        def parse(*_):
+            return list(pages[min(self.get.call_count, len(pages)) - 1])
+
+        with mock.patch.object(self.scraper, '_parse_bs_listing_html', side_effect=parse):
+            return self.scraper._try_bs_listing(self.config, 'https://shop.pk/c/phones', max_pages=5)
+
+    def test_site_ignoring_the_page_parameter(self):
+        page = [{'product_url': 'https://shop.pk/p/1'}, {'product_url': 'https://shop.pk/p/2'}]
+        products = self.listing([page])
+        self.assertEqual([p['product_url'] for p in products], ['https://shop.pk/p/1', 'https://shop.pk/p/2'])
+        self.assertEqual(self.get.call_count, 2)
+
+    def test_overlapping_pages_keep_only_new_products(self):
+        products = self.listing([
+            [{'product_url': 'https://shop.pk/p/1'}, {'product_url': 'https://shop.pk/p/2'}],
+            [{'product_url': 'https://shop.pk/p/2'}, {'product_url': 'https://shop.pk/p/3'}],
+            [],
+        ])
+        self.assertEqual([p['product_url'] for p in products], [f'https://shop.pk/p/{n}' for n in (1, 2, 3)])
+        self.assertEqual(self.get.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,17 +11,13 @@ import csv
 import logging
 import uuid
 from typing import Dict, List, Any, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl, urlunparse
 from datetime import datetime
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
 import requests
 try:
     from .bs_fallback import parse_products as bs_parse_products  # when run as package module
@@ -30,6 +26,30 @@ except Exception:
         from bs_fallback import parse_products as bs_parse_products  # when run as script
     except Exception:
         bs_parse_products = None
+try:
+    from .driver_pool import create_chrome_driver, blocked_url_patterns, apply_resource_blocking, page_transfer_kb
+except Exception:
+    from driver_pool import create_chrome_driver, blocked_url_patterns, apply_resource_blocking, page_transfer_kb
+try:
+    from .listing_parser import compile_listing_parser
+except Exception:
+    from listing_parser import compile_listing_parser
+try:
+    from .subcategory_matcher import SubcategoryMatcher
+except Exception:
+    from subcategory_matcher import SubcategoryMatcher
+try:
+    from .page_waits import PageWaiter
+except Exception:
+    from page_waits import PageWaiter
+try:
+    from .async_fetch import async_available, fetch_page_runs
+except Exception:
+    try:
+        from async_fetch import async_available, fetch_page_runs
+    except Exception:
+        async_available = lambda: False
+        fetch_page_runs = None
 
 
 class UnifiedScraper:
@@ -38,10 +58,20 @@ class UnifiedScraper:
     Loads platform configs from JSON files and scrapes efficiently
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, driver_pool=None):
+        """
+        Args:
+            headless: run Chrome without a window
+            driver_pool: optional DriverPool to borrow warm browsers from instead of starting one
+        """
         self.headless = headless
+        self.driver_pool = driver_pool
         self.driver = None
         self.wait = None
+        self._driver_pages = 0
+        self.waiter = None
+        self.page_waits: List[Dict[str, Any]] = []
+        self._subcategory_matchers: Dict[str, SubcategoryMatcher] = {}  # platform_name -> matcher
         self.scraped_data = []
         self.logger = self._setup_logger()
         self._requests = requests.Session()
@@ -97,7 +127,7 @@ class UnifiedScraper:
 
         # categorization
         normalized['main_category'] = normalized.get('main_category') or config.get('main_category', 'Electronics')
-        subcat = normalized.get('subcategory') or self._detect_subcategory(normalized.get('product_name', ''), config.get('keywords', {}), config.get('synonyms', {})) or config.get('subcategory', '')
+        subcat = normalized.get('subcategory') or self._detect_subcategory(normalized.get('product_name', ''), config) or config.get('subcategory', '')
         normalized['subcategory'] = subcat
         normalized['sub_category'] = subcat
 
@@ -137,44 +167,11 @@ class UnifiedScraper:
     def _setup_driver(self):
         """Setup Chrome driver with optimized options. Lazily called only when Selenium is needed."""
         try:
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            
-            # Performance optimizations
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-popup-blocking')
-            chrome_options.add_argument('--disable-notifications')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-            chrome_options.add_argument('--disable-background-timer-throttling')
-            chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-            chrome_options.add_argument('--disable-renderer-backgrounding')
-            chrome_options.add_argument('--disable-background-networking')
-            chrome_options.add_argument('--disable-component-extensions-with-background-pages')
-            # NOTE: Do not disable JS/CSS/images for SPA sites like Telemart
-            
-            # User agent
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-            
-            # Try local ChromeDriver first, then webdriver-manager
-            try:
-                driver_path = os.path.join(os.path.dirname(__file__), 'chromedriver.exe' if os.name == 'nt' else 'chromedriver')
-                if os.path.exists(driver_path):
-                    self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
-                else:
-                    raise FileNotFoundError("Local ChromeDriver not found")
-            except Exception:
-                try:
-                    from webdriver_manager.chrome import ChromeDriverManager
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                except ImportError:
-                    self.driver = webdriver.Chrome(options=chrome_options)
+            if self.driver_pool is not None:
+                self.driver = self.driver_pool.acquire()
+            else:
+                self.driver = create_chrome_driver(self.headless)
+            self._driver_pages = 0
             
             self.driver.set_page_load_timeout(30)
             self.wait = WebDriverWait(self.driver, 10)
@@ -183,6 +180,17 @@ class UnifiedScraper:
         except Exception as e:
             self.logger.error(f"Failed to setup Chrome driver: {e}")
             raise
+
+    def release_driver(self, broken: bool = False):
+        """Return the driver to its pool (reset for reuse) or quit it."""
+        if not self.driver:
+            return
+        driver, self.driver, self.wait, self.waiter = self.driver, None, None, None
+        if self.driver_pool is not None:
+            self.driver_pool.release(driver, pages=self._driver_pages, broken=broken)
+        else:
+            driver.quit()
+        self._driver_pages = 0
     
     def load_config(self, platform_name: str) -> Dict[str, Any]:
         """Load platform configuration from JSON file"""
@@ -194,6 +202,10 @@ class UnifiedScraper:
         with open(config_path, 'r', encoding='utf-8') as f:
             config = json.load(f)
         
+        # Compile the subcategory classifier once per config rather than per product
+        if config.get('keywords'):
+            self._subcategory_matcher(config)
+        
         self.logger.info(f"Loaded config for {platform_name}")
         return config
     
@@ -234,34 +246,39 @@ class UnifiedScraper:
             self.logger.error(f"Scraping failed: {e}")
             raise
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.release_driver()
     
     def _scrape_category(self, config: Dict[str, Any], category: str, max_pages: int) -> List[Dict[str, Any]]:
         """Scrape a single category using API → BeautifulSoup → Selenium strategy."""
-        products: List[Dict[str, Any]] = []
+        products, tier = self._scrape_category_fast(config, category, max_pages)
+        if tier:
+            return products
+        return self._scrape_category_selenium(config, category, max_pages)
+
+    def _category_url(self, config: Dict[str, Any], category: str) -> str:
+        """Build the listing URL for a category."""
         base_url = config['base_url']
-        settings = config.get('settings', {})
-        page_load_delay = int(settings.get('page_load_delay', 2))
-        scroll_pause = float(settings.get('scroll_pause', 1))
-        timeout_seconds = int(settings.get('timeout', 30))
-        
-        # Build category URL
         if category == 'default':
-            category_url = base_url
-        else:
-            category_paths = config.get('category_paths', {}).get(category, {})
-            if isinstance(category_paths, dict) and category_paths:
-                # Get the first subcategory path
-                first_subcategory = list(category_paths.values())[0]
-                category_url = urljoin(base_url, first_subcategory)
-            elif isinstance(category_paths, list) and category_paths:
-                # Take the first URL from the list
-                category_url = urljoin(base_url, category_paths[0])
-            else:
-                # Fallback to default pattern
-                category_url = urljoin(base_url, f'/category/{str(category)}/')
-        
+            return base_url
+        category_paths = config.get('category_paths', {}).get(category, {})
+        if isinstance(category_paths, dict) and category_paths:
+            # Get the first subcategory path
+            first_subcategory = list(category_paths.values())[0]
+            return urljoin(base_url, first_subcategory)
+        elif isinstance(category_paths, list) and category_paths:
+            # Take the first URL from the list
+            return urljoin(base_url, category_paths[0])
+        # Fallback to default pattern
+        return urljoin(base_url, f'/category/{str(category)}/')
+
+    def _scrape_category_fast(self, config: Dict[str, Any], category: str, max_pages: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Try the API and static BeautifulSoup tiers (no browser).
+
+        Returns:
+            (products, tier) where tier is 'api' or 'beautifulsoup', or (…, None) if Selenium is needed
+        """
+        settings = config.get('settings', {})
+        category_url = self._category_url(config, category)
         self.logger.info(f"Scraping URL: {category_url}")
         
         # 1) Try API
@@ -269,20 +286,31 @@ class UnifiedScraper:
             api_products = self._try_api_fetch(config, category, max_pages)
             if api_products:
                 self.logger.info(f"API fetch succeeded: {len(api_products)} products")
-                return api_products
+                return api_products, 'api'
         except Exception as e:
             self.logger.info(f"API fetch not available/failed: {e}")
 
         # 2) Try static BeautifulSoup (skip if force_selenium is true)
         if not settings.get('force_selenium', False):
             try:
-                bs_products = self._try_bs_listing(config, category_url)
+                bs_products = self._try_bs_listing(config, category_url, max_pages)
                 if bs_products:
                     self.logger.info(f"BeautifulSoup listing extracted {len(bs_products)} products")
-                    return bs_products
+                    return bs_products, 'beautifulsoup'
             except Exception as e:
                 self.logger.info(f"BS listing failed: {e}")
 
+        return [], None
+
+    def _scrape_category_selenium(self, config: Dict[str, Any], category: str, max_pages: int) -> List[Dict[str, Any]]:
+        """Scrape a category with Selenium (dynamic rendering)."""
+        products: List[Dict[str, Any]] = []
+        settings = config.get('settings', {})
+        page_load_delay = int(settings.get('page_load_delay', 2))
+        scroll_pause = float(settings.get('scroll_pause', 1))
+        timeout_seconds = int(settings.get('timeout', 30))
+        category_url = self._category_url(config, category)
+
         # 3) Use Selenium (dynamic)
         if settings.get('force_selenium', False):
             self.logger.info("Using Selenium as requested (force_selenium=true)")
@@ -291,11 +319,20 @@ class UnifiedScraper:
         if not self.driver:
             self._setup_driver()
         
+        # Listings only need DOM attributes: skip image, font, media and ad downloads when configured
+        blocked = blocked_url_patterns(settings)
+        if apply_resource_blocking(self.driver, blocked) and blocked:
+            self.logger.info(f"Blocking {len(blocked)} resource URL patterns ({settings.get('block_resources')})")
+
         # Navigate to category page
         self.driver.set_page_load_timeout(timeout_seconds)
         self.wait._timeout = min(timeout_seconds, 60)
+        page_transfer_kb(self.driver)  # drop traffic from before this category
         self.driver.get(category_url)
-        time.sleep(page_load_delay)
+        self._driver_pages += 1
+        # page_load_delay and the other fixed pauses are ceilings; see page_waits.py
+        self.waiter = PageWaiter(self.driver, config)
+        self.waiter.wait('page_load', page_load_delay)
         
         # Optional dynamic handling
         if bool(settings.get('handle_popups', False)) or bool(settings.get('close_ads', False)):
@@ -305,26 +342,43 @@ class UnifiedScraper:
         if bool(settings.get('click_load_more', False)):
             self._click_all_load_more(config)
         if bool(settings.get('wait_for_lazy_images', False)):
-            time.sleep(max(1, int(scroll_pause)))
+            self.waiter.wait('lazy_images', max(1, int(scroll_pause)))
         
         # Scrape pages with Selenium
         for page in range(1, max_pages + 1):
             self.logger.info(f"Scraping page {page}")
+            self.waiter.page = page
             page_products = self._extract_products_from_page(config)
             products.extend(page_products)
+            self.waiter.record_transfer(page_transfer_kb(self.driver))
             if page < max_pages:
                 if not self._go_to_next_page(config):
                     self.logger.info("No more pages found")
                     break
+                self._driver_pages += 1
         
+        self.page_waits = self.waiter.page_summary()
+        self.logger.info(f"Condition waits saved {self.waiter.total_saved():.1f}s over {len(self.page_waits)} page(s)")
+        transferred = [p['transfer_kb'] for p in self.page_waits if p.get('transfer_kb') is not None]
+        if transferred:
+            self.logger.info(f"Transferred {sum(transferred) / len(transferred):.0f} KB per listing page")
         return products
 
+    def _use_async_fetch(self, config: Dict[str, Any]) -> bool:
+        """aiohttp tier is used when installed unless settings.async_fetch is false."""
+        return async_available() and bool(config.get('settings', {}).get('async_fetch', True))
+
+    def _max_per_host(self, config: Dict[str, Any]) -> int:
+        return int(config.get('settings', {}).get('max_concurrent_per_host', 4))
+
     def _try_api_fetch(self, config: Dict[str, Any], category: str, max_pages: int) -> List[Dict[str, Any]]:
         """Attempt to fetch products via JSON APIs (detected or configured). Supports Shopify-like endpoints and explicit config.api_endpoints.
 
         Config options:
           - api_endpoints: list of absolute or relative endpoints with {page} placeholder
           - api_parser: 'shopify_products_json' to parse Shopify /products.json
+          - settings.async_fetch: false to fetch pages one by one with requests
+          - settings.max_concurrent_per_host: pages in flight per host (default 4)
         """
         api_products: List[Dict[str, Any]] = []
         base_url = config['base_url']
@@ -344,6 +398,30 @@ class UnifiedScraper:
         endpoints.append(urljoin(base_url, 'products.json?page={page}'))
 
         parser_kind = (config.get('api_parser') or '').lower()
+
+        if self._use_async_fetch(config):
+            # All endpoints at once, pages pipelined per endpoint; stops at the first empty page
+            def parse(status: int, content_type: str, body: str) -> Optional[List[Dict[str, Any]]]:
+                if status != 200 or 'application/json' not in content_type:
+                    # Not JSON; skip to next
+                    return None
+                return self._parse_api_payload(json.loads(body), config, parser_kind)
+
+            runs = [
+                ((lambda page, template=ep_template: template.replace('{page}', str(page))), max_pages, parse)
+                for ep_template in endpoints
+            ]
+            results = fetch_page_runs(
+                runs,
+                max_per_host=self._max_per_host(config),
+                timeout=15,
+                headers=dict(self._requests.headers),
+            )
+            for pages in results:
+                for parsed_page in pages:
+                    api_products.extend(parsed_page)
+            return api_products
+
         for ep_template in endpoints:
             for page in range(1, max_pages + 1):
                 ep = ep_template.replace('{page}', str(page))
@@ -396,36 +474,112 @@ class UnifiedScraper:
                 items.append(self._normalize_product_record(config, item, listing_page_url=urljoin(config['base_url'], 'collections/all')))
         return items
 
-    def _try_bs_listing(self, config: Dict[str, Any], category_url: str) -> List[Dict[str, Any]]:
-        """Fetch listing page via requests and parse with BeautifulSoup (fast path)."""
+    def _listing_page_url(self, category_url: str, page_param: str, page: int) -> str:
+        """Listing URL for a page number (page 1 is the category URL itself)."""
+        if page <= 1:
+            return category_url
+        parsed = urlparse(category_url)
+        query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k != page_param]
+        query.append((page_param, str(page)))
+        return urlunparse(parsed._replace(query=urlencode(query)))
+
+    def _listing_parser(self, config: Dict[str, Any]):
+        """Compiled (cached) parser for this config's listing selectors; lxml unless settings.html_parser says otherwise."""
+        selectors = config.get('selectors', {})
+        fields = {
+            'name': selectors.get('product_name', 'h5, .product-title'),
+            'url': selectors.get('product_url', 'a[href*="/collections/"]'),
+            'price': selectors.get('product_price', '.price, .money'),
+            'image': selectors.get('product_image', 'img'),
+            'description': selectors.get('product_description', '.collection-description'),
+            'availability': selectors.get('product_availability', '.collection-count'),
+        }
+        prefer_lxml = config.get('settings', {}).get('html_parser', 'lxml') != 'beautifulsoup'
+        return compile_listing_parser(
+            selectors.get('product_container', '.product-item, .pickgradient-products'), fields, prefer_lxml
+        )
+
+    def _parse_bs_listing_html(self, config: Dict[str, Any], html: str, listing_url: str) -> List[Dict[str, Any]]:
+        """Extract products from listing HTML (lxml with compiled selectors, or BeautifulSoup)."""
+        parser = self._listing_parser(config)
+        
+        # Find product containers
+        product_containers = list(parser.items(html))
+        
+        if not product_containers:
+            self.logger.warning(f"No product containers found with selector: {parser.container}")
+            return []
+        
+        self.logger.info(f"{parser.backend} found {len(product_containers)} product containers")
+        
+        products = []
+        for container in product_containers:
+            try:
+                product = self._extract_product_from_container(container, config, listing_url)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                self.logger.warning(f"Failed to extract product from container: {e}")
+                continue
+        
+        return products
+
+    def _new_listing_products(self, page_products: List[Dict[str, Any]], seen_urls: set) -> List[Dict[str, Any]]:
+        """Products of a listing page not seen on an earlier page; [] when a later page adds no new product URL.
+
+        Sites that ignore ?page=N serve page 1 again, so such a page ends the run.
+        """
+        first_page = not seen_urls
+        fresh = []
+        for product in page_products:
+            url = product.get('product_url')
+            if url and url in seen_urls:
+                continue
+            if url:
+                seen_urls.add(url)
+            fresh.append(product)
+        if first_page or any(product.get('product_url') for product in fresh):
+            return fresh
+        return []
+
+    def _try_bs_listing(self, config: Dict[str, Any], category_url: str, max_pages: int = 1) -> List[Dict[str, Any]]:
+        """Fetch listing page(s) via HTTP and parse with BeautifulSoup (fast path).
+
+        Only the first page is fetched unless config.pagination.page_param is set, in which
+        case up to max_pages ?<page_param>=N pages are fetched until one comes back empty
+        or repeats products already seen.
+        """
+        page_param = (config.get('pagination') or {}).get('page_param')
+        pages = max(1, max_pages) if page_param else 1
+        seen_urls: set = set()
         try:
-            resp = self._requests.get(category_url, timeout=20)
-            if resp.status_code != 200:
-                return []
-                
-            html = resp.text
-            soup = BeautifulSoup(html, 'html.parser')
-            selectors = config.get('selectors', {})
-            
-            # Find product containers
-            product_containers = soup.select(selectors.get('product_container', '.product-item, .pickgradient-products'))
-            
-            if not product_containers:
-                self.logger.warning(f"No product containers found with selector: {selectors.get('product_container')}")
-                return []
-            
-            self.logger.info(f"BeautifulSoup found {len(product_containers)} product containers")
-            
-            products = []
-            for container in product_containers:
-                try:
-                    product = self._extract_product_from_container(container, config, category_url)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    self.logger.warning(f"Failed to extract product from container: {e}")
-                    continue
-            
+            if self._use_async_fetch(config):
+                # Pages are parsed in page order, so seen_urls is shared safely
+                def parse(status: int, content_type: str, body: str) -> Optional[List[Dict[str, Any]]]:
+                    if status != 200:
+                        return None
+                    return self._new_listing_products(self._parse_bs_listing_html(config, body, category_url), seen_urls)
+
+                url_for_page = lambda page: self._listing_page_url(category_url, page_param, page)
+                results = fetch_page_runs(
+                    [(url_for_page, pages, parse)],
+                    max_per_host=self._max_per_host(config),
+                    timeout=20,
+                    headers=dict(self._requests.headers),
+                )
+                return [product for page_products in results[0] for product in page_products]
+
+            products: List[Dict[str, Any]] = []
+            for page in range(1, pages + 1):
+                resp = self._requests.get(self._listing_page_url(category_url, page_param, page), timeout=20)
+                if resp.status_code != 200:
+                    break
+                page_products = self._new_listing_products(
+                    self._parse_bs_listing_html(config, resp.text, category_url), seen_urls
+                )
+                if not page_products:
+                    break
+                products.extend(page_products)
             return products
             
         except Exception as e:
@@ -433,36 +587,28 @@ class UnifiedScraper:
             return []
     
     def _extract_product_from_container(self, container, config: Dict[str, Any], listing_page_url: str) -> Dict[str, Any]:
-        """Extract product data from a BeautifulSoup container element."""
-        selectors = config.get('selectors', {})
-        
+        """Extract product data from a listing item (see listing_parser)."""
         # Extract product name
-        name_elem = container.select_one(selectors.get('product_name', 'h5, .product-title'))
-        product_name = name_elem.get_text(strip=True) if name_elem else ''
+        product_name = container.text('name')
         
         # Extract product URL
-        url_elem = container.select_one(selectors.get('product_url', 'a[href*="/collections/"]'))
-        product_url = url_elem.get('href', '') if url_elem else ''
+        product_url = container.attr('url', 'href')
         if product_url and not product_url.startswith('http'):
             product_url = urljoin(config['base_url'], product_url)
         
         # Extract price
-        price_elem = container.select_one(selectors.get('product_price', '.price, .money'))
-        price = price_elem.get_text(strip=True) if price_elem else ''
+        price = container.text('price')
         
         # Extract image URL
-        img_elem = container.select_one(selectors.get('product_image', 'img'))
-        image_url = img_elem.get('src', '') or img_elem.get('data-src', '') if img_elem else ''
+        image_url = container.attr('image', 'src', 'data-src')
         if image_url and not image_url.startswith('http'):
             image_url = urljoin(config['base_url'], image_url)
         
         # Extract description
-        desc_elem = container.select_one(selectors.get('product_description', '.collection-description'))
-        description = desc_elem.get_text(strip=True) if desc_elem else ''
+        description = container.text('description')
         
         # Extract availability/stock info
-        stock_elem = container.select_one(selectors.get('product_availability', '.collection-count'))
-        stock_info = stock_elem.get_text(strip=True) if stock_elem else ''
+        stock_info = container.text('availability')
         
         # Create full product record with all required fields
         product = {
@@ -536,9 +682,10 @@ class UnifiedScraper:
             self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selectors['product_container'])))
             
             # Find all product containers
+            # Let late-rendering containers arrive before collecting them
+            self._pause('containers', scroll_pause)
             containers = self.driver.find_elements(By.CSS_SELECTOR, selectors['product_container'])
             self.logger.info(f"Found {len(containers)} product containers")
-            time.sleep(scroll_pause)
             
             if not containers:
                 raise TimeoutException("No containers; trying BS fallback")
@@ -556,9 +703,7 @@ class UnifiedScraper:
             self.logger.warning("No product containers found on page; attempting BeautifulSoup fallback")
             try:
                 html = self.driver.page_source
-                soup = BeautifulSoup(html, 'html.parser')
-                selectors = config.get('selectors', {})
-                product_containers = soup.select(selectors.get('product_container', '.product-item, .pickgradient-products'))
+                product_containers = list(self._listing_parser(config).items(html))
                 
                 if product_containers:
                     for container in product_containers:
@@ -577,13 +722,27 @@ class UnifiedScraper:
         
         return products
 
+    def _pause(self, phase: str, ceiling: float, **kwargs):
+        """Condition wait for `phase` (PageWaiter), or the fixed sleep outside a Selenium category run."""
+        if self.waiter is not None:
+            self.waiter.wait(phase, ceiling, **kwargs)
+        else:
+            time.sleep(ceiling)
+
+    def _first_container(self, config: Dict[str, Any]):
+        selector = config.get('selectors', {}).get('product_container')
+        if not selector:
+            return None
+        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+        return elements[0] if elements else None
+
     def _progressive_scroll(self, pause_seconds: float = 1.0, max_scrolls: int = 10):
         """Scroll down the page progressively to load dynamic content."""
         try:
             last_height = self.driver.execute_script("return document.body.scrollHeight")
             for _ in range(max_scrolls):
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(pause_seconds)
+                self._pause('scroll', pause_seconds)
                 new_height = self.driver.execute_script("return document.body.scrollHeight")
                 if new_height == last_height:
                     break
@@ -653,12 +812,15 @@ class UnifiedScraper:
         next_sel = selectors.get('next_page')
         if not next_sel:
             return
+        container_sel = selectors.get('product_container', '')
         for _ in range(max_clicks):
             try:
                 button = self.driver.find_element(By.CSS_SELECTOR, next_sel)
                 if button and button.is_displayed() and button.is_enabled():
+                    before = len(self.driver.find_elements(By.CSS_SELECTOR, container_sel)) if container_sel else 0
                     button.click()
-                    time.sleep(1.5)
+                    # Ready once more containers than before have rendered
+                    self._pause('load_more', 1.5, min_count=before + 1)
                 else:
                     break
             except NoSuchElementException:
@@ -819,7 +981,7 @@ class UnifiedScraper:
                 'short_description': product['product_name'][:200],
                 'original_price': '',
                 'main_category': config.get('main_category', 'Electronics'),
-                'subcategory': self._detect_subcategory(product['product_name'], config.get('keywords', {}), config.get('synonyms', {})) or config.get('subcategory', 'Electronics'),
+                'subcategory': self._detect_subcategory(product['product_name'], config) or config.get('subcategory', 'Electronics'),
                 'sub_category': None,  # duplicate for frontend compatibility
                 'model_number': '',
                 'sku': '',
@@ -871,44 +1033,22 @@ class UnifiedScraper:
         
         return cleaned
     
-    def _detect_subcategory(self, product_name: str, keywords: Dict[str, List[str]], synonyms: Dict[str, List[str]] = None) -> Optional[str]:
+    def _subcategory_matcher(self, config: Dict[str, Any]) -> SubcategoryMatcher:
+        """Compiled matcher for a config's keywords and synonyms, one per platform (rebuilt if the config is replaced)."""
+        keywords = config.get('keywords') or {}
+        synonyms = config.get('synonyms') or None
+        key = config.get('platform_name', '')
+        matcher = self._subcategory_matchers.get(key)
+        if matcher is None or matcher.keywords is not keywords or matcher.synonyms is not synonyms:
+            matcher = SubcategoryMatcher(keywords, synonyms)
+            self._subcategory_matchers[key] = matcher
+        return matcher
+
+    def _detect_subcategory(self, product_name: str, config: Dict[str, Any]) -> Optional[str]:
         """Detect subcategory using keyword matching with simple stemming, synonyms, and case-insensitive partials."""
-        if not keywords:
+        if not config.get('keywords'):
             return None
-            
-        def normalize_token(t: str) -> str:
-            t = t.lower().strip()
-            t = t.replace('-', ' ').replace('_', ' ')
-            # naive plural handling
-            if t.endswith('ies'):
-                t = t[:-3] + 'y'
-            elif t.endswith('es') and len(t) > 3:
-                t = t[:-2]
-            elif t.endswith('s') and len(t) > 2:
-                t = t[:-1]
-            return t
-
-        syn_map = {normalize_token(k): [normalize_token(v) for v in vs] for k, vs in (synonyms or {}).items()}
-
-        name_norm = normalize_token(product_name)
-
-        category_scores: Dict[str, int] = {}
-        for subcat, kw_list in keywords.items():
-            score = 0
-            for kw in kw_list:
-                base_kw = normalize_token(kw)
-                forms = set([base_kw] + syn_map.get(base_kw, []))
-                # partial contains matching
-                for form in forms:
-                    if form and form in name_norm:
-                        score += 1
-                        break
-            if score > 0:
-                category_scores[subcat] = score
-        
-        if category_scores:
-            return max(category_scores.items(), key=lambda x: x[1])[0]
-        return None
+        return self._subcategory_matcher(config).detect(product_name)
     
     def _discover_categories(self, config: Dict[str, Any]) -> List[str]:
         """Auto-discover categories from config file"""
@@ -944,8 +1084,12 @@ class UnifiedScraper:
         try:
             next_button = self.driver.find_element(By.CSS_SELECTOR, selectors['next_page'])
             if next_button.is_enabled():
+                # Remember the current listing so the wait can tell when it has been replaced
+                leaving = (self.driver.current_url, self._first_container(config))
                 next_button.click()
-                time.sleep(2)
+                if self.waiter:
+                    self.waiter.page += 1
+                self._pause('next_page', 2, leaving=leaving)
                 return True
         except NoSuchElementException:
             pass